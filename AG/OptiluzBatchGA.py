@@ -0,0 +1,197 @@
+"""
+Algoritmo genético por lotes para OptiLuz.
+
+Ejecuta R optimizaciones independientes (una por aula o por muestra de un
+estudio) a la vez: las poblaciones se guardan en un arreglo
+(ejecuciones x individuos x genes) y cada generación completa de las R
+ejecuciones se evalúa, selecciona, cruza y muta con operaciones de NumPy sobre
+todo el arreglo. Los operadores siguen a OptiluzGA (torneo, cruce aritmético,
+mutación gaussiana con sigma del 10% del rango y elitismo), de modo que el
+resultado de cada ejecución es comparable al de una ejecución normal.
+
+Es el camino rápido que usan los estudios que necesitan miles de
+optimizaciones, como el análisis de sensibilidad. Con streams, las ejecuciones
+de un mismo flujo reciben exactamente los mismos números aleatorios (números
+aleatorios comunes), de modo que las diferencias entre ellas se deben a sus
+parámetros y no al azar del optimizador.
+"""
+
+import numpy as np
+
+from OptiluzInputBatch import OptiluzInputBatch
+from OptiluzKernels import (GENES, N_PERSONAS, P_CARGA, P_EFICIENCIA, P_LUX, P_SUPERFICIE,
+                            evaluate_genes, mutate_genes, temperature_genes)
+
+
+def batch_bounds(params):
+    """
+    Límites de los genes para cada fila de parámetros, con las mismas reglas
+    que OptiluzGA._adjust_bounds. Retorna (lower, upper) de forma (R, genes).
+    """
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+    superficie = params[:, P_SUPERFICIE]
+    carga = params[:, P_CARGA]
+    lux = params[:, P_LUX]
+    eficiencia = params[:, P_EFICIENCIA]
+
+    lower = np.empty((len(params), len(GENES)))
+    upper = np.empty_like(lower)
+    lower[:, 0] = np.maximum(8000, superficie * 250 + carga / 2)
+    upper[:, 0] = np.maximum(60000, superficie * 450 + carga * 1.5)
+    lower[:, 1] = np.maximum(50, lux * superficie / (eficiencia * 1.5))
+    upper[:, 1] = np.maximum(3000, lux * superficie / (eficiencia * 0.7))
+    lower[:, 2] = 0.1
+    upper[:, 2] = 3.0
+    lower[:, N_PERSONAS] = np.floor(np.maximum(5, superficie / 4))
+    upper[:, N_PERSONAS] = np.floor(np.minimum(100, superficie / 1.5))
+    upper = np.maximum(upper, lower)
+    return lower, upper
+
+
+class CommonStreams:
+    """
+    Generador con la interfaz de numpy.random.Generator usada por
+    OptiluzBatchGA y mutate_genes. Cada sorteo se hace una vez por flujo y se
+    repite en todas las ejecuciones de ese flujo. El primer eje de size es el
+    de las ejecuciones (R) o el de sus filas aplanadas (R · k).
+    """
+
+    def __init__(self, rng, streams):
+        self.rng = rng
+        self.streams = np.asarray(streams, dtype=int)
+        self.n_streams = int(self.streams.max()) + 1
+
+    def _draw(self, draw, size):
+        size = tuple(np.atleast_1d(size))
+        rows = size[0] // len(self.streams)
+        values = draw((self.n_streams, rows) + size[1:])
+        return values[self.streams].reshape(size)
+
+    def random(self, size):
+        return self._draw(self.rng.random, size)
+
+    def standard_normal(self, size):
+        return self._draw(self.rng.standard_normal, size)
+
+    def integers(self, low, high, size):
+        return self._draw(lambda shape: self.rng.integers(low, high, size=shape), size)
+
+
+class OptiluzBatchGA:
+    """
+    R optimizaciones simultáneas.
+
+    params: matriz (R, parámetros) con un vector de make_params por ejecución,
+        o un OptiluzInputBatch (una ejecución por aula).
+    lower, upper: límites (R, genes); por defecto los de batch_bounds.
+    streams: flujo aleatorio (entero) de cada ejecución; las ejecuciones del
+        mismo flujo usan los mismos números aleatorios. Por defecto, todas
+        independientes.
+    """
+
+    def __init__(self, params, pop_size=20, seed=None, lower=None, upper=None, streams=None):
+        if isinstance(params, OptiluzInputBatch):
+            params = params.kernel_params()
+        self.params = np.atleast_2d(np.asarray(params, dtype=float))
+        self.runs = len(self.params)
+        self.pop_size = pop_size
+        self.rng = np.random.default_rng(seed)
+        if streams is not None:
+            if len(streams) != self.runs:
+                raise ValueError("Debe haber un flujo aleatorio por ejecución")
+            self.rng = CommonStreams(self.rng, streams)
+        if lower is None or upper is None:
+            lower, upper = batch_bounds(self.params)
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        # Parámetros y límites repetidos por individuo (filas del arreglo aplanado)
+        self._row_params = np.repeat(self.params, pop_size, axis=0)
+        self.evaluations = 0
+
+    def initialize_population(self):
+        """Población inicial uniforme dentro de los límites de cada ejecución."""
+        shape = (self.runs, self.pop_size, len(GENES))
+        u = self.rng.random(shape)
+        lower = self.lower[:, None, :]
+        span = (self.upper - self.lower)[:, None, :]
+        genes = lower + u * span
+        # N_personas entero en [mínimo, máximo]
+        genes[..., N_PERSONAS] = np.floor(lower[..., N_PERSONAS] + u[..., N_PERSONAS] * (span[..., N_PERSONAS] + 1))
+        genes[..., N_PERSONAS] = np.minimum(genes[..., N_PERSONAS], self.upper[:, None, N_PERSONAS])
+        return genes
+
+    def evaluate(self, genes):
+        """Fitness (R, individuos) de todas las poblaciones."""
+        flat = genes.reshape(-1, len(GENES))
+        self.evaluations += len(flat)
+        return evaluate_genes(flat, self._row_params[:len(flat)]).reshape(genes.shape[:2])
+
+    def _tournament(self, fitness, n, tournament_size):
+        contenders = self.rng.integers(0, self.pop_size, size=(self.runs, n, tournament_size))
+        scores = np.take_along_axis(fitness, contenders.reshape(self.runs, -1), axis=1)
+        winners = np.argmin(scores.reshape(self.runs, n, tournament_size), axis=2)
+        return np.take_along_axis(contenders, winners[..., None], axis=2)[..., 0]
+
+    def _crossover(self, parents, crossover_rate):
+        """Cruce aritmético de genes continuos e intercambio de N_personas, por parejas."""
+        p1, p2 = parents[:, 0::2], parents[:, 1::2]
+        cross = self.rng.random(p1.shape[:2] + (1,)) < crossover_rate
+        alpha = self.rng.random(p1.shape)
+        alpha[..., N_PERSONAS] = 0.0  # El hijo 1 recibe N_personas del padre 2
+        c1 = np.where(cross, alpha * p1 + (1 - alpha) * p2, p1)
+        c2 = np.where(cross, (1 - alpha) * p1 + alpha * p2, p2)
+        children = np.empty_like(parents)
+        children[:, 0::2], children[:, 1::2] = c1, c2
+        return children
+
+    def run(self, generations=50, mutation_rate=0.1, crossover_rate=0.9,
+            tournament_size=3, elitism=2):
+        """
+        Ejecuta las R optimizaciones. Retorna un diccionario con la mejor
+        solución de cada ejecución ('best_genes', (R, genes)), su fitness,
+        su temperatura promedio y el historial del mejor fitness (generaciones, R).
+        """
+        elitism = min(elitism, self.pop_size)
+        n_children = self.pop_size - elitism
+        n_pairs = (n_children + 1) // 2
+        genes = self.initialize_population()
+        runs = np.arange(self.runs)
+
+        best_genes = np.empty((self.runs, len(GENES)))
+        best_fitness = np.full(self.runs, np.inf)
+        history = []
+        lower_rows = np.repeat(self.lower, 2 * n_pairs, axis=0)
+        upper_rows = np.repeat(self.upper, 2 * n_pairs, axis=0)
+
+        for gen in range(generations + 1):
+            fitness = self.evaluate(genes)
+            best_idx = np.argmin(fitness, axis=1)
+            gen_best = fitness[runs, best_idx]
+            improved = gen_best < best_fitness
+            best_fitness[improved] = gen_best[improved]
+            best_genes[improved] = genes[runs[improved], best_idx[improved]]
+            history.append(gen_best)
+            if gen == generations:
+                break
+
+            # Elitismo y torneo
+            order = np.argsort(fitness, axis=1)
+            elites = np.take_along_axis(genes, order[:, :elitism, None], axis=1)
+            chosen = self._tournament(fitness, 2 * n_pairs, tournament_size)
+            parents = np.take_along_axis(genes, chosen[..., None], axis=1)
+
+            # Cruce y mutación con la misma reducción gradual de la tasa que OptiluzGA
+            rate = mutation_rate * (1 - gen / generations * 0.7)
+            children = self._crossover(parents, crossover_rate)
+            flat = mutate_genes(children.reshape(-1, len(GENES)), lower_rows, upper_rows, rate, self.rng)
+            children = flat.reshape(children.shape)[:, :n_children]
+            genes = np.concatenate([elites, children], axis=1)
+
+        temperature = temperature_genes(best_genes, self.params)
+        return {
+            'best_genes': best_genes,
+            'best_fitness': best_fitness,
+            'temperature': temperature,
+            'fitness_history': np.array(history),
+            'evaluations': self.evaluations,
+        }
@@ -0,0 +1,257 @@
+"""
+Optimización a nivel de edificio para OptiLuz.
+
+Un edificio agrupa varias aulas (OptiluzInput) que comparten una planta de
+enfriamiento y un presupuesto eléctrico total. El genoma de cada individuo es
+una matriz (aulas x genes) y toda la población se guarda en un único arreglo
+(individuos x aulas x genes).
+
+La evaluación es incremental: cada individuo guarda el fitness de cada aula y
+los totales compartidos (BTU y potencia eléctrica). Los hijos heredan esos
+valores de sus padres y solo se recalculan las aulas cuyos genes cambiaron;
+los totales y la suma del fitness de las aulas se actualizan sumando la
+diferencia. El costo por hijo es así proporcional a las aulas modificadas y no
+al total de aulas. Cada RESYNC_EVERY generaciones los acumulados se recalculan
+desde cero para que no se acumule el error de redondeo.
+"""
+
+import time
+
+import numpy as np
+
+from OptiluzBatchGA import batch_bounds
+from OptiluzInputBatch import OptiluzInputBatch
+from OptiluzKernels import GENES, BTU, P_LUZ, N_PERSONAS, evaluate_genes, mutate_genes
+
+RESYNC_EVERY = 50  # Generaciones entre recálculos completos de los acumulados
+
+
+class OptiluzBuilding:
+    """
+    Conjunto de aulas con restricciones compartidas.
+
+    rooms: lista de OptiluzInput o un OptiluzInputBatch.
+
+    capacidad_planta: capacidad total de la planta de enfriamiento (BTU), o None.
+    presupuesto_electrico: potencia eléctrica total disponible (W), o None.
+    """
+    COP_PLANTA = 3.0  # Coeficiente de rendimiento típico de la planta de enfriamiento
+
+    def __init__(self, rooms, capacidad_planta=None, presupuesto_electrico=None,
+                 penalizacion=1.0):
+        if not len(rooms):
+            raise ValueError("El edificio debe tener al menos un aula")
+        self.rooms = rooms if isinstance(rooms, OptiluzInputBatch) else list(rooms)
+        self.capacidad_planta = capacidad_planta
+        self.presupuesto_electrico = presupuesto_electrico
+        self.penalizacion = penalizacion
+
+        # Límites y parámetros de cada aula con las mismas reglas que OptiluzGA,
+        # calculados para todas las aulas a la vez
+        batch = self.rooms if isinstance(self.rooms, OptiluzInputBatch) else \
+            OptiluzInputBatch.from_inputs(self.rooms)
+        self.params = batch.kernel_params()
+        self.lower, self.upper = batch_bounds(self.params)
+
+    @property
+    def n_rooms(self):
+        return len(self.rooms)
+
+    def room_contributions(self, genes):
+        """Aporte de cada aula a los totales compartidos: [BTU, potencia eléctrica (W)]."""
+        btu = genes[..., BTU]
+        potencia = genes[..., P_LUZ] + btu * 0.293 / self.COP_PLANTA
+        return np.stack([btu, potencia], axis=-1)
+
+    def shared_penalty(self, totals):
+        """Penalización por exceder la capacidad de la planta o el presupuesto eléctrico."""
+        penalty = np.zeros(totals.shape[:-1])
+        if self.capacidad_planta:
+            penalty += np.maximum(0, totals[..., 0] - self.capacidad_planta) / self.capacidad_planta
+        if self.presupuesto_electrico:
+            penalty += np.maximum(0, totals[..., 1] - self.presupuesto_electrico) / self.presupuesto_electrico
+        return self.penalizacion * penalty
+
+
+class OptiluzBuildingGA:
+    """Algoritmo genético acoplado para todas las aulas de un edificio."""
+
+    def __init__(self, building, pop_size=20, seed=None):
+        self.building = building
+        self.pop_size = pop_size
+        self.rng = np.random.default_rng(seed)
+
+        shape = (pop_size, building.n_rooms)
+        self.genes = np.empty(shape + (len(GENES),))
+        self.room_fitness = np.empty(shape)
+        self.room_sum = np.empty(pop_size)
+        self.totals = np.empty((pop_size, 2))
+        self.fitness = np.empty(pop_size)
+
+        self.best_genes = None
+        self.best_fitness = float('inf')
+        self.fitness_history = []
+        self.room_evaluations = 0
+        self.generations_since_resync = 0
+        self.run_stats = {}
+
+    # ------------------------------------------------------------------
+    # Evaluación
+    # ------------------------------------------------------------------
+    def _combine(self):
+        """Fitness acoplado: promedio de las aulas más la penalización compartida."""
+        self.fitness = self.room_sum / self.building.n_rooms + self.building.shared_penalty(self.totals)
+
+    def evaluate_all(self):
+        """Evaluación completa de la población (solo al inicio)."""
+        params = self.building.params[None, :, :]
+        self.room_fitness = evaluate_genes(self.genes, params)
+        self.room_evaluations += self.room_fitness.size
+        self.resync()
+
+    def resync(self):
+        """Recalcula los totales y la suma del fitness de las aulas desde cero."""
+        self.totals = self.building.room_contributions(self.genes).sum(axis=1)
+        self.room_sum = self.room_fitness.sum(axis=1)
+        self.generations_since_resync = 0
+        self._combine()
+
+    def evaluate_changed(self, changed):
+        """
+        Reevalúa solo las celdas (individuo, aula) marcadas en changed y
+        actualiza la suma del fitness de las aulas por diferencia (los totales
+        compartidos ya los actualizó la mutación).
+        """
+        ind_idx, room_idx = np.nonzero(changed)
+        if ind_idx.size:
+            genes = self.genes[ind_idx, room_idx]
+            new = evaluate_genes(genes, self.building.params[room_idx])
+            np.add.at(self.room_sum, ind_idx, new - self.room_fitness[ind_idx, room_idx])
+            self.room_fitness[ind_idx, room_idx] = new
+            self.room_evaluations += ind_idx.size
+        self._combine()
+
+    # ------------------------------------------------------------------
+    # Operadores genéticos
+    # ------------------------------------------------------------------
+    def initialize_population(self):
+        lower, upper = self.building.lower, self.building.upper
+        self.genes = lower + self.rng.random(self.genes.shape) * (upper - lower)
+        self.genes[..., N_PERSONAS] = self.rng.integers(
+            lower[:, N_PERSONAS].astype(int), upper[:, N_PERSONAS].astype(int) + 1,
+            size=self.genes.shape[:2])
+        self.evaluate_all()
+
+    def _tournament(self, n, tournament_size):
+        candidates = self.rng.integers(0, self.pop_size, size=(n, tournament_size))
+        winners = np.argmin(self.fitness[candidates], axis=1)
+        return candidates[np.arange(n), winners]
+
+    def evolve(self, mutation_rate=None, crossover_rate=0.9, tournament_size=3, elitism=2):
+        """
+        Una generación: elitismo, selección por torneo, cruce uniforme por aulas
+        y mutación de aulas. Los hijos heredan el fitness de cada aula, su suma
+        y el aporte a los totales; solo se reevalúan las aulas mutadas.
+        """
+        n_rooms = self.building.n_rooms
+        if mutation_rate is None:
+            mutation_rate = 1.0 / n_rooms
+        contributions = self.building.room_contributions
+
+        order = np.argsort(self.fitness)
+        elite = order[:elitism]
+        n_children = self.pop_size - elite.size
+        parents = self._tournament(n_children + (n_children % 2), tournament_size)
+
+        genes = self.genes[parents]
+        room_fitness = self.room_fitness[parents]
+        room_sum = self.room_sum[parents]
+        totals = self.totals[parents]
+
+        # Cruce uniforme por aulas: intercambiar bloques completos de genes
+        # (el fitness de cada aula viaja con sus genes). Solo se tocan las
+        # celdas (pareja, aula) intercambiadas.
+        a, b = np.arange(0, parents.size, 2), np.arange(1, parents.size, 2)
+        cross = self.rng.random(a.size) < crossover_rate
+        swap = (self.rng.random((a.size, n_rooms)) < 0.5) & cross[:, None]
+        pair_idx, room_idx = np.nonzero(swap)
+        if pair_idx.size:
+            ia, ib = a[pair_idx], b[pair_idx]
+            genes_a, genes_b = genes[ia, room_idx], genes[ib, room_idx]
+            fa, fb = room_fitness[ia, room_idx], room_fitness[ib, room_idx]
+            delta = contributions(genes_b) - contributions(genes_a)
+            np.add.at(totals, ia, delta)
+            np.add.at(totals, ib, -delta)
+            np.add.at(room_sum, ia, fb - fa)
+            np.add.at(room_sum, ib, fa - fb)
+            genes[ia, room_idx], genes[ib, room_idx] = genes_b, genes_a
+            room_fitness[ia, room_idx], room_fitness[ib, room_idx] = fb, fa
+
+        genes, room_fitness = genes[:n_children], room_fitness[:n_children]
+        room_sum, totals = room_sum[:n_children], totals[:n_children]
+
+        # Mutación: cada aula de cada hijo muta con probabilidad mutation_rate
+        changed = self.rng.random((n_children, n_rooms)) < mutation_rate
+        ind_idx, room_idx = np.nonzero(changed)
+        if ind_idx.size:
+            old = genes[ind_idx, room_idx]
+            new = mutate_genes(old, self.building.lower[room_idx], self.building.upper[room_idx],
+                               0.5, self.rng)
+            genes[ind_idx, room_idx] = new
+            np.add.at(totals, ind_idx, contributions(new) - contributions(old))
+
+        self.genes = np.concatenate([self.genes[elite], genes])
+        self.room_fitness = np.concatenate([self.room_fitness[elite], room_fitness])
+        self.room_sum = np.concatenate([self.room_sum[elite], room_sum])
+        self.totals = np.concatenate([self.totals[elite], totals])
+        self.evaluate_changed(np.concatenate([np.zeros((elite.size, n_rooms), dtype=bool), changed]))
+
+        self.generations_since_resync += 1
+        if self.generations_since_resync >= RESYNC_EVERY:
+            self.resync()
+
+    def _track_best(self):
+        best_idx = int(np.argmin(self.fitness))
+        if self.fitness[best_idx] < self.best_fitness:
+            self.best_fitness = float(self.fitness[best_idx])
+            self.best_genes = self.genes[best_idx].copy()
+        self.fitness_history.append(float(self.fitness[best_idx]))
+
+    def run_evolution(self, generations=50, mutation_rate=None, crossover_rate=0.9,
+                      tournament_size=3, elitism=2):
+        """Ejecuta la optimización acoplada del edificio."""
+        start_time = time.perf_counter()
+        self.fitness_history = []
+        self.best_fitness = float('inf')
+        self.room_evaluations = 0
+
+        self.initialize_population()
+        self._track_best()
+        for _ in range(generations - 1):
+            self.evolve(mutation_rate, crossover_rate, tournament_size, elitism)
+            self._track_best()
+
+        # Evaluaciones que haría un reevaluado completo de cada generación
+        full_evaluations = generations * self.pop_size * self.building.n_rooms
+        self.run_stats = {
+            'generations': generations,
+            'room_evaluations': self.room_evaluations,
+            'full_evaluations': full_evaluations,
+            'elapsed': time.perf_counter() - start_time
+        }
+        return self.best_solutions()
+
+    def best_solutions(self):
+        """Mejor solución encontrada como lista de individuos (uno por aula)."""
+        if self.best_genes is None:
+            return []
+        solutions = []
+        for row in self.best_genes.tolist():
+            solution = dict(zip(GENES, row))
+            solution['N_personas'] = int(round(solution['N_personas']))
+            solutions.append(solution)
+        return solutions
+
+    def best_totals(self):
+        """Totales compartidos (BTU, potencia eléctrica en W) de la mejor solución."""
+        return self.building.room_contributions(self.best_genes).sum(axis=0)
@@ -0,0 +1,239 @@
+"""
+Caché persistente de resultados de OptiLuz direccionada por contenido.
+
+Muchas aulas comparten exactamente los mismos datos y los usuarios repiten
+las mismas ejecuciones desde la interfaz. Cada resultado se guarda en disco
+bajo una clave que es el hash canónico de:
+    - OptiluzInput.to_dict()
+    - los parámetros del algoritmo genético
+    - las opciones de construcción del algoritmo (OptiluzGA.config_fingerprint:
+      sustituto, objetivo robusto, nichos, reinicios, arranque en caliente y
+      SHA-256 del perfil horario, de modo que editar el CSV/EPW invalida la
+      entrada)
+    - la semilla
+    - la versión del código del motor (hash de sus archivos fuente)
+
+Las escrituras son atómicas (archivo temporal + reemplazo), por lo que varios
+procesos pueden compartir el mismo directorio. El tamaño total se limita
+eliminando primero las entradas usadas hace más tiempo. Una capa LRU en
+memoria permite responder aciertos repetidos en microsegundos.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+# Archivos cuyo contenido define la versión del motor
+ENGINE_FILES = ('OptiluzGA.py', 'OptiluzKernels.py', 'OptiluzSimulation.py', 'OptiluzInput.py',
+                'OptiluzResult.py', 'OptiluzDiversity.py', 'OptiluzProfiles.py',
+                'OptiluzSurrogate.py', 'OptiluzRobust.py', 'OptiluzWarmStart.py')
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".optiluz", "resultados")
+LOCK_TIMEOUT = 60.0  # Segundos tras los que un bloqueo de limpieza se considera abandonado
+
+_code_version = None
+
+
+def code_version():
+    """Hash de los archivos fuente del motor; cambia cuando cambia el código."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in ENGINE_FILES:
+            try:
+                with open(os.path.join(base_dir, name), 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(name.encode('utf-8'))
+        _code_version = digest.hexdigest()[:16]
+    return _code_version
+
+
+def cache_key(input_dict, params, seed=None, config=None):
+    """Clave canónica (SHA-256) de una ejecución; config es OptiluzGA.config_fingerprint()."""
+    payload = {
+        'input': input_dict,
+        'params': params,
+        'config': config,
+        'seed': seed,
+        'version': code_version(),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché de resultados en disco con límite de tamaño y capa LRU en memoria.
+    Los valores deben ser serializables en JSON.
+    """
+
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024, memory_items=256):
+        self.directory = directory or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._approx_size = self._scan_size()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _remember(self, key, value):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Retorna el valor guardado o None si no existe."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return value
+
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+            os.utime(path)  # Marcar como usado recientemente (para el desalojo)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Guarda un valor de forma atómica y aplica el límite de tamaño."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            size = os.path.getsize(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        self._remember(key, value)
+        self._approx_size += size
+        if self._approx_size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """Lista (ruta, tamaño, último uso) de las entradas en disco."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Eliminada por otro proceso
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """
+        Elimina las entradas usadas hace más tiempo hasta quedar en el 90% del
+        límite. Un archivo de bloqueo evita que varios procesos limpien a la vez.
+        """
+        lock_path = os.path.join(self.directory, ".evict.lock")
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT:
+                    os.remove(lock_path)
+            except OSError:
+                pass
+            return
+        try:
+            os.close(fd)
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * 0.9
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    continue
+                key = os.path.basename(path)[:-len(".json")]
+                self.memory.pop(key, None)
+            self._approx_size = total
+        finally:
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Elimina todas las entradas de la caché."""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.memory.clear()
+        self._approx_size = 0
+
+
+def _run_key(ga, run_params):
+    params = dict(run_params, pop_size=ga.pop_size)
+    return cache_key(ga.input_data.to_dict(), params, ga.seed, ga.config_fingerprint())
+
+
+def load_cached(ga, cache, **run_params):
+    """
+    Restaura en ga el resultado y la población final de una ejecución ya
+    guardada con los mismos datos y parámetros. Retorna True si hubo acierto.
+    """
+    state = cache.get(_run_key(ga, run_params))
+    if state is None:
+        return False
+    ga.load_state(state)
+    ga.population = [dict(ind) for ind in state.get('population', ())]
+    return True
+
+
+def store_cached(ga, cache, **run_params):
+    """Guarda el resultado de la última ejecución de ga junto con su población final."""
+    state = dict(ga.export_state(), population=[dict(ind) for ind in ga.population])
+    cache.put(_run_key(ga, run_params), state)
+
+
+def run_cached(ga, cache, **run_params):
+    """
+    Ejecuta ga.run_evolution(**run_params) salvo que el mismo cálculo ya esté
+    en la caché, en cuyo caso restaura el resultado en ga sin evolucionar.
+    El RunResult queda en ga.result. Retorna True si hubo acierto de caché.
+    """
+    display = run_params.pop('display', True)
+    if load_cached(ga, cache, **run_params):
+        if display:
+            ga.display_results()
+        return True
+
+    ga.run_evolution(display=display, **run_params)
+    store_cached(ga, cache, **run_params)
+    return False
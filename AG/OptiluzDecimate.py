@@ -0,0 +1,130 @@
+"""
+Reducción de puntos para gráficas de historiales largos.
+
+Dibujar cada generación con marcadores es lento e ilegible cuando hay decenas
+de miles de generaciones. Este módulo reduce cada serie a aproximadamente el
+ancho en píxeles de los ejes conservando los extremos (método mín-máx) o la
+forma visual (LTTB, Largest-Triangle-Three-Buckets), y vuelve a reducir el
+tramo visible cada vez que cambia el zoom.
+
+Lo usan tanto las gráficas independientes de OptiluzGA como las gráficas
+integradas de la interfaz.
+"""
+
+import numpy as np
+
+# Por debajo de esta cantidad de puntos visibles se dibujan los marcadores
+MARKER_LIMIT = 200
+
+
+def minmax_decimate(x, y, n_out):
+    """
+    Conserva el mínimo y el máximo de cada tramo (n_out / 2 tramos), además
+    del primer y último punto. Garantiza que los extremos sigan visibles.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return x, y
+
+    size = int(np.ceil(n / (n_out // 2)))
+    buckets = int(np.ceil(n / size))
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    idx = np.concatenate([
+        [0, n - 1],
+        offsets + np.nanargmin(padded, axis=1),
+        offsets + np.nanargmax(padded, axis=1),
+    ])
+    idx = np.unique(idx)
+    return x[idx], y[idx]
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: conserva la forma visual de la serie."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return x, y
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Promedio del siguiente tramo (o el último punto)
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], max(edges[i + 2], edges[i + 1] + 1))
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+METHODS = {'minmax': minmax_decimate, 'lttb': lttb}
+
+
+class DecimatedLine:
+    """
+    Línea que guarda la serie completa y dibuja solo una versión reducida del
+    tramo visible, con tantos puntos como píxeles tiene el ancho de los ejes.
+    """
+
+    def __init__(self, ax, x, y, method='minmax', **kwargs):
+        self.ax = ax
+        self.method = METHODS[method]
+        self.marker = kwargs.pop('marker', None)
+        self.line, = ax.plot([], [], **kwargs)
+        self._cid = ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        self.set_data(x, y)
+
+    def set_data(self, x, y):
+        """Reemplaza la serie completa y vuelve a reducirla."""
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self._update(None)
+
+    def _pixel_width(self):
+        try:
+            return max(4, int(self.ax.bbox.width))
+        except Exception:
+            return 800
+
+    def _decimate(self, x, y):
+        n_out = self._pixel_width()
+        xs, ys = self.method(x, y, n_out)
+        self.line.set_marker(self.marker if self.marker and len(xs) <= MARKER_LIMIT else 'None')
+        return xs, ys
+
+    def _update(self, xlim):
+        if not len(self.x):
+            self.line.set_data([], [])
+            return
+        if xlim is None:
+            x, y = self.x, self.y
+        else:
+            lo, hi = sorted(xlim)
+            start = max(0, np.searchsorted(self.x, lo) - 1)
+            stop = min(len(self.x), np.searchsorted(self.x, hi) + 1)
+            x, y = self.x[start:stop], self.y[start:stop]
+        self.line.set_data(*self._decimate(x, y))
+
+    def _on_xlim_changed(self, ax):
+        self._update(ax.get_xlim())
+
+    def remove(self):
+        self.ax.callbacks.disconnect(self._cid)
+        self.line.remove()
+
+
+def plot_decimated(ax, x, y, method='minmax', **kwargs):
+    """Dibuja una serie reducida que se vuelve a reducir al hacer zoom. Retorna la DecimatedLine."""
+    return DecimatedLine(ax, x, y, method=method, **kwargs)
@@ -0,0 +1,127 @@
+"""
+Diversidad de la población y nichos para OptiLuz.
+
+Con elitismo, torneo y poblaciones pequeñas, OptiluzGA suele colapsar en
+pocas generaciones a individuos casi idénticos. Este módulo mide la
+diversidad de cada generación sobre los genes normalizados a sus límites
+(desviación estándar por gen y distancia media entre pares, exacta o por
+muestreo) y ofrece dos técnicas de nichos que modifican el fitness usado en
+la selección:
+
+    - sharing: el fitness se multiplica por el número de vecinos dentro del
+      radio sigma_share (los individuos de zonas pobladas pierden ventaja).
+    - clearing: dentro de cada radio solo el mejor conserva su fitness; el
+      resto queda con el peor fitness de la población.
+
+Todas las operaciones son vectorizadas sobre la matriz de genes.
+"""
+
+import numpy as np
+
+from OptiluzKernels import GENES
+
+MAX_EXACT_PAIRS = 512  # Por encima se estima la distancia media con pares aleatorios
+MAX_EXACT_UNIQUE = 10000  # Por encima se cuentan los genomas únicos por su hash
+NICHING = ('sharing', 'clearing')
+
+
+def normalize_genes(genes, lower, upper):
+    """Genes escalados a [0, 1] según sus límites."""
+    return (np.asarray(genes, dtype=float) - lower) / np.where(upper > lower, upper - lower, 1.0)
+
+
+def pairwise_distances(x):
+    """Matriz de distancias euclidianas entre filas."""
+    sq = (x * x).sum(axis=1)
+    d2 = np.maximum(sq[:, None] + sq[None, :] - 2 * x @ x.T, 0.0)
+    return np.sqrt(d2)
+
+
+def count_unique_rows(x, max_exact=MAX_EXACT_UNIQUE):
+    """
+    Número de filas distintas. Con muchas filas, np.unique(axis=0) tarda más
+    que evaluar la población, así que cada fila se reduce a un hash de 64 bits
+    de sus bytes y se cuentan los hashes distintos tras ordenarlos (una
+    colisión solo subestimaría el recuento en una fila).
+    """
+    if len(x) <= max_exact:
+        return len(np.unique(x, axis=0))
+    words = np.ascontiguousarray(x, dtype=float).view(np.uint64)
+    hashes = words[:, 0].copy()
+    for k in range(1, words.shape[1]):
+        hashes *= np.uint64(0x100000001b3)  # Primo de FNV-1a
+        hashes ^= words[:, k]
+    hashes.sort()
+    return 1 + int(np.count_nonzero(hashes[1:] != hashes[:-1]))
+
+
+def diversity_metrics(genes, lower, upper, rng=None, max_pairs=MAX_EXACT_PAIRS):
+    """
+    Diversidad de una población: desviación estándar normalizada de cada gen,
+    distancia media entre pares (normalizada por la diagonal del espacio) y
+    fracción de genomas únicos.
+    """
+    x = normalize_genes(genes, lower, upper)
+    n, d = x.shape
+    if n < 2:
+        mean_distance = 0.0
+    elif n * (n - 1) // 2 <= max_pairs:
+        i, j = np.triu_indices(n, k=1)
+        mean_distance = float(np.linalg.norm(x[i] - x[j], axis=1).mean())
+    else:
+        rng = rng or np.random.default_rng()
+        i = rng.integers(0, n, max_pairs)
+        j = (i + rng.integers(1, n, max_pairs)) % n  # j != i
+        mean_distance = float(np.linalg.norm(x[i] - x[j], axis=1).mean())
+    std = x.std(axis=0)
+    return {
+        'mean_distance': mean_distance / np.sqrt(d),
+        'gene_std': dict(zip(GENES, std.tolist())),
+        'unique_fraction': count_unique_rows(x) / n if n else 0.0,
+    }
+
+
+def shared_fitness(fitness, genes, lower, upper, sigma_share=0.1, alpha=1.0):
+    """
+    Fitness con reparto (minimización): fitness · m_i, donde m_i es la suma
+    de sh(d) = 1 - (d / sigma_share)^alpha sobre los vecinos a menos de sigma_share.
+    """
+    x = normalize_genes(genes, lower, upper)
+    d = pairwise_distances(x) / np.sqrt(x.shape[1])
+    sh = np.where(d < sigma_share, 1.0 - (d / sigma_share) ** alpha, 0.0)
+    niche_count = sh.sum(axis=1)  # Incluye al propio individuo (sh = 1)
+    fitness = np.asarray(fitness, dtype=float)
+    # Desplazar para que todos los valores sean positivos antes de multiplicar
+    offset = min(0.0, float(fitness.min()))
+    return (fitness - offset + 1e-12) * niche_count + offset
+
+
+def cleared_fitness(fitness, genes, lower, upper, sigma_share=0.1, capacity=1):
+    """
+    Clearing: recorriendo de mejor a peor, cada individuo que conserva su
+    fitness elimina a los siguientes dentro de sigma_share una vez cubierta
+    la capacidad del nicho.
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    x = normalize_genes(genes, lower, upper)
+    d = pairwise_distances(x) / np.sqrt(x.shape[1])
+    order = np.argsort(fitness)
+    cleared = np.zeros(len(fitness), dtype=bool)
+    for i in order:
+        if cleared[i]:
+            continue
+        neighbours = order[(d[i, order] < sigma_share) & ~cleared[order]]
+        neighbours = neighbours[neighbours != i]
+        cleared[neighbours[capacity - 1:]] = True
+    result = fitness.copy()
+    result[cleared] = fitness.max()
+    return result
+
+
+def niche_fitness(method, fitness, genes, lower, upper, sigma_share=0.1):
+    """Aplica la técnica de nichos indicada ('sharing' o 'clearing')."""
+    if method == 'sharing':
+        return shared_fitness(fitness, genes, lower, upper, sigma_share)
+    if method == 'clearing':
+        return cleared_fitness(fitness, genes, lower, upper, sigma_share)
+    raise ValueError(f"Técnica de nichos desconocida: {method!r} (use {', '.join(NICHING)})")
@@ -0,0 +1,271 @@
+"""
+Exportación estructurada de resultados de OptiLuz.
+
+Escribe, para una o varias ejecuciones, un resumen (mejor solución y métricas
+derivadas: consumo antes/después, temperatura, tipo de aire acondicionado) y
+los historiales completos por generación en CSV, JSONL o Parquet.
+
+Las filas se escriben por bloques a medida que se generan, de modo que una
+exportación por lotes con miles de ejecuciones nunca tiene que residir
+completa en memoria. Parquet requiere pyarrow (opcional).
+
+Uso sin interfaz:
+    export_run(ga.run_evolution(display=False), "resultado.csv")
+
+Uso por lotes:
+    with open_exporter("lote.parquet") as exporter:
+        for run_id, result in ejecuciones:
+            exporter.write_run(result, run_id)
+"""
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from OptiluzKernels import GENES
+
+SUMMARY_FIELDS = ('run_id', 'superficie', 'ventanas', 'temp_ext', 'temp_int', 'carga', 'lux',
+                  'BTU', 'P_luz', 'U', 'N_personas', 'best_fitness', 'consumo_antes',
+                  'consumo_despues', 'ahorro', 'ahorro_pct', 'temp_promedio', 'tipo_ac',
+                  'personas_por_m2', 'm2_por_persona', 'horas_no_cubiertas', 'generaciones')
+
+HISTORY_FIELDS = ('run_id', 'generacion', 'fitness', 'temp_promedio',
+                  'BTU', 'P_luz', 'U', 'N_personas', 'horas_no_cubiertas', 'diversidad')
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def summary_row(result, run_id=0):
+    """Fila de resumen de un RunResult."""
+    row = {'run_id': run_id}
+    for key in ('superficie', 'ventanas', 'temp_ext', 'temp_int', 'carga', 'lux'):
+        row[key] = result.input.get(key)
+    for key in GENES:
+        row[key] = result.best_solution[key]
+    row['best_fitness'] = result.best_fitness
+    row.update(result.metrics)
+    row['generaciones'] = result.generations
+    return {key: row.get(key) for key in SUMMARY_FIELDS}
+
+
+def history_rows(result, run_id=0):
+    """Genera una fila por generación con el mejor individuo y su fitness."""
+    unmet = result.unmet_hours_history
+    diversity = result.diversity_history
+    for gen, (fitness, temp, sol) in enumerate(zip(result.fitness_history,
+                                                   result.temperature_history,
+                                                   result.best_solution_history)):
+        yield {
+            'run_id': run_id,
+            'generacion': gen,
+            'fitness': fitness,
+            'temp_promedio': temp,
+            'BTU': sol['BTU'],
+            'P_luz': sol['P_luz'],
+            'U': sol['U'],
+            'N_personas': sol['N_personas'],
+            'horas_no_cubiertas': unmet[gen] if gen < len(unmet) else None,
+            'diversidad': diversity[gen] if gen < len(diversity) else None,
+        }
+
+
+class Exporter(ABC):
+    """
+    Base de los exportadores: acumula filas en bloques de chunk_size y los
+    entrega a _flush_summary/_flush_history, que cada formato implementa.
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._summary = []
+        self._history = []
+        self.runs = 0
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_run(self, result, run_id=None):
+        """Agrega el resumen y el historial completo de un RunResult."""
+        if result is None:
+            raise ValueError("La ejecución no tiene resultados para exportar")
+        if run_id is None:
+            run_id = self.runs
+        self._summary.append(summary_row(result, run_id))
+        if len(self._summary) >= self.chunk_size:
+            self._flush_summary(self._summary)
+            self._summary = []
+        for row in history_rows(result, run_id):
+            self._history.append(row)
+            if len(self._history) >= self.chunk_size:
+                self._flush_history(self._history)
+                self._history = []
+        self.runs += 1
+
+    def flush(self):
+        if self._summary:
+            self._flush_summary(self._summary)
+            self._summary = []
+        if self._history:
+            self._flush_history(self._history)
+            self._history = []
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _flush_summary(self, rows):
+        """Escribe un bloque de filas de resumen."""
+
+    @abstractmethod
+    def _flush_history(self, rows):
+        """Escribe un bloque de filas de historial."""
+
+    def _close(self):
+        pass
+
+
+def _split_path(path, suffix):
+    base, ext = os.path.splitext(path)
+    return f"{base}_{suffix}{ext}"
+
+
+class CSVExporter(Exporter):
+    """Dos archivos CSV: <base>_resumen.csv y <base>_historial.csv."""
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        super().__init__(path, chunk_size)
+        self.summary_path = _split_path(path, "resumen")
+        self.history_path = _split_path(path, "historial")
+        self._files = []
+        self._summary_writer = self._open(self.summary_path, SUMMARY_FIELDS)
+        self._history_writer = self._open(self.history_path, HISTORY_FIELDS)
+
+    def _open(self, path, fields):
+        f = open(path, 'w', newline='', encoding='utf-8')
+        self._files.append(f)
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        return writer
+
+    def _flush_summary(self, rows):
+        self._summary_writer.writerows(rows)
+        self.rows += len(rows)
+
+    def _flush_history(self, rows):
+        self._history_writer.writerows(rows)
+        self.rows += len(rows)
+
+    def _close(self):
+        for f in self._files:
+            f.close()
+        self._files = []
+
+
+class JSONLExporter(Exporter):
+    """Un solo archivo JSONL; cada línea indica su "tipo" (resumen o historial)."""
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        super().__init__(path, chunk_size)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write(self, tipo, rows):
+        self._file.write(''.join(json.dumps(dict(row, tipo=tipo)) + '\n' for row in rows))
+        self.rows += len(rows)
+
+    def _flush_summary(self, rows):
+        self._write('resumen', rows)
+
+    def _flush_history(self, rows):
+        self._write('historial', rows)
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetExporter(Exporter):
+    """
+    Dos archivos Parquet (<base>_resumen.parquet y <base>_historial.parquet);
+    cada bloque se escribe como un grupo de filas.
+    """
+
+    SUMMARY_TYPES = {'tipo_ac': 'string', 'run_id': 'string', 'N_personas': 'int64',
+                     'horas_no_cubiertas': 'int64', 'generaciones': 'int64', 'ventanas': 'int64'}
+    HISTORY_TYPES = {'run_id': 'string', 'generacion': 'int64', 'N_personas': 'int64',
+                     'horas_no_cubiertas': 'int64'}
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        if pa is None:
+            raise ImportError("La exportación a Parquet requiere pyarrow (pip install pyarrow)")
+        super().__init__(path, chunk_size)
+        self.summary_path = _split_path(path, "resumen")
+        self.history_path = _split_path(path, "historial")
+        self._summary_schema = self._schema(SUMMARY_FIELDS, self.SUMMARY_TYPES)
+        self._history_schema = self._schema(HISTORY_FIELDS, self.HISTORY_TYPES)
+        self._summary_writer = pq.ParquetWriter(self.summary_path, self._summary_schema)
+        self._history_writer = pq.ParquetWriter(self.history_path, self._history_schema)
+
+    @staticmethod
+    def _schema(fields, types):
+        kinds = {'string': pa.string(), 'int64': pa.int64()}
+        return pa.schema([(name, kinds.get(types.get(name), pa.float64())) for name in fields])
+
+    @staticmethod
+    def _table(rows, schema):
+        columns = {}
+        for field in schema:
+            values = [row[field.name] for row in rows]
+            if pa.types.is_string(field.type):
+                values = [None if v is None else str(v) for v in values]
+            columns[field.name] = pa.array(values, type=field.type)
+        return pa.table(columns, schema=schema)
+
+    def _flush_summary(self, rows):
+        self._summary_writer.write_table(self._table(rows, self._summary_schema))
+        self.rows += len(rows)
+
+    def _flush_history(self, rows):
+        self._history_writer.write_table(self._table(rows, self._history_schema))
+        self.rows += len(rows)
+
+    def _close(self):
+        self._summary_writer.close()
+        self._history_writer.close()
+
+
+EXPORTERS = {'csv': CSVExporter, 'jsonl': JSONLExporter, 'parquet': ParquetExporter}
+
+
+def open_exporter(path, format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Abre un exportador; si no se indica format se deduce de la extensión."""
+    if format is None:
+        format = FORMATS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"No se puede deducir el formato de {path!r} (use .csv, .jsonl o .parquet)")
+    if format not in EXPORTERS:
+        raise ValueError(f"Formato de exportación desconocido: {format!r}")
+    return EXPORTERS[format](path, chunk_size=chunk_size)
+
+
+def export_run(result, path, format=None, run_id=0):
+    """Exporta un RunResult. Retorna la lista de archivos escritos."""
+    with open_exporter(path, format) as exporter:
+        exporter.write_run(result, run_id)
+    if isinstance(exporter, JSONLExporter):
+        return [path]
+    return [exporter.summary_path, exporter.history_path]
@@ -1,18 +1,72 @@
 import random
+import time
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator
+from OptiluzKernels import (GENES, get_backend, make_params, population_to_array,
+                            array_to_population, evaluate_genes, temperature_genes,
+                            mutate_genes)
+from OptiluzSimulation import simulate_hourly, summarize_hourly
+from OptiluzResult import GenerationSnapshot, RunResult
+from OptiluzDiversity import diversity_metrics, niche_fitness
 
 class OptiluzGA:
-    def __init__(self, input_data, pop_size=20):
+    # Factores para la evaluación (atributos de clase: los motores por lotes
+    # los leen sin crear una instancia)
+    BTU_FACTOR = 337        # Factor asociado a la superficie del aula para BTU
+    PERSON_FACTOR = 600     # Factor asociado a la cantidad de personas para BTU
+    EQUIP_FACTOR = 300      # Factor asociado a la carga térmica de equipos
+    WINDOW_AREA = 1.5       # Área promedio de cada ventana (m²)
+    
+    # Constantes para el cálculo de temperatura
+    CALOR_PERSONA = 100     # Watts por persona
+    EFICIENCIA_AC = 0.8     # Eficiencia típica de un aire acondicionado
+    
+    def __init__(self, input_data, pop_size=20, profile=None, seed=None,
+                 warm_start=None, warm_fraction=0.25, warm_k=5, surrogate=None, robust=None,
+                 niching=None, sigma_share=0.1, restart_threshold=None, restart_fraction=0.5,
+                 parallel=None):
         self.input_data = input_data
         self.pop_size = pop_size
+        self.seed = seed                 # Semilla para ejecuciones reproducibles (None = aleatoria)
+        
+        # Arranque en caliente: índice de soluciones pasadas (OptiluzWarmStart.SolutionIndex)
+        self.warm_start = warm_start
+        self.warm_fraction = warm_fraction
+        self.warm_k = warm_k
+        self.warm_seeded = 0
+        
+        # Modelo sustituto opcional para preseleccionar a los hijos (OptiluzSurrogate.SurrogateScreener)
+        self.surrogate = surrogate
+        # Objetivo robusto opcional sobre escenarios de clima y ocupación (OptiluzRobust.RobustObjective)
+        self.robust = robust
+        # Evaluador paralelo opcional para poblaciones grandes (OptiluzParallel.SharedMemoryEvaluator)
+        self.parallel = parallel
+        
+        # Nichos ('sharing' o 'clearing') y reinicios parciales por baja diversidad (OptiluzDiversity)
+        self.niching = niching
+        self.sigma_share = sigma_share
+        self.restart_threshold = restart_threshold
+        self.restart_fraction = restart_fraction
+        self.diversity_history = []      # Distancia media normalizada entre individuos por generación
+        self.diversity = None            # Métricas de diversidad de la última generación
+        self.restarts = 0
+        self.duplicates_skipped = 0
+        self.skipped_evaluations = 0     # Hijos que heredaron el fitness de su padre (modo estacionario)
+        self.population_fitness = None
+        # Control de iter_generations entre generaciones
+        self.mutation_rate = None
+        self.stop_requested = False
+        self.stop_reason = None
+        self.pending_individuals = []    # Individuos agregados con inject
+        # Perfil horario opcional (HourlyProfile); por defecto el de los datos de entrada
+        self.profile = profile if profile is not None else getattr(input_data, 'perfil', None)
         self.population = []
         self.fitness_history = []
         self.best_solution = None
         self.best_fitness = float('inf')
         self.best_solution_history = []  # Para guardar el mejor individuo de cada generación
         self.temperature_history = []    # Para guardar la temperatura promedio en cada generación
+        self.unmet_hours_history = []    # Horas no cubiertas del mejor individuo (modo horario)
+        self.result = None               # RunResult de la última ejecución
         
         # Definir rangos para cada variable optimizable (con límites más precisos)
         self.bounds = {
@@ -25,15 +79,13 @@ class OptiluzGA:
         # Ajustar límites basados en las entradas
         self._adjust_bounds()
         
-        # Factores para la evaluación
-        self.BTU_FACTOR = 337        # Factor asociado a la superficie del aula para BTU
-        self.PERSON_FACTOR = 600     # Factor asociado a la cantidad de personas para BTU
-        self.EQUIP_FACTOR = 300      # Factor asociado a la carga térmica de equipos
-        self.WINDOW_AREA = 1.5       # Área promedio de cada ventana (m²)
-        
-        # Constantes para el cálculo de temperatura
-        self.CALOR_PERSONA = 100     # Watts por persona
-        self.EFICIENCIA_AC = 0.8     # Eficiencia típica de un aire acondicionado
+        # Motor de cálculo vectorizado (numba si está disponible, si no NumPy)
+        self.backend = get_backend()
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+        self.diversity_rng = np.random.default_rng(seed)  # Muestreo de pares, aparte de la evolución
+        self.evaluations = 0
+        self.run_stats = {}
     
     def _adjust_bounds(self):
         """Ajusta los límites de las variables según las entradas"""
@@ -51,6 +103,51 @@ class OptiluzGA:
         min_personas = max(5, self.input_data.superficie / 4)
         max_personas = min(100, self.input_data.superficie / 1.5)
         self.bounds['N_personas'] = (int(min_personas), int(max_personas))
+    
+    def kernel_params(self):
+        """Vector de parámetros usado por los núcleos vectorizados de evaluación."""
+        return make_params(self.input_data, self)
+    
+    def config_fingerprint(self):
+        """
+        Opciones de construcción que cambian el resultado de una ejecución:
+        sustituto, objetivo robusto, nichos, reinicios, arranque en caliente y
+        contenido del perfil horario. OptiluzCache la incluye en la clave.
+        """
+        surrogate = robust = warm_start = None
+        if self.surrogate is not None:
+            surrogate = {'fraction': self.surrogate.fraction, 'refit_every': self.surrogate.refit_every,
+                         'min_points': self.surrogate.min_points, 'max_points': self.surrogate.max_points,
+                         'regularization': self.surrogate.model.regularization}
+        if self.robust is not None:
+            robust = {'scenarios': self.robust.scenarios, 'measure': self.robust.measure,
+                      'level': self.robust.level, 'temp_sd': self.robust.temp_sd,
+                      'carga_cv': self.robust.carga_cv, 'ocupacion': list(self.robust.ocupacion),
+                      'seed': self.robust.seed}
+        if self.warm_start is not None:
+            warm_start = {'fraction': self.warm_fraction, 'k': self.warm_k,
+                          'index': self.warm_start.fingerprint()}
+        return {
+            'surrogate': surrogate,
+            'robust': robust,
+            'niching': self.niching,
+            'sigma_share': self.sigma_share,
+            'restart_threshold': self.restart_threshold,
+            'restart_fraction': self.restart_fraction,
+            'warm_start': warm_start,
+            'profile': self.profile.fingerprint() if self.profile is not None else None,
+        }
+    
+    def clip_population(self, population):
+        """Ajusta una población (lista de individuos) a los límites actuales."""
+        lower, upper = self.bounds_arrays()
+        return array_to_population(np.clip(population_to_array(population), lower, upper))
+    
+    def bounds_arrays(self):
+        """Devuelve los límites inferior y superior en el orden de GENES."""
+        lower = np.array([self.bounds[key][0] for key in GENES], dtype=float)
+        upper = np.array([self.bounds[key][1] for key in GENES], dtype=float)
+        return lower, upper
         
     def calculate_avg_temperature(self, individual):
         """
@@ -120,17 +217,37 @@ class OptiluzGA:
                 
         return temp_promedio
     
+    def simulate_individual(self, individual):
+        """
+        Simula un individuo hora a hora con el perfil configurado.
+        Retorna (temperaturas_horarias, horas_no_cubiertas).
+        """
+        if self.profile is None:
+            raise ValueError("No hay un perfil horario configurado")
+        genes = population_to_array([individual])
+        temps, unmet = simulate_hourly(genes, self.kernel_params(), self.profile)
+        return temps[0], int(unmet[0])
+    
+    def random_individual(self):
+        """Individuo aleatorio dentro de los límites."""
+        return {
+            'BTU': self.random.uniform(self.bounds['BTU'][0], self.bounds['BTU'][1]),
+            'P_luz': self.random.uniform(self.bounds['P_luz'][0], self.bounds['P_luz'][1]),
+            'U': self.random.uniform(self.bounds['U'][0], self.bounds['U'][1]),
+            'N_personas': self.random.randint(self.bounds['N_personas'][0], self.bounds['N_personas'][1])
+        }
+    
     def initialize_population(self):
         """Inicializa la población con valores aleatorios dentro de los límites definidos."""
-        self.population = []
-        for _ in range(self.pop_size):
-            individual = {
-                'BTU': random.uniform(self.bounds['BTU'][0], self.bounds['BTU'][1]),
-                'P_luz': random.uniform(self.bounds['P_luz'][0], self.bounds['P_luz'][1]),
-                'U': random.uniform(self.bounds['U'][0], self.bounds['U'][1]),
-                'N_personas': random.randint(self.bounds['N_personas'][0], self.bounds['N_personas'][1])
-            }
-            self.population.append(individual)
+        self.population = [self.random_individual() for _ in range(self.pop_size)]
+        
+        # Sembrar una fracción de la población con soluciones de aulas parecidas
+        self.warm_seeded = 0
+        if self.warm_start is not None:
+            n_warm = int(round(self.pop_size * self.warm_fraction))
+            seeds = self.warm_start.seed_population(self, n_warm, self.warm_k)
+            self.population[:len(seeds)] = seeds
+            self.warm_seeded = len(seeds)
     
     def evaluate_individual(self, individual):
         """
@@ -207,16 +324,86 @@ class OptiluzGA:
         fitness = alpha * E_total + beta * C_penalizacion
         return fitness
     
+    def _true_fitness(self, genes, params):
+        """
+        Fitness real de una matriz de genes. En modo horario también retorna la
+        temperatura media y las horas no cubiertas de cada fila. Los genomas
+        repetidos se evalúan una sola vez, salvo en los lotes que reparte el
+        evaluador paralelo: con 10^6 filas, np.unique tarda más que evaluarlas.
+        """
+        if self.parallel is not None and len(genes) >= self.parallel.min_rows:
+            unique, inverse = genes, slice(None)
+        else:
+            unique, inverse = np.unique(genes, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        self.duplicates_skipped += len(genes) - len(unique)
+        
+        if self.robust is not None:
+            fitness = self.robust.evaluate(unique, self.parallel)
+        elif self.parallel is not None:
+            fitness = self.parallel.evaluate(unique, params)
+        else:
+            fitness = evaluate_genes(unique, params, self.backend)
+        self.evaluations += len(unique)
+        mean_temps = unmet = None
+        
+        # Modo horario: penalizar las horas ocupadas sin capacidad de enfriamiento suficiente
+        if self.profile is not None:
+            mean_temps, unmet = summarize_hourly(unique, params, self.profile)
+            fitness = fitness + self.input_data.beta * unmet / max(1, self.profile.occupied_hours)
+            mean_temps, unmet = mean_temps[inverse], unmet[inverse]
+        return fitness[inverse], mean_temps, unmet
+    
     def evaluate_population(self):
-        """Evalúa toda la población y actualiza el mejor individuo encontrado."""
-        fitness_values = []
-        for ind in self.population:
-            fitness = self.evaluate_individual(ind)
-            fitness_values.append(fitness)
-        
-        # Encontrar el mejor individuo de esta generación
-        min_fitness = min(fitness_values)
-        best_idx = fitness_values.index(min_fitness)
+        """
+        Evalúa toda la población en un solo cálculo vectorizado y actualiza el
+        mejor individuo encontrado. Con un sustituto configurado, solo la
+        fracción más prometedora recibe una evaluación real.
+        """
+        genes = population_to_array(self.population)
+        params = self.kernel_params()
+        
+        if self.surrogate is not None:
+            extras = {}
+            
+            def true_fitness(indices):
+                values, temps, unmet = self._true_fitness(genes[indices], params)
+                extras.update(indices=indices, temps=temps, unmet=unmet)
+                return values
+            
+            lower, upper = self.bounds_arrays()
+            fitness, evaluated = self.surrogate.evaluate(genes, lower, upper, true_fitness)
+            mean_temps = unmet = None
+            if self.profile is not None:
+                mean_temps = np.full(len(genes), np.nan)
+                unmet = np.zeros(len(genes), dtype=int)
+                mean_temps[extras['indices']] = extras['temps']
+                unmet[extras['indices']] = extras['unmet']
+            # El mejor de la generación se elige solo entre los evaluados de verdad
+            best_idx = int(np.flatnonzero(evaluated)[np.argmin(fitness[evaluated])])
+        else:
+            fitness, mean_temps, unmet = self._true_fitness(genes, params)
+            best_idx = int(np.argmin(fitness))
+        # Fitness conocido de cada individuo (lo reutiliza el modo de estado estacionario)
+        self.population_fitness = fitness
+        self._population_temps, self._population_unmet = mean_temps, unmet
+        return self._record_generation(genes, fitness, mean_temps, unmet, best_idx, params)
+    
+    def _record_generation(self, genes, fitness, mean_temps, unmet, best_idx, params):
+        """
+        Registra la diversidad, el mejor individuo y los historiales de una
+        generación ya evaluada. Retorna el fitness como lista.
+        """
+        fitness_values = fitness.tolist()
+        
+        # Diversidad de la generación (sobre los genes normalizados)
+        lower, upper = self.bounds_arrays()
+        self.diversity = diversity_metrics(genes, lower, upper, self.diversity_rng)
+        self.diversity_history.append(self.diversity['mean_distance'])
+        self._genes = genes
+        
+        # Mejor individuo de esta generación
+        min_fitness = fitness_values[best_idx]
         best_ind = self.population[best_idx]
         
         # Actualizar el mejor global si es mejor que el anterior
@@ -229,11 +416,77 @@ class OptiluzGA:
         self.fitness_history.append(min_fitness)
         
         # Calcular y guardar la temperatura promedio del mejor individuo de esta generación
-        best_temp = self.calculate_avg_temperature(best_ind)
-        self.temperature_history.append(best_temp)
+        if self.profile is not None:
+            best_temp = mean_temps[best_idx]
+            self.unmet_hours_history.append(int(unmet[best_idx]))
+        else:
+            best_temp = temperature_genes(genes[best_idx:best_idx + 1], params, self.backend)[0]
+        self.temperature_history.append(float(best_temp))
         
         return fitness_values
     
+    def steady_state_step(self, mutation_rate=0.1, crossover_rate=0.9, tournament_size=3,
+                          offspring=None):
+        """
+        Una generación (μ+λ): se generan λ hijos por torneo, cruce y mutación;
+        solo se evalúan los hijos cuyo genoma difiere del padre del que
+        provienen (el resto hereda su fitness) y sobreviven los μ mejores de
+        padres e hijos. Los padres conservan el fitness ya calculado. Con
+        nichos, el torneo usa el fitness modificado y la supervivencia el real.
+        """
+        lam = offspring or self.pop_size
+        parent_genes = population_to_array(self.population)
+        parent_fitness = self.population_fitness
+        params = self.kernel_params()
+        n = len(self.population)
+        tournament_fitness = parent_fitness
+        if self.niching is not None:
+            lower, upper = self.bounds_arrays()
+            tournament_fitness = niche_fitness(self.niching, parent_fitness, parent_genes,
+                                               lower, upper, self.sigma_share)
+        
+        # Torneo y cruce por parejas; cada hijo recuerda a su padre de origen
+        children, origin = [], []
+        size = min(tournament_size, n)
+        while len(children) < lam:
+            a, b = (min(self.random.sample(range(n), size), key=lambda i: tournament_fitness[i])
+                    for _ in range(2))
+            child1, child2 = self.crossover(self.population[a], self.population[b], crossover_rate)
+            children.extend([child1, child2])
+            origin.extend([a, b])
+        children = self.mutate_population(children[:lam], mutation_rate)
+        origin = np.array(origin[:lam])
+        child_genes = population_to_array(children)
+        
+        # Hijos idénticos a su padre: heredan el fitness sin evaluarse
+        inherited = np.all(child_genes == parent_genes[origin], axis=1)
+        changed = np.flatnonzero(~inherited)
+        self.skipped_evaluations += int(inherited.sum())
+        child_fitness = parent_fitness[origin].copy()
+        child_temps = child_unmet = None
+        if self.profile is not None:
+            child_temps = self._population_temps[origin].copy()
+            child_unmet = self._population_unmet[origin].copy()
+        if len(changed):
+            values, temps, unmet = self._true_fitness(child_genes[changed], params)
+            child_fitness[changed] = values
+            if self.profile is not None:
+                child_temps[changed] = temps
+                child_unmet[changed] = unmet
+        
+        # Selección (μ+λ): los μ mejores entre padres e hijos
+        pool_genes = np.vstack([parent_genes, child_genes])
+        pool_fitness = np.concatenate([parent_fitness, child_fitness])
+        keep = np.argsort(pool_fitness, kind='stable')[:self.pop_size]
+        pool = self.population + children
+        self.population = [pool[i] for i in keep]
+        self.population_fitness = pool_fitness[keep]
+        if self.profile is not None:
+            self._population_temps = np.concatenate([self._population_temps, child_temps])[keep]
+            self._population_unmet = np.concatenate([self._population_unmet, child_unmet])[keep]
+        return self._record_generation(pool_genes[keep], self.population_fitness,
+                                       self._population_temps, self._population_unmet, 0, params)
+    
     def selection(self, fitness_values, tournament_size=3, elitism=2):
         """
         Realiza la selección mediante el método de torneo, con opción de elitismo.
@@ -251,7 +504,7 @@ class OptiluzGA:
         # Selección por torneo para el resto
         while len(selected) < self.pop_size:
             # Seleccionar aleatoriamente individuos para el torneo
-            tournament_indices = random.sample(range(len(self.population)), tournament_size)
+            tournament_indices = self.random.sample(range(len(self.population)), tournament_size)
             # Encontrar el mejor del torneo
             best_in_tournament = min(tournament_indices, key=lambda i: fitness_values[i])
             selected.append(self.population[best_in_tournament].copy())
@@ -263,7 +516,7 @@ class OptiluzGA:
         Realiza el cruce entre dos padres con una probabilidad dada.
         Si no hay cruce, retorna copias de los padres.
         """
-        if random.random() > crossover_rate:
+        if self.random.random() > crossover_rate:
             return parent1.copy(), parent2.copy()
             
         # Lista de genes a cruzar
@@ -273,7 +526,7 @@ class OptiluzGA:
         child1, child2 = {}, {}
         
         # Determinar el punto de cruce para variables discretas
-        crossover_point = random.randint(1, len(keys) - 1)
+        crossover_point = self.random.randint(1, len(keys) - 1)
         
         for i, key in enumerate(keys):
             if key == 'N_personas':  # Variable discreta
@@ -285,7 +538,7 @@ class OptiluzGA:
                     child2[key] = parent1[key]
             else:  # Variables continuas: cruce aritmético
                 # Generar un factor de mezcla aleatorio
-                alpha = random.random()
+                alpha = self.random.random()
                 child1[key] = alpha * parent1[key] + (1 - alpha) * parent2[key]
                 child2[key] = (1 - alpha) * parent1[key] + alpha * parent2[key]
                 
@@ -304,10 +557,10 @@ class OptiluzGA:
         
         for key in mutated:
             # Aplicar mutación con probabilidad mutation_rate
-            if random.random() < mutation_rate:
+            if self.random.random() < mutation_rate:
                 if key == 'N_personas':  # Variable discreta
                     # Mutación aditiva: sumar o restar un pequeño valor aleatorio
-                    delta = random.randint(-5, 5)
+                    delta = self.random.randint(-5, 5)
                     mutated[key] += delta
                     # Asegurar que está dentro de los límites
                     mutated[key] = max(self.bounds[key][0], min(self.bounds[key][1], mutated[key]))
@@ -321,7 +574,7 @@ class OptiluzGA:
                     sigma = range_size * 0.1
                     
                     # Generar un valor aleatorio según distribución normal
-                    delta = random.gauss(0, sigma)
+                    delta = self.random.gauss(0, sigma)
                     mutated[key] += delta
                     
                     # Asegurar que está dentro de los límites
@@ -329,6 +582,18 @@ class OptiluzGA:
         
         return mutated
     
+    def mutate_population(self, population, mutation_rate=0.1):
+        """
+        Aplica la misma mutación que mutate a una lista de individuos en una
+        sola llamada al núcleo vectorizado.
+        """
+        if not population:
+            return []
+        lower, upper = self.bounds_arrays()
+        genes = mutate_genes(population_to_array(population), lower, upper,
+                             mutation_rate, self.rng, self.backend)
+        return array_to_population(genes)
+    
     def evolve_population(self, fitness_values, mutation_rate=0.1, crossover_rate=0.9, 
                          tournament_size=3, elitism=2):
         """
@@ -348,27 +613,23 @@ class OptiluzGA:
         # Cruce y mutación para el resto
         # Barajar la lista para no emparejar siempre los mismos
         remaining = selected[elitism:]
-        random.shuffle(remaining)
+        self.random.shuffle(remaining)
         
+        children = []
         for i in range(0, len(remaining) - 1, 2):
             parent1 = remaining[i]
             parent2 = remaining[i + 1]
             
             # Cruce
             child1, child2 = self.crossover(parent1, parent2, crossover_rate)
-            
-            # Mutación
-            child1 = self.mutate(child1, mutation_rate)
-            child2 = self.mutate(child2, mutation_rate)
-            
-            # Añadir a la nueva población
-            new_population.extend([child1, child2])
+            children.extend([child1, child2])
         
         # Si falta un individuo (población impar)
-        if len(new_population) < self.pop_size and remaining:
-            last_parent = remaining[-1]
-            last_child = self.mutate(last_parent, mutation_rate)
-            new_population.append(last_child)
+        if len(new_population) + len(children) < self.pop_size and remaining:
+            children.append(remaining[-1])
+        
+        # Mutación de todos los hijos en una sola pasada vectorizada
+        new_population.extend(self.mutate_population(children, mutation_rate))
         
         # Asegurar que la población tiene el tamaño correcto
         while len(new_population) > self.pop_size:
@@ -377,103 +638,336 @@ class OptiluzGA:
         self.population = new_population
         return new_population
     
-    def run_evolution(self, generations=50, mutation_rate=0.1, crossover_rate=0.9, 
-                    tournament_size=3, elitism=2):
+    def iter_generations(self, generations=50, mutation_rate=0.1, crossover_rate=0.9,
+                         tournament_size=3, elitism=2, initial_population=None,
+                         patience=None, tolerance=1e-4, steady_state=False, offspring=None):
         """
-        Ejecuta el ciclo completo de evolución del algoritmo genético.
-        Muestra el progreso y aplica una reducción gradual de la tasa de mutación.
+        Ejecuta la evolución generación por generación. Tras evaluar cada
+        generación entrega un GenerationSnapshot y espera a que el llamador
+        pida la siguiente, de modo que entre pasos puede:
+        
+            - detener la ejecución (request_stop o simplemente dejar de iterar),
+            - agregar individuos a la siguiente generación (inject),
+            - cambiar la tasa base de mutación (set_mutation_rate).
+        
+        Al terminar (o al cerrarse el iterador) se completa la ejecución y el
+        RunResult queda en self.result. Los argumentos son los de run_evolution.
+        
+        El modo estacionario no admite un sustituto: los padres conservan su
+        fitness entre generaciones y una predicción nunca se corregiría.
+        Tampoco admite reinicios parciales, que descartarían el fitness de los
+        reemplazados; los nichos se aplican al torneo de steady_state_step.
         """
+        if steady_state and self.surrogate is not None:
+            raise ValueError("El modo estacionario no admite un modelo sustituto (surrogate)")
+        if steady_state and self.restart_threshold is not None:
+            raise ValueError("El modo estacionario no admite reinicios parciales (restart_threshold)")
         # Inicializar población y variables
-        self.initialize_population()
+        if initial_population is not None:
+            seeded = self.clip_population(initial_population)[:self.pop_size]
+            self.initialize_population()
+            self.population[:len(seeded)] = seeded
+        else:
+            self.initialize_population()
+        self.apply_injections()  # Individuos agregados antes de empezar
         self.fitness_history = []
         self.best_solution_history = []
+        self.temperature_history = []
+        self.unmet_hours_history = []
+        self.diversity_history = []
         self.best_fitness = float('inf')
-        
-        print("Iniciando optimización...")
+        self.evaluations = 0
+        self.duplicates_skipped = 0
+        self.skipped_evaluations = 0
+        self.restarts = 0
+        self.mutation_rate = mutation_rate
+        self.stop_requested = False
+        self.stop_reason = 'generaciones'
+        if self.surrogate is not None:
+            self.surrogate.reset()
+        if self.robust is not None:
+            # Escenarios comunes a todas las generaciones de esta ejecución
+            self.robust.bind(self.kernel_params(), self.rng)
+        start_time = time.perf_counter()
         
         # Evolución a lo largo de las generaciones
-        for gen in range(generations):
-            # Reducir gradualmente la tasa de mutación
-            current_mutation_rate = mutation_rate * (1 - gen / generations * 0.7)
-            
-            # Evaluar población actual
-            fitness_values = self.evaluate_population()
-            
-            # Imprimir progreso
-            if (gen + 1) % max(1, generations // 10) == 0 or gen == 0:
-                min_fit = min(fitness_values)
-                avg_fit = sum(fitness_values) / len(fitness_values)
-                print(f"Generación {gen+1}/{generations}: Mejor Fitness = {min_fit:.4f}, "
-                     f"Fitness Promedio = {avg_fit:.4f}")
-            
-            # Evolucionar a la siguiente generación (excepto en la última)
-            if gen < generations - 1:
-                self.evolve_population(
-                    fitness_values, 
-                    mutation_rate=current_mutation_rate,
-                    crossover_rate=crossover_rate,
-                    tournament_size=tournament_size,
-                    elitism=elitism
+        stalled = 0
+        generations_run = 0
+        try:
+            for gen in range(generations):
+                # Reducir gradualmente la tasa de mutación
+                current_mutation_rate = self.mutation_rate * (1 - gen / generations * 0.7)
+                
+                # Evaluar población actual (completa si se agregaron individuos)
+                previous_best = self.best_fitness
+                if steady_state and gen > 0 and not self.apply_injections():
+                    fitness_values = self.steady_state_step(current_mutation_rate, crossover_rate,
+                                                            tournament_size, offspring)
+                else:
+                    fitness_values = self.evaluate_population()
+                generations_run = gen + 1
+                
+                if previous_best == float('inf') or \
+                        self.best_fitness < previous_best - abs(previous_best) * tolerance:
+                    stalled = 0
+                else:
+                    stalled += 1
+                
+                yield GenerationSnapshot(
+                    generation=gen + 1,
+                    generations=generations,
+                    best_fitness=self.best_fitness,
+                    generation_best=float(np.min(fitness_values)),
+                    mean_fitness=float(np.mean(fitness_values)),
+                    best_solution=self.best_solution,
+                    diversity=float(self.diversity['mean_distance']),
+                    mutation_rate=self.mutation_rate,
+                    evaluations=self.evaluations,
+                    stalled=stalled,
+                    elapsed=time.perf_counter() - start_time,
                 )
+                
+                # Detención pedida por el llamador o por estancamiento
+                if self.stop_requested:
+                    self.stop_reason = 'detenido'
+                    break
+                if patience is not None and stalled >= patience:
+                    self.stop_reason = 'estancamiento'
+                    break
+                
+                # Evolucionar a la siguiente generación (excepto en la última)
+                if gen < generations - 1 and not steady_state:
+                    current_mutation_rate = self.mutation_rate * (1 - gen / generations * 0.7)
+                    selection_fitness = fitness_values
+                    if self.niching is not None:
+                        lower, upper = self.bounds_arrays()
+                        selection_fitness = niche_fitness(self.niching, fitness_values, self._genes,
+                                                          lower, upper, self.sigma_share).tolist()
+                    self.evolve_population(
+                        selection_fitness, 
+                        mutation_rate=current_mutation_rate,
+                        crossover_rate=crossover_rate,
+                        tournament_size=tournament_size,
+                        elitism=elitism
+                    )
+                    if self.restart_threshold is not None and \
+                            self.diversity['mean_distance'] < self.restart_threshold:
+                        self.partial_restart(elitism)
+                    self.apply_injections()
+        except GeneratorExit:
+            # El llamador dejó de iterar: la ejecución se cierra con lo evaluado
+            self.stop_reason = 'detenido'
+            self._finish_run(generations, generations_run, steady_state, start_time)
+            raise
+        self._finish_run(generations, generations_run, steady_state, start_time)
+    
+    def request_stop(self):
+        """Pide detener la ejecución de iter_generations tras la generación actual."""
+        self.stop_requested = True
+    
+    def set_mutation_rate(self, mutation_rate):
+        """Cambia la tasa base de mutación de las generaciones siguientes."""
+        self.mutation_rate = mutation_rate
+    
+    def inject(self, individuals):
+        """
+        Agrega individuos (ajustados a los límites) a la siguiente generación
+        de iter_generations; reemplazan a los últimos de la población. Los
+        agregados después de la última generación se evalúan al cerrar la
+        ejecución, de modo que también pueden ser la mejor solución.
+        """
+        self.pending_individuals.extend(self.clip_population(individuals))
+    
+    def apply_injections(self):
+        """Coloca los individuos pendientes al final de la población. Retorna si hubo alguno."""
+        pending = self.pending_individuals[:self.pop_size]
+        self.pending_individuals = []
+        if not pending:
+            return False
+        self.population[-len(pending):] = pending
+        return True
+    
+    def _finish_run(self, generations, generations_run, steady_state, start_time):
+        """Cierra una ejecución: individuos pendientes, estadísticas y RunResult."""
+        # La población final ya está evaluada (el ciclo nunca termina tras
+        # evolucionar); solo se evalúa otra vez si se agregaron individuos
+        # después de la última generación
+        if generations_run and self.apply_injections():
+            self.evaluate_population()
+        
+        # Registrar la solución para futuros arranques en caliente
+        if self.warm_start is not None and self.best_solution is not None:
+            self.warm_start.add(self.input_data, self.best_solution, self.bounds)
+        
+        # Estadísticas de la ejecución
+        self.run_stats = {
+            'backend': self.backend,
+            'parallel_workers': self.parallel.workers if self.parallel is not None else 0,
+            'hours': self.profile.hours if self.profile is not None else 0,
+            'generations': generations_run,
+            'stopped_early': generations_run < generations,
+            'stop_reason': self.stop_reason,
+            'evaluations': self.evaluations,
+            'convergence_generation': self.convergence_generation(),
+            'warm_seeded': self.warm_seeded,
+            'duplicates_skipped': self.duplicates_skipped,
+            'skipped_evaluations': self.skipped_evaluations,
+            'steady_state': steady_state,
+            'restarts': self.restarts,
+            'diversity': self.diversity_history[-1] if self.diversity_history else None,
+            'elapsed': time.perf_counter() - start_time
+        }
+        if self.surrogate is not None:
+            self.run_stats['surrogate'] = self.surrogate.stats()
+        if self.robust is not None:
+            self.run_stats['robust'] = {'scenarios': self.robust.scenarios,
+                                        'measure': self.robust.measure,
+                                        'level': self.robust.level}
+        if self.best_solution is not None:
+            self.result = self.build_result()
+    
+    def run_evolution(self, generations=50, mutation_rate=0.1, crossover_rate=0.9, 
+                    tournament_size=3, elitism=2, display=True,
+                    initial_population=None, patience=None, tolerance=1e-4,
+                    steady_state=False, offspring=None):
+        """
+        Ejecuta el ciclo completo de evolución del algoritmo genético.
+        Muestra el progreso y aplica una reducción gradual de la tasa de mutación.
+        Retorna un RunResult inmutable. Con display=False no se genera el
+        reporte final ni las gráficas (ejecuciones sin interfaz), por lo que
+        matplotlib no llega a importarse.
+        
+        initial_population: población de partida (por ejemplo la final de una
+            ejecución anterior); se ajusta a los límites actuales y se completa
+            con individuos aleatorios si es más pequeña que pop_size.
+        patience: detiene la evolución tras ese número de generaciones sin una
+            mejora relativa del mejor fitness mayor que tolerance.
+        steady_state: modo (μ+λ) con offspring hijos por generación (por
+            defecto pop_size); solo se evalúan los hijos nuevos. No admite
+            un sustituto ni reinicios parciales (ValueError).
+
+        Con parallel (SharedMemoryEvaluator) solo se reparte el cálculo del
+        fitness; la selección, el cruce y la conversión de la población a
+        matriz siguen en el proceso principal y dominan el tiempo con
+        poblaciones grandes.
+        """
+        print(f"Iniciando optimización (motor de cálculo: {self.backend})...")
         
-        # Evaluar una última vez para asegurar que tenemos el mejor individuo
-        self.evaluate_population()
-        
+        for snapshot in self.iter_generations(
+                generations, mutation_rate, crossover_rate, tournament_size, elitism,
+                initial_population, patience, tolerance, steady_state, offspring):
+            # Imprimir progreso
+            gen = snapshot.generation
+            if gen % max(1, generations // 10) == 0 or gen == 1:
+                print(f"Generación {gen}/{generations}: Mejor Fitness = {snapshot.generation_best:.4f}, "
+                     f"Fitness Promedio = {snapshot.mean_fitness:.4f}, Diversidad = {snapshot.diversity:.3f}")
+        
+        if self.stop_reason == 'estancamiento':
+            print(f"Sin mejora en {patience} generaciones: detenido en la generación "
+                  f"{self.run_stats['generations']}")
         print("\nOptimización finalizada.")
+        print(f"Motor de cálculo: {self.backend} | Evaluaciones: {self.evaluations} | "
+              f"Tiempo: {self.run_stats['elapsed']:.3f} s")
+        if self.surrogate is not None:
+            print(f"Sustituto: {self.surrogate.saved_evaluations} evaluaciones reales ahorradas, "
+                  f"{self.surrogate.refits} reajustes")
         print(f"Mejor Fitness encontrado: {self.best_fitness:.4f}")
         
         # Mostrar resultados
-        self.display_results()
-    
-    def display_results(self):
-        """Muestra los resultados finales y genera visualizaciones."""
-        print("\n RESULTADOS OPTIMIZADOS:")
-        print(f"Capacidad Óptima del Aire Acondicionado: {self.best_solution['BTU']:.2f} BTU")
-        print(f"Tipo de Aire Acondicionado Recomendado: {self.get_AC_type(self.best_solution['BTU'])}")
-        print(f"Potencia de Iluminación Recomendada: {self.best_solution['P_luz']:.2f} W")
-        print(f"Nivel Óptimo de Aislamiento Térmico (U): {self.best_solution['U']:.2f}")
-        print(f"Cantidad Recomendada de Personas por Aula: {self.best_solution['N_personas']}\n")
-
-        # Simulación de consumo energético antes y después de la optimización
+        if display:
+            self.display_results()
+        return self.result
+    
+    def partial_restart(self, elitism=2):
+        """
+        Reinicio parcial por baja diversidad: reemplaza una fracción de la
+        población (sin tocar a los élites) por individuos aleatorios.
+        """
+        n = min(int(self.pop_size * self.restart_fraction), len(self.population) - elitism)
+        if n <= 0:
+            return
+        self.population[-n:] = [self.random_individual() for _ in range(n)]
+        self.restarts += 1
+    
+    def convergence_generation(self, tolerance=1e-3):
+        """Primera generación cuyo mejor fitness está a menos de tolerance (relativa) del óptimo final."""
+        target = self.best_fitness + abs(self.best_fitness) * tolerance
+        for gen, fitness in enumerate(self.fitness_history):
+            if fitness <= target:
+                return gen + 1
+        return len(self.fitness_history)
+    
+    def build_result(self):
+        """Construye el RunResult inmutable con el estado actual de la ejecución."""
+        return RunResult(
+            input=self.input_data.to_dict(),
+            best_solution=self.best_solution,
+            best_fitness=self.best_fitness,
+            fitness_history=self.fitness_history,
+            best_solution_history=self.best_solution_history,
+            temperature_history=self.temperature_history,
+            unmet_hours_history=self.unmet_hours_history,
+            diversity_history=self.diversity_history,
+            metrics=self.derived_metrics(),
+            run_stats=self.run_stats,
+        )
+    
+    def export_state(self):
+        """Devuelve el resultado de la última ejecución como diccionario serializable."""
+        return self.result.to_dict()
+    
+    def load_state(self, state):
+        """
+        Restaura el resultado de una ejecución (RunResult o diccionario
+        guardado con export_state). Retorna el RunResult.
+        """
+        result = state if isinstance(state, RunResult) else RunResult.from_dict(state)
+        self.best_solution = dict(result.best_solution)
+        self.best_fitness = result.best_fitness
+        self.fitness_history = list(result.fitness_history)
+        self.best_solution_history = [dict(sol) for sol in result.best_solution_history]
+        self.temperature_history = list(result.temperature_history)
+        self.unmet_hours_history = list(result.unmet_hours_history)
+        self.diversity_history = list(result.diversity_history)
+        self.run_stats = dict(result.run_stats)
+        self.result = result
+        return result
+    
+    def derived_metrics(self):
+        """
+        Métricas derivadas de la mejor solución: consumo antes/después, ahorro,
+        ocupación, temperatura promedio y tipo de aire acondicionado.
+        """
+        sol = self.best_solution
         consumo_antes = self.input_data.carga + self.input_data.lamparas * self.input_data.potencia_lampara
-        consumo_despues = (self.best_solution['BTU'] / 1000) + self.best_solution['P_luz'] / 10
-
-        # Cantidad de personas por m²
-        if self.input_data.superficie != 0:
-            personas_por_m2 = self.best_solution['N_personas'] / self.input_data.superficie
-            m2_por_persona = self.input_data.superficie / self.best_solution['N_personas']
-        else:
-            personas_por_m2 = 0
-            m2_por_persona = 0
-            
-        print(f"Cantidad de personas por m²: {personas_por_m2:.2f}")
-        print(f"Espacio por persona: {m2_por_persona:.2f} m²\n")
-
-        print(f"⚡ Consumo Base: {consumo_antes:.2f} kWh")
-        print(f"⚡ Consumo Óptimo: {consumo_despues:.2f} kWh")
-        print(f"📉 Ahorro Energético: {consumo_antes - consumo_despues:.2f} kWh ({(1 - consumo_despues/consumo_antes) * 100:.1f}%)\n")
-        
-        # Calcular y mostrar la temperatura promedio esperada
-        temp_promedio = self.calculate_avg_temperature(self.best_solution)
-        print(f"🌡️ Temperatura Promedio del Aula: {temp_promedio:.1f} °C")
-        print(f"   (Temperatura deseada: {self.input_data.temp_int:.1f} °C)")
-        
-        if abs(temp_promedio - self.input_data.temp_int) > 2:
-            print("   La temperatura promedio difiere significativamente de la deseada.")
-            if temp_promedio > self.input_data.temp_int:
-                print("   Se recomienda aumentar la capacidad del aire acondicionado o reducir la carga térmica.")
-            else:
-                print("   El aire acondicionado puede estar sobredimensionado para las condiciones del aula.")
+        consumo_despues = (sol['BTU'] / 1000) + sol['P_luz'] / 10
+        superficie = self.input_data.superficie
+        metrics = {
+            'consumo_antes': consumo_antes,
+            'consumo_despues': consumo_despues,
+            'ahorro': consumo_antes - consumo_despues,
+            'ahorro_pct': (1 - consumo_despues / consumo_antes) * 100 if consumo_antes else 0.0,
+            'personas_por_m2': sol['N_personas'] / superficie if superficie else 0.0,
+            'm2_por_persona': superficie / sol['N_personas'] if sol['N_personas'] else 0.0,
+            'tipo_ac': self.get_AC_type(sol['BTU']),
+            'horas_no_cubiertas': None,
+        }
+        if self.profile is not None:
+            temps, unmet = self.simulate_individual(sol)
+            metrics['temp_promedio'] = float(temps.mean())
+            metrics['horas_no_cubiertas'] = unmet
         else:
-            print("   La temperatura promedio se mantiene cerca de la temperatura deseada.")
-
-        # Generar gráficos
-        self.plot_fitness()
-        self.plot_comparison(consumo_antes, consumo_despues)
-        self.plot_luminosidad()
-        self.plot_temperatura()
-        self.plot_espacio_persona()
-        self.plot_avg_temperature()
+            metrics['temp_promedio'] = self.calculate_avg_temperature(sol)
+        if self.robust is not None and self.robust.params is not None:
+            metrics.update(self.robust.describe([sol[key] for key in GENES]))
+        return metrics
+    
+    def display_results(self, result=None):
+        """Muestra el reporte final y las gráficas (OptiluzRenderer)."""
+        from OptiluzRenderer import print_report, show_result
+        result = result or self.result
+        print_report(result, self.profile)
+        show_result(result)
 
     def get_AC_type(self, BTU):
         """Determina el tipo de aire acondicionado recomendado según el BTU."""
@@ -488,182 +982,6 @@ class OptiluzGA:
         else:
             return "Sistema Centralizado (SEER 20+)"
     
-    def plot_fitness(self):
-        """Genera un gráfico mejorado de la evolución del fitness."""
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.fitness_history, marker='o', linestyle='-', color='b')
-        plt.xlabel("Generaciones")
-        plt.ylabel("Fitness (Menor es Mejor)")
-        plt.title("Evolución de la Función de Fitness")
-        plt.grid(True)
-        
-        # Añadir anotación del mejor valor
-        min_fitness = min(self.fitness_history)
-        min_gen = self.fitness_history.index(min_fitness)
-        plt.annotate(f'Mejor: {min_fitness:.4f}', 
-                    xy=(min_gen, min_fitness),
-                    xytext=(min_gen + 2, min_fitness * 1.1),
-                    arrowprops=dict(facecolor='black', arrowstyle='->'),
-                    fontsize=10)
-        
-        # Mejorar la apariencia del gráfico
-        plt.gca().xaxis.set_major_locator(MaxNLocator(integer=True))
-        plt.tight_layout()
-        plt.show()
-
-    def plot_comparison(self, consumo_antes, consumo_despues):
-        """Genera un gráfico de barras comparando el consumo energético."""
-        labels = ["Consumo Base", "Consumo Óptimo"]
-        valores = [consumo_antes, consumo_despues]
-        
-        # Calcular ahorro
-        ahorro = consumo_antes - consumo_despues
-        porcentaje = (ahorro / consumo_antes) * 100 if consumo_antes > 0 else 0
-        
-        plt.figure(figsize=(8, 6))
-        bars = plt.bar(labels, valores, color=['#FF6B6B', '#4ECDC4'])
-        
-        # Añadir etiquetas con valores
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                    f'{height:.1f} kWh', ha='center', va='bottom')
-        
-        # Añadir una línea para mostrar el ahorro
-        plt.axhline(y=consumo_despues, color='gray', linestyle='--', alpha=0.7)
-        
-        # Añadir anotación de ahorro
-        plt.annotate(f'Ahorro: {ahorro:.1f} kWh ({porcentaje:.1f}%)', 
-                    xy=(0, consumo_despues + (ahorro/2)),
-                    xytext=(0.5, consumo_despues + (ahorro/2) + 0.5),
-                    arrowprops=dict(facecolor='black', arrowstyle='->'),
-                    fontsize=10, ha='center')
-        
-        plt.xlabel("Estado")
-        plt.ylabel("Consumo Energético (kWh)")
-        plt.title("Comparación de Consumo Energético")
-        plt.ylim(0, max(valores) * 1.2)  # Ajustar el límite Y
-        plt.tight_layout()
-        plt.show()
-
-    def plot_luminosidad(self):
-        """Muestra la evolución de la potencia de iluminación recomendada."""
-        if not self.best_solution_history:
-            return
-            
-        p_luz_vals = [sol['P_luz'] for sol in self.best_solution_history]
-        generaciones = range(len(p_luz_vals))
-        
-        plt.figure(figsize=(10, 6))
-        plt.plot(generaciones, p_luz_vals, marker='o', linestyle='-', color='orange')
-        plt.axhline(y=self.best_solution['P_luz'], color='red', linestyle='--', 
-                   label=f'Valor óptimo final: {self.best_solution["P_luz"]:.2f} W')
-        
-        # Iluminación óptima teórica
-        P_luz_optimal = (self.input_data.lux * self.input_data.superficie) / self.input_data.eficiencia
-        plt.axhline(y=P_luz_optimal, color='green', linestyle=':', 
-                   label=f'Valor teórico óptimo: {P_luz_optimal:.2f} W')
-        
-        plt.title("Evolución de la Potencia de Iluminación")
-        plt.xlabel("Generaciones")
-        plt.ylabel("Potencia de Iluminación (W)")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-
-    def plot_temperatura(self):
-        """Muestra la evolución del coeficiente U (aislamiento térmico)."""
-        if not self.best_solution_history:
-            return
-            
-        u_vals = [sol['U'] for sol in self.best_solution_history]
-        generaciones = range(len(u_vals))
-        
-        plt.figure(figsize=(10, 6))
-        plt.plot(generaciones, u_vals, marker='o', linestyle='-', color='#5D5DFF')
-        plt.axhline(y=self.best_solution['U'], color='red', linestyle='--', 
-                   label=f'Valor óptimo final: {self.best_solution["U"]:.2f}')
-        
-        plt.title("Evolución del Coeficiente de Transmisión Térmica (U)")
-        plt.xlabel("Generaciones")
-        plt.ylabel("Coeficiente U (menor es mejor)")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-
-    def plot_espacio_persona(self):
-        """Muestra la evolución del espacio por persona (m²/persona)."""
-        if not self.best_solution_history:
-            return
-            
-        A = self.input_data.superficie
-        espacios = []
-        generaciones = []
-        
-        for i, sol in enumerate(self.best_solution_history):
-            n = sol['N_personas']
-            if n > 0:  # Evitar división por cero
-                espacios.append(A / n)
-                generaciones.append(i)
-        
-        plt.figure(figsize=(10, 6))
-        plt.plot(generaciones, espacios, marker='o', linestyle='-', color='#66BB6A')
-        
-        # Añadir valor óptimo final
-        final_espacio = A / self.best_solution['N_personas'] if self.best_solution['N_personas'] > 0 else 0
-        plt.axhline(y=final_espacio, color='red', linestyle='--', 
-                   label=f'Valor óptimo final: {final_espacio:.2f} m²/persona')
-        
-        # Añadir zonas de confort
-        plt.axhspan(1.5, 3.5, alpha=0.2, color='green', label='Zona óptima (1.5-3.5 m²/persona)')
-        
-        plt.title("Evolución del Espacio por Persona")
-        plt.xlabel("Generaciones")
-        plt.ylabel("Espacio por Persona (m²/persona)")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-    
-    def plot_avg_temperature(self):
-        """
-        Genera un gráfico mostrando la evolución de la temperatura promedio
-        del aula a lo largo de las generaciones.
-        """
-        if not self.temperature_history:
-            return
-            
-        generaciones = range(len(self.temperature_history))
-        
-        plt.figure(figsize=(10, 6))
-        plt.plot(generaciones, self.temperature_history, marker='o', linestyle='-', color='#FF7043')
-        
-        # Añadir valor óptimo final
-        plt.axhline(y=self.temperature_history[-1], color='red', linestyle='--', 
-                   label=f'Temperatura final: {self.temperature_history[-1]:.2f} °C')
-        
-        # Añadir temperatura deseada como referencia
-        plt.axhline(y=self.input_data.temp_int, color='blue', linestyle=':', 
-                   label=f'Temperatura deseada: {self.input_data.temp_int:.1f} °C')
-        
-        # Añadir zona de confort térmico (±2°C de la temperatura deseada)
-        plt.axhspan(
-            self.input_data.temp_int - 2, 
-            self.input_data.temp_int + 2, 
-            alpha=0.2, color='green', 
-            label='Zona de confort (±2°C)'
-        )
-        
-        plt.title("Evolución de la Temperatura Promedio del Aula")
-        plt.xlabel("Generaciones")
-        plt.ylabel("Temperatura (°C)")
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
-        
     def print_population(self):
         """Imprime la población actual y sus valores de fitness."""
         fitness_values = [self.evaluate_individual(ind) for ind in self.population]
@@ -1,12 +1,33 @@
+import importlib
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from OptiluzGA import OptiluzGA
 from OptiluzInput import OptiluzInput
+from OptiluzCache import ResultCache, load_cached, store_cached
+from OptiluzScenarios import ScenarioWorkspace
+from OptiluzStartup import startup
+from OptiluzTuner import DEFAULT_TUNING_PATH, load_tuning
+
+# matplotlib, NumPy y el motor de cálculo se importan al usarlos por primera
+# vez (o en segundo plano con start_preload) para que la ventana aparezca de inmediato
+PRELOAD_MODULES = (
+    'numpy',
+    'OptiluzGA',
+    'matplotlib.figure',
+    'matplotlib.backends.backend_tkagg',
+    'OptiluzDecimate',
+    'OptiluzExport',
+)
+
+# Reoptimización incremental: fracción del presupuesto de generaciones y estancamiento
+INCREMENTAL_FRACTION = 0.25
+INCREMENTAL_MIN_GENERATIONS = 10
+INCREMENTAL_PATIENCE = 5
+INCREMENTAL_MAX_CHANGED_FIELDS = 3  # Campos de entrada modificados como máximo para continuar
 
 class OptiluzGUI(tk.Tk):
-    def __init__(self):
+    def __init__(self, tuning=None):
         super().__init__()
         self.title("OptiLuz - Optimización de Consumo Energético")
         self.geometry("900x700")
@@ -31,11 +52,53 @@ class OptiluzGUI(tk.Tk):
         self.results_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.results_tab, text="Resultados")
         
+        # Pestaña de escenarios: varias copias del formulario ejecutadas en paralelo
+        self.scenarios_tab = ScenarioWorkspace(self.notebook, self)
+        self.notebook.add(self.scenarios_tab, text="Escenarios")
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Crear widgets de entrada
         self.create_input_widgets()
         
         # Crear área de resultados (inicialmente vacía)
         self.create_results_area()
+        
+        # Hiperparámetros del ajuste automático (OptiluzTuner); por defecto el ajuste guardado
+        self.run_params = {}
+        if tuning is None and os.path.exists(DEFAULT_TUNING_PATH):
+            try:
+                tuning = load_tuning(DEFAULT_TUNING_PATH)
+            except (OSError, ValueError) as e:
+                print(f"No se pudo cargar el ajuste: {e}")
+        if tuning is not None:
+            self.apply_tuning(tuning)
+        
+        # Caché de resultados para no repetir ejecuciones idénticas
+        try:
+            self.result_cache = ResultCache()
+        except OSError:
+            self.result_cache = None
+
+    def start_preload(self, on_done=None):
+        """
+        Importa en un hilo de fondo los módulos pesados (PRELOAD_MODULES)
+        mientras el usuario completa el formulario. Cada importación queda en
+        el perfil de arranque; on_done se llama desde el hilo al terminar.
+        """
+        def preload():
+            for name in PRELOAD_MODULES:
+                try:
+                    with startup.measure(f"import {name}"):
+                        importlib.import_module(name)
+                except ImportError as e:
+                    print(f"No se pudo precargar {name}: {e}")
+            startup.mark("precarga completa")
+            if on_done is not None:
+                on_done()
+        
+        thread = threading.Thread(target=preload, name="precarga", daemon=True)
+        thread.start()
+        return thread
 
     def create_input_widgets(self):
         # Crear un canvas con scrollbar para la sección de entrada
@@ -227,6 +290,12 @@ class OptiluzGUI(tk.Tk):
         self.entries["mutation_rate"].insert(0, "0.1")
         self.entries["mutation_rate"].grid(row=4, column=1, pady=5, padx=5, sticky="ew")
         
+        # Reoptimización incremental: partir de la población de la ejecución anterior
+        self.incremental_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(params_frame, text="Continuar desde la ejecución anterior",
+                        variable=self.incremental_var).grid(
+            row=5, column=0, columnspan=2, sticky="w", pady=5, padx=5)
+        
         row += 1
         
         # Botón para iniciar la optimización
@@ -240,6 +309,10 @@ class OptiluzGUI(tk.Tk):
         reset_button = ttk.Button(
             btn_frame, text="Restablecer Valores", command=self.reset_values, width=25)
         reset_button.pack(side="right", padx=10)
+        
+        tuning_button = ttk.Button(
+            btn_frame, text="Cargar Ajuste", command=self.load_tuning_file, width=25)
+        tuning_button.pack(side="right", padx=10)
 
     def create_results_area(self):
         """Crea el área donde se mostrarán los resultados de la optimización"""
@@ -274,6 +347,25 @@ class OptiluzGUI(tk.Tk):
         self.graphs_container.add(self.espacio_tab, text="Espacio/Persona")
         self.graphs_container.add(self.temp_aula_tab, text="Temperatura Aula")  # Añadir nueva pestaña
         
+        # Figuras persistentes por pestaña: se crean al verlas por primera vez
+        # y se actualizan con los datos de cada nueva ejecución
+        self.plot_tabs = {
+            'fitness': self.fitness_tab,
+            'comparison': self.comparison_tab,
+            'luminosidad': self.luminosidad_tab,
+            'temperatura': self.temperatura_tab,
+            'espacio': self.espacio_tab,
+            'temp_aula': self.temp_aula_tab,
+        }
+        self.plot_builders = {key: getattr(self, f"build_{key}_panel") for key in self.plot_tabs}
+        self.plot_updaters = {key: getattr(self, f"update_{key}_panel") for key in self.plot_tabs}
+        self.plot_panels = {}
+        self.dirty_panels = set()
+        self.last_result = None
+        self.last_population = []        # Población final de la última ejecución
+        self.last_run = None             # Datos y parámetros de la última ejecución
+        self.graphs_container.bind("<<NotebookTabChanged>>", self.on_graph_tab_changed)
+        
         # Botón para guardar resultados
         btn_frame = ttk.Frame(results_container)
         btn_frame.pack(fill="x", padx=5, pady=10)
@@ -282,11 +374,41 @@ class OptiluzGUI(tk.Tk):
             btn_frame, text="Guardar Resultados", command=self.save_results, width=20)
         save_button.pack(side="right", padx=10)
         
+        export_button = ttk.Button(
+            btn_frame, text="Exportar Datos", command=self.export_results, width=20)
+        export_button.pack(side="right", padx=10)
+        
         return_button = ttk.Button(
             btn_frame, text="Volver a Datos", 
             command=lambda: self.notebook.select(self.input_tab), width=20)
         return_button.pack(side="left", padx=10)
 
+    def apply_tuning(self, tuning):
+        """
+        Aplica un ajuste de hiperparámetros: los visibles se escriben en sus
+        campos y el resto se pasa a run_evolution.
+        """
+        for key in ("pop_size", "generations", "mutation_rate"):
+            self.entries[key].delete(0, tk.END)
+            self.entries[key].insert(0, str(tuning[key]))
+        self.run_params = {key: tuning[key]
+                           for key in ("crossover_rate", "tournament_size", "elitism")}
+
+    def load_tuning_file(self):
+        """Carga un ajuste generado por OptiluzTuner"""
+        from tkinter import filedialog
+        
+        filename = filedialog.askopenfilename(
+            filetypes=[("Ajuste OptiLuz", "*.json"), ("Todos los archivos", "*.*")],
+            initialdir=os.path.dirname(DEFAULT_TUNING_PATH))
+        if not filename:
+            return
+        try:
+            self.apply_tuning(load_tuning(filename))
+            messagebox.showinfo("Ajuste Cargado", f"Hiperparámetros cargados desde:\n{filename}")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error al Cargar", f"No se pudo cargar el ajuste: {e}")
+
     def reset_values(self):
         """Restablece los valores de entrada a los predeterminados"""
         defaults = {
@@ -367,6 +489,32 @@ class OptiluzGUI(tk.Tk):
             messagebox.showerror("Error", f"Error inesperado: {e}")
             return False
 
+    def read_form(self):
+        """
+        Lee el formulario de entrada (ya validado). Retorna el OptiluzInput y
+        los parámetros del algoritmo: (datos, pop_size, generations, mutation_rate).
+        """
+        data = OptiluzInput(
+            superficie = float(self.entries["superficie"].get()),
+            ventanas = int(self.entries["ventanas"].get()),
+            coeficiente = float(self.entries["coeficiente"].get()),
+            temp_ext = float(self.entries["temp_ext"].get()),
+            temp_int = float(self.entries["temp_int"].get()),
+            humedad = float(self.entries["humedad"].get()),
+            carga = float(self.entries["carga"].get()),
+            lux = float(self.entries["lux"].get()),
+            tipo_iluminacion = self.entries["tipo_iluminacion"].get(),
+            eficiencia = float(self.entries["eficiencia"].get()),
+            lamparas = int(self.entries["lamparas"].get()),
+            potencia_lampara = float(self.entries["potencia_lampara"].get()),
+            alpha = float(self.entries["alpha"].get()),
+            beta = float(self.entries["beta"].get())
+        )
+        pop_size = int(self.entries["pop_size"].get())
+        generations = int(self.entries["generations"].get())
+        mutation_rate = float(self.entries["mutation_rate"].get())
+        return data, pop_size, generations, mutation_rate
+
     def submit(self):
         """
         Recoge los datos ingresados, valida, crea el objeto de entrada, 
@@ -376,28 +524,7 @@ class OptiluzGUI(tk.Tk):
             return
             
         try:
-            # Recoger los datos validados
-            data = OptiluzInput(
-                superficie = float(self.entries["superficie"].get()),
-                ventanas = int(self.entries["ventanas"].get()),
-                coeficiente = float(self.entries["coeficiente"].get()),
-                temp_ext = float(self.entries["temp_ext"].get()),
-                temp_int = float(self.entries["temp_int"].get()),
-                humedad = float(self.entries["humedad"].get()),
-                carga = float(self.entries["carga"].get()),
-                lux = float(self.entries["lux"].get()),
-                tipo_iluminacion = self.entries["tipo_iluminacion"].get(),
-                eficiencia = float(self.entries["eficiencia"].get()),
-                lamparas = int(self.entries["lamparas"].get()),
-                potencia_lampara = float(self.entries["potencia_lampara"].get()),
-                alpha = float(self.entries["alpha"].get()),
-                beta = float(self.entries["beta"].get())
-            )
-            
-            # Parámetros del algoritmo
-            pop_size = int(self.entries["pop_size"].get())
-            generations = int(self.entries["generations"].get())
-            mutation_rate = float(self.entries["mutation_rate"].get())
+            data, pop_size, generations, mutation_rate = self.read_form()
             
             # Mostrar mensaje de procesamiento
             self.config(cursor="wait")
@@ -417,6 +544,7 @@ class OptiluzGUI(tk.Tk):
             self.update_idletasks()
             
             # Instanciar el algoritmo genético con los parámetros ingresados
+            from OptiluzGA import OptiluzGA
             ga = OptiluzGA(data, pop_size=pop_size)
             
             # Configurar para capturar las gráficas en lugar de mostrarlas directamente
@@ -426,224 +554,113 @@ class OptiluzGUI(tk.Tk):
             message_window.destroy()
             self.config(cursor="")
             
-            # Cambiar a la pestaña de resultados
-            self.notebook.select(self.results_tab)
-            
         except Exception as e:
             messagebox.showerror("Error", f"Error al procesar los datos: {e}")
             self.config(cursor="")
 
     def capture_plots(self, ga, generations, mutation_rate):
         """
-        Ejecuta el algoritmo genético y captura las gráficas para mostrarlas en la interfaz
-        en lugar de abrirlas directamente.
+        Ejecuta el algoritmo genético sin gráficas de pyplot y actualiza las
+        gráficas integradas de la interfaz con el RunResult obtenido.
+        
+        Primero se consulta la caché de resultados. Si no hay acierto, la
+        opción incremental está activa y los datos de entrada solo cambiaron en
+        unos pocos campos respecto a la ejecución anterior, se parte de su
+        población final (ajustada a los nuevos límites) con un presupuesto
+        corto de generaciones y detención por estancamiento. En otro caso se
+        hace una ejecución completa, que se guarda en la caché.
         """
-        # Sobreescribir temporalmente las funciones de gráficas para capturarlas
-        original_plot_fitness = ga.plot_fitness
-        original_plot_comparison = ga.plot_comparison
-        original_plot_luminosidad = ga.plot_luminosidad
-        original_plot_temperatura = ga.plot_temperatura
-        original_plot_espacio_persona = ga.plot_espacio_persona
-        original_plot_avg_temperature = ga.plot_avg_temperature
-        
-        # Variables para guardar las figuras
-        self.fitness_fig = None
-        self.comparison_fig = None
-        self.luminosidad_fig = None
-        self.temperatura_fig = None
-        self.espacio_fig = None
-        self.temp_aula_fig = None
-        
-        # Redefinir plot_fitness
-        def captured_plot_fitness():
-            self.fitness_fig = plt.figure(figsize=(8, 5))
-            plt.plot(ga.fitness_history, marker='o', linestyle='-', color='b')
-            plt.xlabel("Generaciones")
-            plt.ylabel("Fitness (Menor es Mejor)")
-            plt.title("Evolución de la Función de Fitness")
-            plt.grid(True)
-            plt.close()  # No mostrar, solo guardar la figura
-        
-        # Redefinir plot_comparison
-        def captured_plot_comparison(consumo_antes, consumo_despues):
-            self.comparison_fig = plt.figure(figsize=(6, 5))
-            labels = ["Consumo Base", "Consumo Óptimo"]
-            valores = [consumo_antes, consumo_despues]
-            plt.bar(labels, valores, color=['red', 'green'])
-            plt.xlabel("Estado")
-            plt.ylabel("Consumo Energético (kWh)")
-            plt.title("Comparación de Consumo Energético")
-            plt.close()  # No mostrar, solo guardar la figura
-        
-        # Redefinir plot_luminosidad
-        def captured_plot_luminosidad():
-            self.luminosidad_fig = plt.figure(figsize=(8, 5))
-            p_luz_vals = [sol['P_luz'] for sol in ga.best_solution_history]
-            plt.plot(p_luz_vals, marker='o')
-            plt.title("Evolución de la Luminosidad (Potencia de Iluminación)")
-            plt.xlabel("Generaciones")
-            plt.ylabel("P_luz (W)")
-            plt.grid(True)
-            plt.close()  # No mostrar, solo guardar la figura
-        
-        # Redefinir plot_temperatura
-        def captured_plot_temperatura():
-            self.temperatura_fig = plt.figure(figsize=(8, 5))
-            u_vals = [sol['U'] for sol in ga.best_solution_history]
-            plt.plot(u_vals, marker='o')
-            plt.title("Evolución de la 'Temperatura' (Coef. U)")
-            plt.xlabel("Generaciones")
-            plt.ylabel("U (Coef. Transmisión Térmica)")
-            plt.grid(True)
-            plt.close()  # No mostrar, solo guardar la figura
-        
-        # Redefinir plot_espacio_persona
-        def captured_plot_espacio_persona():
-            self.espacio_fig = plt.figure(figsize=(8, 5))
-            A = ga.input_data.superficie
-            espacios = []
-            for sol in ga.best_solution_history:
-                n = sol['N_personas']
-                if n != 0:
-                    espacios.append(A / n)
-                else:
-                    espacios.append(A)  # Si n=0, evitamos división por cero
-            plt.plot(espacios, marker='o')
-            plt.title("Evolución del Espacio por Persona (m²/persona)")
-            plt.xlabel("Generaciones")
-            plt.ylabel("m²/persona")
-            plt.grid(True)
-            plt.close()  # No mostrar, solo guardar la figura
-            
-        # Redefinir plot_avg_temperature
-        def captured_plot_avg_temperature():
-            try:
-                self.temp_aula_fig = plt.figure(figsize=(8, 5))
-                
-                # Asegurarnos de que temperature_history tiene datos
-                if not hasattr(ga, 'temperature_history') or not ga.temperature_history:
-                    # Crear un historial de temperaturas basado en el historial de soluciones
-                    temps = []
-                    for sol in ga.best_solution_history:
-                        temp = ga.calculate_avg_temperature(sol)
-                        temps.append(temp)
-                    
-                    generaciones = range(len(temps))
-                    plt.plot(generaciones, temps, marker='o', linestyle='-', color='#FF7043')
-                    
-                    # Añadir temperatura final
-                    if temps:
-                        plt.axhline(y=temps[-1], color='red', linestyle='--', 
-                                label=f'Temperatura final: {temps[-1]:.2f} °C')
-                else:
-                    # Usar el historial existente
-                    generaciones = range(len(ga.temperature_history))
-                    plt.plot(generaciones, ga.temperature_history, marker='o', linestyle='-', color='#FF7043')
-                    
-                    # Añadir valor óptimo final
-                    if ga.temperature_history:
-                        plt.axhline(y=ga.temperature_history[-1], color='red', linestyle='--', 
-                                label=f'Temperatura final: {ga.temperature_history[-1]:.2f} °C')
-                
-                # Añadir temperatura deseada como referencia
-                plt.axhline(y=ga.input_data.temp_int, color='blue', linestyle=':', 
-                        label=f'Temperatura deseada: {ga.input_data.temp_int:.1f} °C')
-                
-                # Añadir zona de confort térmico (±2°C de la temperatura deseada)
-                plt.axhspan(
-                    ga.input_data.temp_int - 2, 
-                    ga.input_data.temp_int + 2, 
-                    alpha=0.2, color='green', 
-                    label='Zona de confort (±2°C)'
-                )
-                
-                plt.title("Evolución de la Temperatura Promedio del Aula")
-                plt.xlabel("Generaciones")
-                plt.ylabel("Temperatura (°C)")
-                plt.legend()
-                plt.grid(True)
-                plt.close()  # No mostrar, solo guardar la figura
-            except Exception as e:
-                # En caso de error, crear una gráfica simple con mensaje de error
-                self.temp_aula_fig = plt.figure(figsize=(8, 5))
-                plt.text(0.5, 0.5, f"Error al generar gráfica: {str(e)}", 
-                        ha='center', va='center', transform=plt.gca().transAxes)
-                plt.close()
-        
-        # Asignar las nuevas funciones
-        ga.plot_fitness = captured_plot_fitness
-        ga.plot_comparison = captured_plot_comparison
-        ga.plot_luminosidad = captured_plot_luminosidad
-        ga.plot_temperatura = captured_plot_temperatura
-        ga.plot_espacio_persona = captured_plot_espacio_persona
-        ga.plot_avg_temperature = captured_plot_avg_temperature
-        
-        # Ejecutar el algoritmo genético
-        ga.run_evolution(generations=generations, mutation_rate=mutation_rate)
-        
-        # Restaurar las funciones originales
-        ga.plot_fitness = original_plot_fitness
-        ga.plot_comparison = original_plot_comparison
-        ga.plot_luminosidad = original_plot_luminosidad
-        ga.plot_temperatura = original_plot_temperatura
-        ga.plot_espacio_persona = original_plot_espacio_persona
-        ga.plot_avg_temperature = original_plot_avg_temperature
-        
+        run_params = dict(self.run_params, generations=generations, mutation_rate=mutation_rate)
+        if self.result_cache is not None and load_cached(ga, self.result_cache, **run_params):
+            pass  # El mismo cálculo ya se hizo: se reproduce su resultado
+        elif self.can_continue(ga, run_params):
+            incremental = dict(run_params, generations=max(
+                INCREMENTAL_MIN_GENERATIONS, int(generations * INCREMENTAL_FRACTION)))
+            # No se guarda en la caché: depende de la ejecución anterior
+            ga.run_evolution(display=False, initial_population=self.last_population,
+                             patience=INCREMENTAL_PATIENCE, **incremental)
+        else:
+            ga.run_evolution(display=False, **run_params)
+            if self.result_cache is not None:
+                store_cached(ga, self.result_cache, **run_params)
+        result = ga.result
+        # La mejor solución primero: sobrevive aunque la población se recorte.
+        # Sin población final (entrada antigua de la caché) la próxima ejecución es completa
+        self.last_population = ([dict(result.best_solution)] + [dict(ind) for ind in ga.population]
+                                if ga.population else [])
+        self.last_run = {'input': ga.input_data.to_dict(), 'pop_size': ga.pop_size,
+                         'run_params': run_params}
+        self.show_result(result)
+
+    def can_continue(self, ga, run_params):
+        """
+        Indica si se puede continuar desde la población anterior: mismo tamaño
+        de población y parámetros del algoritmo (sin aumentar las generaciones)
+        y entre 1 y INCREMENTAL_MAX_CHANGED_FIELDS campos de entrada distintos.
+        """
+        previous = self.last_run
+        if not self.incremental_var.get() or not self.last_population or previous is None:
+            return False
+        if previous['pop_size'] != ga.pop_size:
+            return False
+        old_params = dict(previous['run_params'])
+        if run_params['generations'] > old_params.pop('generations'):
+            return False
+        if {k: v for k, v in run_params.items() if k != 'generations'} != old_params:
+            return False
+        new_input = ga.input_data.to_dict()
+        changed = [key for key in new_input if new_input[key] != previous['input'].get(key)]
+        return 1 <= len(changed) <= INCREMENTAL_MAX_CHANGED_FIELDS
+
+    def show_result(self, result):
+        """Muestra un RunResult en la pestaña de resultados (texto y gráficas)."""
         # Mostrar los resultados en el área de texto
-        self.display_text_results(ga)
+        self.display_text_results(result)
         
-        # Mostrar las gráficas capturadas en las pestañas correspondientes
-        self.display_captured_plots()
+        # Actualizar las gráficas (solo se dibuja la pestaña visible)
+        self.last_result = result
+        self.display_plots()
+        self.notebook.select(self.results_tab)
+
+    def on_close(self):
+        """Detiene los escenarios en curso y cierra la ventana."""
+        self.scenarios_tab.shutdown()
+        self.destroy()
 
-    def display_text_results(self, ga):
+    def display_text_results(self, result):
         """Muestra los resultados de texto en el área de resultados"""
         self.results_text.config(state=tk.NORMAL)
         self.results_text.delete(1.0, tk.END)
         
         try:
-            # Calcular resultados
-            consumo_antes = ga.input_data.carga + ga.input_data.lamparas * ga.input_data.potencia_lampara
-            consumo_despues = (ga.best_solution['BTU'] / 1000) + ga.best_solution['P_luz'] / 10
-            
-            if ga.input_data.superficie != 0:
-                personas_por_m2 = ga.best_solution['N_personas'] / ga.input_data.superficie
-            else:
-                personas_por_m2 = 0
-                
-            # Calcular la temperatura promedio del aula con manejo de errores
-            try:
-                if 'temp_promedio' in ga.best_solution:
-                    temp_promedio = ga.best_solution['temp_promedio']
-                else:
-                    temp_promedio = ga.calculate_avg_temperature(ga.best_solution)
-            except Exception as e:
-                temp_promedio = 0.0
-                print(f"Error al calcular temperatura: {e}")
+            sol = result.best_solution
+            metrics = result.metrics
+            temp_promedio = metrics.get('temp_promedio') or 0.0
             
             # Formatear resultados
             results_text = f"""📊 RESULTADOS OPTIMIZADOS:
 
-    Capacidad Óptima del Aire Acondicionado: {ga.best_solution['BTU']:.2f} BTU
-    Tipo de Aire Acondicionado Recomendado: {ga.get_AC_type(ga.best_solution['BTU'])}
-    Potencia de Iluminación Recomendada: {ga.best_solution['P_luz']:.2f} W
-    Nivel Óptimo de Aislamiento Térmico (U): {ga.best_solution['U']:.2f}
-    Cantidad Recomendada de Personas por Aula: {ga.best_solution['N_personas']}
-    Cantidad de personas por m²: {personas_por_m2:.2f}
+    Capacidad Óptima del Aire Acondicionado: {sol['BTU']:.2f} BTU
+    Tipo de Aire Acondicionado Recomendado: {metrics['tipo_ac']}
+    Potencia de Iluminación Recomendada: {sol['P_luz']:.2f} W
+    Nivel Óptimo de Aislamiento Térmico (U): {sol['U']:.2f}
+    Cantidad Recomendada de Personas por Aula: {sol['N_personas']}
+    Cantidad de personas por m²: {metrics['personas_por_m2']:.2f}
 
-    Consumo Base: {consumo_antes:.2f} kWh
-    Consumo Óptimo: {consumo_despues:.2f} kWh
-    Ahorro Energético: {consumo_antes - consumo_despues:.2f} kWh ({(1 - consumo_despues/consumo_antes) * 100:.1f}%)
+    Consumo Base: {metrics['consumo_antes']:.2f} kWh
+    Consumo Óptimo: {metrics['consumo_despues']:.2f} kWh
+    Ahorro Energético: {metrics['ahorro']:.2f} kWh ({metrics['ahorro_pct']:.1f}%)
     """
 
             # Agregar información de temperatura solo si está disponible
             if temp_promedio > 0:
                 results_text += f"""
     Temperatura Promedio del Aula: {temp_promedio:.1f} °C
-    (Temperatura deseada: {ga.input_data.temp_int:.1f} °C)
+    (Temperatura deseada: {result.input['temp_int']:.1f} °C)
     """
             
             results_text += f"""
-    Mejor Fitness alcanzado: {ga.best_fitness:.2f}
+    Mejor Fitness alcanzado: {result.best_fitness:.2f}
     """
             
             self.results_text.insert(tk.END, results_text)
@@ -653,48 +670,165 @@ class OptiluzGUI(tk.Tk):
             print(error_msg)
         
         self.results_text.config(state=tk.DISABLED)
-    def display_captured_plots(self):
-        """Muestra las gráficas capturadas en sus respectivas pestañas"""
-        # Limpiar contenido anterior
-        for tab in [self.fitness_tab, self.comparison_tab, self.luminosidad_tab, 
-                   self.temperatura_tab, self.espacio_tab, self.temp_aula_tab]:
-            for widget in tab.winfo_children():
-                widget.destroy()
-        
-        # Mostrar gráfica de fitness
-        if self.fitness_fig:
-            canvas = FigureCanvasTkAgg(self.fitness_fig, self.fitness_tab)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Mostrar gráfica de comparación
-        if self.comparison_fig:
-            canvas = FigureCanvasTkAgg(self.comparison_fig, self.comparison_tab)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Mostrar gráfica de luminosidad
-        if self.luminosidad_fig:
-            canvas = FigureCanvasTkAgg(self.luminosidad_fig, self.luminosidad_tab)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Mostrar gráfica de temperatura
-        if self.temperatura_fig:
-            canvas = FigureCanvasTkAgg(self.temperatura_fig, self.temperatura_tab)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        # Mostrar gráfica de espacio por persona
-        if self.espacio_fig:
-            canvas = FigureCanvasTkAgg(self.espacio_fig, self.espacio_tab)
-            canvas.draw()
+
+    def display_plots(self):
+        """
+        Marca todas las gráficas como pendientes y dibuja solo la pestaña
+        visible; el resto se dibuja al seleccionarla.
+        """
+        self.dirty_panels = set(self.plot_tabs)
+        self.render_selected_plot()
+
+    def on_graph_tab_changed(self, event=None):
+        """Dibuja la gráfica de la pestaña seleccionada si está pendiente."""
+        self.render_selected_plot()
+
+    def render_selected_plot(self):
+        if self.last_result is None:
+            return
+        selected = self.graphs_container.select()
+        for key, tab in self.plot_tabs.items():
+            if str(tab) == selected and key in self.dirty_panels:
+                self.render_plot(key)
+
+    def get_plot_panel(self, key):
+        """
+        Devuelve la figura y el lienzo de una pestaña. Se crean una sola vez y
+        se reutilizan en todas las ejecuciones posteriores.
+        """
+        panel = self.plot_panels.get(key)
+        if panel is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            figure = Figure(figsize=(8, 5))
+            ax = figure.add_subplot(111)
+            canvas = FigureCanvasTkAgg(figure, self.plot_tabs[key])
             canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            panel = {'figure': figure, 'ax': ax, 'canvas': canvas}
+            self.plot_builders[key](panel)
+            self.plot_panels[key] = panel
+        return panel
+
+    def render_plot(self, key):
+        """Actualiza los datos de una gráfica y la vuelve a dibujar."""
+        panel = self.get_plot_panel(key)
+        try:
+            self.plot_updaters[key](panel, self.last_result)
+        except Exception as e:
+            print(f"Error al generar gráfica: {e}")
+        ax = panel['ax']
+        ax.relim()
+        ax.autoscale_view()
+        panel['canvas'].draw_idle()
+        self.dirty_panels.discard(key)
+
+    # ---- Construcción de las figuras (una sola vez) ----
+    def _build_line_panel(self, panel, title, ylabel, color=None):
+        from OptiluzDecimate import plot_decimated
+        ax = panel['ax']
+        panel['line'] = plot_decimated(ax, [], [], marker='o', linestyle='-', color=color)
+        ax.set_title(title)
+        ax.set_xlabel("Generaciones")
+        ax.set_ylabel(ylabel)
+        ax.grid(True)
+
+    def build_fitness_panel(self, panel):
+        self._build_line_panel(panel, "Evolución de la Función de Fitness",
+                               "Fitness (Menor es Mejor)", color='b')
+
+    def build_comparison_panel(self, panel):
+        ax = panel['ax']
+        panel['bars'] = ax.bar(["Consumo Base", "Consumo Óptimo"], [0, 0], color=['red', 'green'])
+        ax.set_xlabel("Estado")
+        ax.set_ylabel("Consumo Energético (kWh)")
+        ax.set_title("Comparación de Consumo Energético")
+
+    def build_luminosidad_panel(self, panel):
+        self._build_line_panel(panel, "Evolución de la Luminosidad (Potencia de Iluminación)", "P_luz (W)")
+
+    def build_temperatura_panel(self, panel):
+        self._build_line_panel(panel, "Evolución de la 'Temperatura' (Coef. U)", "U (Coef. Transmisión Térmica)")
+
+    def build_espacio_panel(self, panel):
+        self._build_line_panel(panel, "Evolución del Espacio por Persona (m²/persona)", "m²/persona")
+
+    def build_temp_aula_panel(self, panel):
+        self._build_line_panel(panel, "Evolución de la Temperatura Promedio del Aula",
+                               "Temperatura (°C)", color='#FF7043')
+        ax = panel['ax']
+        panel['final_line'] = ax.axhline(y=0, color='red', linestyle='--')
+        panel['target_line'] = ax.axhline(y=0, color='blue', linestyle=':')
+        panel['span'] = None
+
+    # ---- Actualización de datos (en cada ejecución) ----
+    def update_fitness_panel(self, panel, result):
+        panel['line'].set_data(range(len(result.fitness_history)), result.fitness_history)
+
+    def update_comparison_panel(self, panel, result):
+        consumo_antes = result.metrics['consumo_antes']
+        consumo_despues = result.metrics['consumo_despues']
+        for bar, value in zip(panel['bars'], (consumo_antes, consumo_despues)):
+            bar.set_height(value)
+        panel['ax'].set_ylim(0, max(consumo_antes, consumo_despues, 1) * 1.1)
+
+    def update_luminosidad_panel(self, panel, result):
+        p_luz_vals = [sol['P_luz'] for sol in result.best_solution_history]
+        panel['line'].set_data(range(len(p_luz_vals)), p_luz_vals)
+
+    def update_temperatura_panel(self, panel, result):
+        u_vals = [sol['U'] for sol in result.best_solution_history]
+        panel['line'].set_data(range(len(u_vals)), u_vals)
+
+    def update_espacio_panel(self, panel, result):
+        A = result.input['superficie']
+        espacios = []
+        for sol in result.best_solution_history:
+            n = sol['N_personas']
+            espacios.append(A / n if n != 0 else A)  # Si n=0, evitamos división por cero
+        panel['line'].set_data(range(len(espacios)), espacios)
+
+    def update_temp_aula_panel(self, panel, result):
+        temps = result.temperature_history
+        panel['line'].set_data(range(len(temps)), temps)
+        
+        temp_int = result.input['temp_int']
+        if temps:
+            panel['final_line'].set_ydata([temps[-1], temps[-1]])
+            panel['final_line'].set_label(f'Temperatura final: {temps[-1]:.2f} °C')
+        panel['target_line'].set_ydata([temp_int, temp_int])
+        panel['target_line'].set_label(f'Temperatura deseada: {temp_int:.1f} °C')
+        
+        # Zona de confort térmico (±2°C de la temperatura deseada)
+        if panel['span'] is not None:
+            panel['span'].remove()
+        panel['span'] = panel['ax'].axhspan(temp_int - 2, temp_int + 2, alpha=0.2, color='green',
+                                            label='Zona de confort (±2°C)')
+        panel['ax'].legend()
+
+    def export_results(self):
+        """Exporta la mejor solución, las métricas y los historiales (CSV, JSONL o Parquet)"""
+        if self.last_result is None:
+            messagebox.showwarning("Sin Resultados", "Ejecute una optimización antes de exportar.")
+            return
+        try:
+            from tkinter import filedialog
+            import datetime
             
-        if self.temp_aula_fig:
-            canvas = FigureCanvasTkAgg(self.temp_aula_fig, self.temp_aula_tab)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            now = datetime.datetime.now()
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")],
+                initialfile=f"optiluz_datos_{now.strftime('%Y%m%d_%H%M%S')}.csv"
+            )
+            if not filename:
+                return
+            
+            from OptiluzExport import export_run
+            paths = export_run(self.last_result, filename)
+            messagebox.showinfo("Exportación Exitosa",
+                               "Datos exportados en:\n" + "\n".join(paths))
+        except Exception as e:
+            messagebox.showerror("Error al Exportar", f"No se pudo exportar: {e}")
 
     def save_results(self):
         """Guarda los resultados en un archivo de texto"""
@@ -1,3 +1,21 @@
+# Tipos de iluminación admitidos y su eficiencia lumínica típica (lm/W)
+TIPOS_ILUMINACION = ("LED", "Fluorescente", "Incandescente")
+EFICIENCIA_TIPICA = {
+    "LED": 100,
+    "Fluorescente": 60,
+    "Incandescente": 15
+}
+
+# Recomendaciones en el orden en que se muestran: (indicador, mensaje)
+RECOMMENDATIONS = (
+    ('iluminacion_ineficiente', "La iluminación actual es ineficiente. Considere actualizar a tecnología LED."),
+    ('incandescente', "Las lámparas incandescentes son muy ineficientes. Se recomienda cambiar a LED."),
+    ('ventanas_altas', "La proporción de ventanas es alta. Considere mejorar el aislamiento térmico."),
+    ('aislamiento_deficiente', "La diferencia de temperatura es alta y el aislamiento es deficiente. Se recomienda mejorar el aislamiento."),
+    ('carga_alta', "La carga térmica por equipos es alta. Considere usar equipos más eficientes."),
+)
+
+
 class OptiluzInput:
     """
     Clase mejorada para almacenar y validar los datos de entrada del sistema OptiLuz.
@@ -6,7 +24,7 @@ class OptiluzInput:
     """
     def __init__(self, superficie, ventanas, coeficiente, temp_ext, temp_int, humedad,
                  carga, lux, tipo_iluminacion, eficiencia, lamparas, potencia_lampara,
-                 alpha, beta):
+                 alpha, beta, perfil=None):
         # Validar y almacenar los datos de entrada
         self.superficie = max(1.0, float(superficie))  # m²
         self.ventanas = max(0, int(ventanas))
@@ -18,8 +36,7 @@ class OptiluzInput:
         self.lux = max(50, float(lux))  # lux
         
         # Validar tipo de iluminación
-        tipos_validos = ["LED", "Fluorescente", "Incandescente"]
-        if tipo_iluminacion in tipos_validos:
+        if tipo_iluminacion in TIPOS_ILUMINACION:
             self.tipo_iluminacion = tipo_iluminacion
         else:
             self.tipo_iluminacion = "LED"  # Valor por defecto
@@ -47,17 +64,34 @@ class OptiluzInput:
             self.alpha = 0.7
             self.beta = 0.3
         
+        # Perfil horario opcional (ruta a un archivo CSV/EPW)
+        self.perfil = None
+        self.perfil_path = None
+        if perfil:
+            self.load_profile(perfil)
+        
         # Calcular y almacenar valores derivados útiles
         self._calculate_derived_values()
     
+    def load_profile(self, path, cache_dir=None):
+        """
+        Carga un perfil horario de clima y ocupación desde un archivo CSV o EPW.
+        El archivo se analiza una sola vez y se guarda en una caché binaria
+        compartida por todos los procesos (ver OptiluzProfiles).
+        """
+        from OptiluzProfiles import load_profile
+        self.perfil = load_profile(path, cache_dir)
+        self.perfil_path = path
+        return self.perfil
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Crea un objeto de entrada a partir de un diccionario generado por to_dict."""
+        return cls(**data)
+    
     def _eficiencia_por_tipo(self, tipo):
         """Devuelve la eficiencia lumínica típica según el tipo de iluminación."""
-        eficiencia_tipica = {
-            "LED": 100,  # lm/W
-            "Fluorescente": 60,  # lm/W
-            "Incandescente": 15  # lm/W
-        }
-        return eficiencia_tipica.get(tipo, 80)
+        return EFICIENCIA_TIPICA.get(tipo, 80)
     
     def _calculate_derived_values(self):
         """Calcula valores derivados útiles para análisis y recomendaciones."""
@@ -76,30 +110,24 @@ class OptiluzInput:
         # Eficiencia de la instalación actual
         self.eficiencia_instalacion = self.potencia_teorica / (self.lamparas * self.potencia_lampara) if (self.lamparas * self.potencia_lampara) > 0 else 0
     
+    def recommendation_flags(self):
+        """Indica qué recomendaciones de RECOMMENDATIONS aplican a los datos de entrada."""
+        carga_por_m2 = self.carga / self.superficie if self.superficie > 0 else 0
+        return {
+            # Recomendaciones de iluminación
+            'iluminacion_ineficiente': self.eficiencia_instalacion < 0.7,
+            'incandescente': self.tipo_iluminacion == "Incandescente",
+            # Recomendaciones de ventanas y aislamiento
+            'ventanas_altas': self.relacion_ventanas > 0.4,
+            'aislamiento_deficiente': self.delta_temp > 10 and self.coeficiente > 1.5,
+            # Recomendaciones de carga térmica
+            'carga_alta': carga_por_m2 > 100,
+        }
+    
     def get_recommendations(self):
         """Genera recomendaciones básicas basadas en los datos de entrada."""
-        recommendations = []
-        
-        # Recomendaciones de iluminación
-        if self.eficiencia_instalacion < 0.7:
-            recommendations.append("La iluminación actual es ineficiente. Considere actualizar a tecnología LED.")
-        
-        if self.tipo_iluminacion == "Incandescente":
-            recommendations.append("Las lámparas incandescentes son muy ineficientes. Se recomienda cambiar a LED.")
-        
-        # Recomendaciones de ventanas y aislamiento
-        if self.relacion_ventanas > 0.4:
-            recommendations.append("La proporción de ventanas es alta. Considere mejorar el aislamiento térmico.")
-        
-        if self.delta_temp > 10 and self.coeficiente > 1.5:
-            recommendations.append("La diferencia de temperatura es alta y el aislamiento es deficiente. Se recomienda mejorar el aislamiento.")
-        
-        # Recomendaciones de carga térmica
-        carga_por_m2 = self.carga / self.superficie if self.superficie > 0 else 0
-        if carga_por_m2 > 100:
-            recommendations.append("La carga térmica por equipos es alta. Considere usar equipos más eficientes.")
-        
-        return recommendations
+        flags = self.recommendation_flags()
+        return [message for flag, message in RECOMMENDATIONS if flags[flag]]
     
     def __str__(self):
         """Devuelve una representación en texto de los datos de entrada."""
@@ -145,5 +173,6 @@ class OptiluzInput:
             'lamparas': self.lamparas,
             'potencia_lampara': self.potencia_lampara,
             'alpha': self.alpha,
-            'beta': self.beta
+            'beta': self.beta,
+            'perfil': self.perfil_path
         }
\ No newline at end of file
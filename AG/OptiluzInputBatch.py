@@ -0,0 +1,213 @@
+"""
+Datos de entrada por lotes (columnares) para flotas de aulas.
+
+OptiluzInput valida y calcula los valores derivados de un aula a la vez en
+Python. OptiluzInputBatch guarda cada campo como una columna de NumPy y aplica
+las mismas reglas (límites, tipo de iluminación, eficiencia por tipo y
+normalización de alpha y beta), los valores derivados y los indicadores de
+recomendación con operaciones vectorizadas sobre todas las aulas a la vez.
+
+Cada fila se puede convertir en un OptiluzInput (y viceversa); la ruta del
+perfil horario de cada aula (perfil) se conserva como una columna más. La
+matriz de parámetros del núcleo (kernel_params) alimenta directamente a los motores por
+lotes (OptiluzBatchGA, OptiluzBuilding, el análisis de sensibilidad).
+
+    batch = OptiluzInputBatch.from_csv("aulas.csv")
+    ga = OptiluzBatchGA(batch.kernel_params())
+"""
+
+import csv
+
+import numpy as np
+
+from OptiluzInput import EFICIENCIA_TIPICA, RECOMMENDATIONS, TIPOS_ILUMINACION, OptiluzInput
+from OptiluzKernels import PARAM_NAMES
+
+# Campos de entrada en el orden del constructor de OptiluzInput
+FIELDS = ('superficie', 'ventanas', 'coeficiente', 'temp_ext', 'temp_int', 'humedad', 'carga',
+          'lux', 'tipo_iluminacion', 'eficiencia', 'lamparas', 'potencia_lampara', 'alpha', 'beta')
+DERIVED_FIELDS = ('relacion_ventanas', 'delta_temp', 'potencia_instalada_m2',
+                  'potencia_teorica', 'eficiencia_instalacion')
+INTEGER_FIELDS = ('ventanas', 'lamparas')
+
+
+class OptiluzInputBatch:
+    """
+    Datos de entrada de R aulas como columnas. Cada argumento es un arreglo
+    de R valores o un escalar común a todas las aulas. perfil es la ruta del
+    perfil horario de cada aula (None o vacío si no tiene); los perfiles no se
+    cargan hasta convertir una fila en OptiluzInput.
+    """
+
+    def __init__(self, superficie, ventanas, coeficiente, temp_ext, temp_int, humedad,
+                 carga, lux, tipo_iluminacion, eficiencia, lamparas, potencia_lampara,
+                 alpha, beta, perfil=None):
+        columns = dict(zip(FIELDS, (superficie, ventanas, coeficiente, temp_ext, temp_int, humedad,
+                                    carga, lux, tipo_iluminacion, eficiencia, lamparas,
+                                    potencia_lampara, alpha, beta)))
+        perfil = np.array(perfil, dtype=object)
+        n = np.broadcast_shapes(perfil.shape, *(np.shape(value) for value in columns.values()))
+        if len(n) > 1:
+            raise ValueError("Cada campo debe ser un escalar o un arreglo de una dimensión")
+        n = n or (1,)  # Solo escalares: un aula
+
+        def column(name):
+            value = columns[name]
+            if name != 'tipo_iluminacion':
+                value = np.asarray(value, dtype=float)
+            return np.broadcast_to(value, n).copy()
+
+        # Validar y almacenar los datos de entrada (mismos límites que OptiluzInput)
+        self.superficie = np.maximum(1.0, column('superficie'))
+        self.ventanas = np.maximum(0, np.trunc(column('ventanas'))).astype(int)
+        self.coeficiente = np.maximum(0.1, column('coeficiente'))
+        self.temp_ext = column('temp_ext')
+        self.temp_int = column('temp_int')
+        self.humedad = np.clip(column('humedad'), 0, 100)
+        self.carga = np.maximum(0, column('carga'))
+        self.lux = np.maximum(50, column('lux'))
+
+        # Tipo de iluminación como código (índice en TIPOS_ILUMINACION); no reconocidos: LED
+        tipo = np.asarray(column('tipo_iluminacion'), dtype=str)
+        self.tipo_codigo = np.zeros(len(tipo), dtype=np.int8)
+        for codigo, nombre in enumerate(TIPOS_ILUMINACION):
+            self.tipo_codigo[tipo == nombre] = codigo
+        self.tipo_iluminacion = np.array(TIPOS_ILUMINACION)[self.tipo_codigo]
+
+        # Eficiencia típica del tipo cuando no se proporciona
+        eficiencia = column('eficiencia')
+        tipica = np.array([EFICIENCIA_TIPICA[nombre] for nombre in TIPOS_ILUMINACION], dtype=float)
+        self.eficiencia = np.where(eficiencia <= 0, tipica[self.tipo_codigo], eficiencia)
+
+        self.lamparas = np.maximum(1, np.trunc(column('lamparas'))).astype(int)
+        self.potencia_lampara = np.maximum(1, column('potencia_lampara'))
+
+        # Factores de ponderación normalizados para que sumen 1 (0.7 / 0.3 si no son válidos)
+        alpha = column('alpha')
+        beta = column('beta')
+        total = alpha + beta
+        valid = total > 0
+        safe = np.where(valid, total, 1.0)
+        self.alpha = np.where(valid, alpha / safe, 0.7)
+        self.beta = np.where(valid, beta / safe, 0.3)
+
+        # Ruta del perfil horario (None si el aula no tiene)
+        self.perfil = np.broadcast_to(perfil, n).copy()
+        self.perfil[np.equal(self.perfil, '')] = None
+
+        self._calculate_derived_values()
+
+    def _calculate_derived_values(self):
+        """Valores derivados de OptiluzInput para todas las aulas."""
+        # Superficie, lámparas y potencia ya están acotadas a valores positivos
+        instalada = self.lamparas * self.potencia_lampara
+        self.relacion_ventanas = (self.ventanas * 1.5) / self.superficie
+        self.delta_temp = np.abs(self.temp_ext - self.temp_int)
+        self.potencia_instalada_m2 = instalada / self.superficie
+        self.potencia_teorica = (self.lux * self.superficie) / self.eficiencia
+        self.eficiencia_instalacion = self.potencia_teorica / instalada
+
+    # ---- Construcción ----
+    @classmethod
+    def from_table(cls, table):
+        """
+        Crea el lote a partir de una tabla con una columna por campo
+        (diccionario de arreglos o DataFrame); la columna perfil es opcional.
+        """
+        missing = [name for name in FIELDS if name not in table]
+        if missing:
+            raise ValueError(f"Faltan columnas: {', '.join(missing)}")
+        perfil = np.asarray(table['perfil'], dtype=object) if 'perfil' in table else None
+        return cls(**{name: np.asarray(table[name]) for name in FIELDS}, perfil=perfil)
+
+    @classmethod
+    def from_records(cls, records):
+        """Crea el lote a partir de una lista de diccionarios (por ejemplo de to_dict)."""
+        records = list(records)
+        table = {name: [record[name] for record in records] for name in FIELDS}
+        table['perfil'] = [record.get('perfil') for record in records]
+        return cls.from_table(table)
+
+    @classmethod
+    def from_inputs(cls, inputs):
+        """Crea el lote a partir de objetos OptiluzInput."""
+        return cls.from_records(data.to_dict() for data in inputs)
+
+    @classmethod
+    def from_csv(cls, path):
+        """Lee un archivo CSV con una fila por aula y una columna por campo."""
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls.from_records(csv.DictReader(f))
+
+    # ---- Acceso por aula ----
+    def __len__(self):
+        return len(self.superficie)
+
+    def __getitem__(self, index):
+        """Un entero devuelve el OptiluzInput del aula; un corte o máscara, otro lote."""
+        if isinstance(index, (int, np.integer)):
+            return OptiluzInput.from_dict(self.row(index))
+        return OptiluzInputBatch(**{name: getattr(self, name)[index] for name in FIELDS},
+                                 perfil=self.perfil[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def row(self, index):
+        """Datos de un aula como diccionario (mismo formato que OptiluzInput.to_dict)."""
+        row = {}
+        for name in FIELDS:
+            value = getattr(self, name)[index]
+            row[name] = int(value) if name in INTEGER_FIELDS else (
+                str(value) if name == 'tipo_iluminacion' else float(value))
+        row['perfil'] = self.perfil[index]
+        return row
+
+    def to_inputs(self):
+        """Lista de OptiluzInput, uno por aula."""
+        return list(self)
+
+    def to_table(self, derived=False):
+        """Diccionario de columnas (con perfil); con derived=True incluye los valores derivados."""
+        names = FIELDS + ('perfil',) + (DERIVED_FIELDS if derived else ())
+        return {name: getattr(self, name).copy() for name in names}
+
+    # ---- Recomendaciones ----
+    def recommendation_flags(self):
+        """Indicadores de RECOMMENDATIONS como arreglos booleanos (uno por aula)."""
+        return {
+            'iluminacion_ineficiente': self.eficiencia_instalacion < 0.7,
+            'incandescente': self.tipo_codigo == TIPOS_ILUMINACION.index("Incandescente"),
+            'ventanas_altas': self.relacion_ventanas > 0.4,
+            'aislamiento_deficiente': (self.delta_temp > 10) & (self.coeficiente > 1.5),
+            'carga_alta': self.carga / self.superficie > 100,
+        }
+
+    def recommendation_counts(self):
+        """Número de aulas a las que aplica cada recomendación."""
+        return {flag: int(values.sum()) for flag, values in self.recommendation_flags().items()}
+
+    def get_recommendations(self, index):
+        """Mensajes de recomendación de un aula (como OptiluzInput.get_recommendations)."""
+        flags = self.recommendation_flags()
+        return [message for flag, message in RECOMMENDATIONS if flags[flag][index]]
+
+    # ---- Motores por lotes ----
+    def kernel_params(self, ga=None):
+        """
+        Matriz (aulas, parámetros) con una fila de make_params por aula. Las
+        constantes del modelo se toman de ga (por defecto, de la clase OptiluzGA).
+        Los motores por lotes usan el modelo estático: los perfiles horarios
+        no intervienen.
+        """
+        if ga is None:
+            from OptiluzGA import OptiluzGA
+            ga = OptiluzGA
+        params = np.empty((len(self), len(PARAM_NAMES)))
+        for j, name in enumerate(PARAM_NAMES):
+            params[:, j] = getattr(self, name) if name in FIELDS else getattr(ga, name)
+        return params
+
+    def __repr__(self):
+        return f"OptiluzInputBatch({len(self)} aulas)"
@@ -0,0 +1,294 @@
+"""
+Núcleos de cálculo vectorizados para OptiLuz.
+
+Contiene las versiones por lotes de la función de fitness, del cálculo de
+temperatura promedio y de la mutación. Cada población se representa como una
+matriz (individuos x genes) con el orden definido en GENES.
+
+Si numba está instalado se compilan núcleos fusionados que recorren la matriz
+una sola vez sin crear arreglos temporales; si no, se usa NumPy de forma
+transparente. Ambos motores producen los mismos resultados que los métodos
+escalares de OptiluzGA (evaluate_individual, calculate_avg_temperature).
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba es opcional
+    numba = None
+
+# Orden de los genes en la representación matricial
+GENES = ('BTU', 'P_luz', 'U', 'N_personas')
+BTU, P_LUZ, U, N_PERSONAS = range(len(GENES))
+
+# Orden de los parámetros en el vector de parámetros del núcleo
+PARAM_NAMES = (
+    'superficie', 'ventanas', 'carga', 'lux', 'eficiencia', 'temp_ext', 'temp_int',
+    'alpha', 'beta', 'BTU_FACTOR', 'PERSON_FACTOR', 'EQUIP_FACTOR', 'WINDOW_AREA',
+    'CALOR_PERSONA', 'EFICIENCIA_AC'
+)
+(P_SUPERFICIE, P_VENTANAS, P_CARGA, P_LUX, P_EFICIENCIA, P_TEMP_EXT, P_TEMP_INT,
+ P_ALPHA, P_BETA, P_BTU_FACTOR, P_PERSON_FACTOR, P_EQUIP_FACTOR, P_WINDOW_AREA,
+ P_CALOR_PERSONA, P_EFICIENCIA_AC) = range(len(PARAM_NAMES))
+
+
+def get_backend():
+    """Devuelve el nombre del motor de cálculo disponible ('numba' o 'numpy')."""
+    return 'numba' if numba is not None else 'numpy'
+
+
+def make_params(input_data, ga):
+    """
+    Construye el vector de parámetros del núcleo a partir de los datos de
+    entrada y de las constantes del algoritmo genético.
+    """
+    return np.array([
+        input_data.superficie, input_data.ventanas, input_data.carga,
+        input_data.lux, input_data.eficiencia, input_data.temp_ext,
+        input_data.temp_int, input_data.alpha, input_data.beta,
+        ga.BTU_FACTOR, ga.PERSON_FACTOR, ga.EQUIP_FACTOR, ga.WINDOW_AREA,
+        ga.CALOR_PERSONA, ga.EFICIENCIA_AC
+    ], dtype=float)
+
+
+def population_to_array(population):
+    """Convierte una lista de individuos (diccionarios) en una matriz de genes."""
+    genes = np.empty((len(population), len(GENES)), dtype=float)
+    for i, ind in enumerate(population):
+        genes[i] = [ind[key] for key in GENES]
+    return genes
+
+
+def array_to_population(genes):
+    """Convierte una matriz de genes en una lista de individuos (diccionarios)."""
+    population = []
+    for row in genes.tolist():
+        individual = dict(zip(GENES, row))
+        individual['N_personas'] = int(round(individual['N_personas']))
+        population.append(individual)
+    return population
+
+
+# ---------------------------------------------------------------------------
+# Implementación NumPy (siempre disponible)
+# ---------------------------------------------------------------------------
+
+def _evaluate_numpy(genes, params):
+    """
+    Fitness de cada fila de genes. Admite difusión (broadcasting): params
+    puede ser un vector o una matriz con un juego de parámetros por fila.
+    """
+    genes = np.asarray(genes, dtype=float)
+    params = np.asarray(params, dtype=float)
+    BTU_gene = genes[..., BTU]
+    P_luz_gene = genes[..., P_LUZ]
+    U_gene = genes[..., U]
+    N_personas_gene = genes[..., N_PERSONAS]
+
+    A_aula = params[..., P_SUPERFICIE]
+    carga = params[..., P_CARGA]
+    base_btu = A_aula * params[..., P_BTU_FACTOR] + carga * params[..., P_EQUIP_FACTOR]
+    person_factor = params[..., P_PERSON_FACTOR]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Error del aire acondicionado (mayor penalización si es insuficiente)
+        BTU_optimal = base_btu + N_personas_gene * person_factor
+        error_AC = np.abs(BTU_gene - BTU_optimal) / BTU_optimal
+        error_AC = np.where(BTU_gene < BTU_optimal, 1.5 * error_AC, error_AC)
+
+        # Error de iluminación (mayor penalización si es insuficiente)
+        P_luz_optimal = (params[..., P_LUX] * A_aula) / params[..., P_EFICIENCIA]
+        error_luz = np.abs(P_luz_gene - P_luz_optimal) / P_luz_optimal
+        error_luz = np.where(P_luz_gene < P_luz_optimal, 1.2 * error_luz, error_luz)
+
+        # Pérdida de calor normalizada
+        A_ventanas = params[..., P_VENTANAS] * params[..., P_WINDOW_AREA]
+        error_loss = U_gene * A_ventanas * np.abs(params[..., P_TEMP_EXT] - params[..., P_TEMP_INT]) / 1000
+
+        # Personas óptimas derivadas del BTU
+        N_personas_optimal = np.maximum(5, (BTU_gene - base_btu) / person_factor)
+        error_personas = np.abs(N_personas_gene - N_personas_optimal) / np.maximum(N_personas_optimal, 1)
+        error_personas = np.where(person_factor > 0, error_personas, 0.0)
+
+        # Densidad de ocupación
+        densidad = np.where(N_personas_gene > 0, A_aula / N_personas_gene, np.inf)
+        error_densidad = np.select(
+            [densidad < 1.0, densidad < 1.5, densidad > 5.0],
+            [2.0, 1.0, (densidad - 5.0) / 5.0],
+            default=0.0
+        )
+
+    E_total = 0.4 * error_AC + 0.3 * error_luz + 0.3 * error_loss
+    C_penalizacion = 0.7 * error_personas + 0.3 * error_densidad
+    return params[..., P_ALPHA] * E_total + params[..., P_BETA] * C_penalizacion
+
+
+def _temperature_numpy(genes, params):
+    """Temperatura promedio del aula para cada fila de genes."""
+    genes = np.asarray(genes, dtype=float)
+    params = np.asarray(params, dtype=float)
+    temp_ext = params[..., P_TEMP_EXT]
+    temp_int = params[..., P_TEMP_INT]
+
+    Q_ventanas = genes[..., U] * params[..., P_VENTANAS] * params[..., P_WINDOW_AREA] * (temp_ext - temp_int)
+    Q_total = (Q_ventanas + genes[..., N_PERSONAS] * params[..., P_CALOR_PERSONA]
+               + params[..., P_CARGA] + genes[..., P_LUZ])
+    Q_ac = genes[..., BTU] * 0.293 * params[..., P_EFICIENCIA_AC]
+    temp_promedio = temp_int + (Q_total - Q_ac) / 100
+
+    # No puede alejarse más de 15°C de la temperatura exterior
+    return np.clip(temp_promedio, temp_ext - 15, temp_ext + 15)
+
+
+def _mutate_numpy(genes, lower, upper, mutation_rate, draws, normals, deltas):
+    """Mutación de la matriz de genes a partir de números aleatorios ya sorteados."""
+    mutated = genes.copy()
+    mask = draws < mutation_rate
+    sigma = (upper - lower) * 0.1
+    step = normals * sigma
+    step[:, N_PERSONAS] = deltas
+    mutated += np.where(mask, step, 0.0)
+    np.clip(mutated, lower, upper, out=mutated)
+    return mutated
+
+
+# ---------------------------------------------------------------------------
+# Núcleos fusionados (numba)
+# ---------------------------------------------------------------------------
+
+def _fitness_scalar(b, pl, u, n, p):
+    """Fitness de un individuo; mismo cálculo que OptiluzGA.evaluate_individual."""
+    A_aula = p[P_SUPERFICIE]
+    carga = p[P_CARGA]
+    base_btu = A_aula * p[P_BTU_FACTOR] + carga * p[P_EQUIP_FACTOR]
+
+    BTU_optimal = base_btu + n * p[P_PERSON_FACTOR]
+    error_AC = abs(b - BTU_optimal) / BTU_optimal
+    if b < BTU_optimal:
+        error_AC *= 1.5
+
+    P_luz_optimal = (p[P_LUX] * A_aula) / p[P_EFICIENCIA]
+    error_luz = abs(pl - P_luz_optimal) / P_luz_optimal
+    if pl < P_luz_optimal:
+        error_luz *= 1.2
+
+    error_loss = u * p[P_VENTANAS] * p[P_WINDOW_AREA] * abs(p[P_TEMP_EXT] - p[P_TEMP_INT]) / 1000
+
+    if p[P_PERSON_FACTOR] > 0:
+        N_personas_optimal = max(5.0, (b - base_btu) / p[P_PERSON_FACTOR])
+        error_personas = abs(n - N_personas_optimal) / max(N_personas_optimal, 1.0)
+    else:
+        error_personas = 0.0
+
+    if n > 0:
+        densidad = A_aula / n
+    else:
+        densidad = np.inf
+    if densidad < 1.0:
+        error_densidad = 2.0
+    elif densidad < 1.5:
+        error_densidad = 1.0
+    elif densidad > 5.0:
+        error_densidad = (densidad - 5.0) / 5.0
+    else:
+        error_densidad = 0.0
+
+    E_total = 0.4 * error_AC + 0.3 * error_luz + 0.3 * error_loss
+    C_penalizacion = 0.7 * error_personas + 0.3 * error_densidad
+    return p[P_ALPHA] * E_total + p[P_BETA] * C_penalizacion
+
+
+def _evaluate_loop(genes, params, out):
+    for i in range(genes.shape[0]):
+        out[i] = _fitness_scalar(genes[i, 0], genes[i, 1], genes[i, 2], genes[i, 3], params)
+    return out
+
+
+def _temperature_loop(genes, params, out):
+    temp_ext = params[P_TEMP_EXT]
+    temp_int = params[P_TEMP_INT]
+    A_ventanas = params[P_VENTANAS] * params[P_WINDOW_AREA]
+    for i in range(genes.shape[0]):
+        Q_total = (genes[i, U] * A_ventanas * (temp_ext - temp_int)
+                   + genes[i, N_PERSONAS] * params[P_CALOR_PERSONA]
+                   + params[P_CARGA] + genes[i, P_LUZ])
+        Q_ac = genes[i, BTU] * 0.293 * params[P_EFICIENCIA_AC]
+        temp = temp_int + (Q_total - Q_ac) / 100
+        out[i] = min(max(temp, temp_ext - 15), temp_ext + 15)
+    return out
+
+
+def _mutate_loop(genes, lower, upper, mutation_rate, draws, normals, deltas, out):
+    for i in range(genes.shape[0]):
+        for j in range(genes.shape[1]):
+            value = genes[i, j]
+            if draws[i, j] < mutation_rate:
+                if j == N_PERSONAS:
+                    value += deltas[i]
+                else:
+                    value += normals[i, j] * (upper[j] - lower[j]) * 0.1
+            out[i, j] = min(max(value, lower[j]), upper[j])
+    return out
+
+
+if numba is not None:
+    _fitness_scalar = numba.njit(cache=True)(_fitness_scalar)
+    _evaluate_loop = numba.njit(cache=True)(_evaluate_loop)
+    _temperature_loop = numba.njit(cache=True)(_temperature_loop)
+    _mutate_loop = numba.njit(cache=True)(_mutate_loop)
+
+
+# ---------------------------------------------------------------------------
+# API pública
+# ---------------------------------------------------------------------------
+
+def _use_fused(genes, params, backend):
+    """Los núcleos fusionados solo cubren una matriz 2D con un único juego de parámetros."""
+    if backend is None:
+        backend = get_backend()
+    return backend == 'numba' and numba is not None and np.ndim(genes) == 2 and np.ndim(params) == 1
+
+
+def evaluate_genes(genes, params, backend=None, out=None):
+    """
+    Calcula el fitness (menor es mejor) de cada fila de la matriz de genes.
+    Si se indica out (arreglo contiguo de una fila por individuo), el
+    resultado se escribe en él.
+    """
+    if _use_fused(genes, params, backend):
+        genes = np.ascontiguousarray(genes, dtype=float)
+        if out is None:
+            out = np.empty(genes.shape[0])
+        return _evaluate_loop(genes, np.ascontiguousarray(params, dtype=float), out)
+    if out is None:
+        return _evaluate_numpy(genes, params)
+    out[...] = _evaluate_numpy(genes, params)
+    return out
+
+
+def temperature_genes(genes, params, backend=None):
+    """Calcula la temperatura promedio del aula para cada fila de la matriz de genes."""
+    if _use_fused(genes, params, backend):
+        genes = np.ascontiguousarray(genes, dtype=float)
+        out = np.empty(genes.shape[0])
+        return _temperature_loop(genes, np.ascontiguousarray(params, dtype=float), out)
+    return _temperature_numpy(genes, params)
+
+
+def mutate_genes(genes, lower, upper, mutation_rate, rng, backend=None):
+    """
+    Aplica la mutación de OptiluzGA.mutate a todas las filas de la matriz:
+    ruido gaussiano (sigma = 10% del rango) en genes continuos y un salto
+    entero entre -5 y 5 en N_personas, respetando los límites.
+    """
+    genes = np.ascontiguousarray(genes, dtype=float)
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    draws = rng.random(genes.shape)
+    normals = rng.standard_normal(genes.shape)
+    deltas = rng.integers(-5, 6, size=genes.shape[0]).astype(float)
+    if _use_fused(genes, lower, backend):
+        out = np.empty_like(genes)
+        return _mutate_loop(genes, lower, upper, mutation_rate, draws, normals, deltas, out)
+    return _mutate_numpy(genes, lower, upper, mutation_rate, draws, normals, deltas)
@@ -0,0 +1,124 @@
+"""
+Ejecuciones múltiples (multi-arranque) de OptiLuz en paralelo.
+
+Una sola ejecución del algoritmo genético con una población pequeña es
+ruidosa: no se sabe si la mejor solución es robusta o fruto del azar. Este
+módulo lanza R ejecuciones independientes de OptiluzGA, cada una con su propia
+semilla, en un grupo de procesos, y devuelve la mejor solución global junto
+con la distribución del fitness final y de los genes entre ejecuciones
+(mediana, rango intercuartílico y tasa de éxito respecto a un objetivo).
+
+Con tantos procesos como ejecuciones, el tiempo total es aproximadamente el de
+una sola ejecución.
+"""
+
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from OptiluzKernels import GENES
+from OptiluzResult import RunResult
+
+DEFAULT_TOLERANCE = 0.01  # Objetivo por defecto: 1% sobre el mejor fitness encontrado
+
+
+def run_seed(input_dict, pop_size, seed, run_params):
+    """Ejecuta una optimización sin interfaz con la semilla dada (en un proceso del grupo)."""
+    from OptiluzGA import OptiluzGA
+    from OptiluzInput import OptiluzInput
+
+    ga = OptiluzGA(OptiluzInput.from_dict(input_dict), pop_size=pop_size, seed=seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = ga.run_evolution(display=False, **run_params)
+    return result.to_dict()
+
+
+def spawn_seeds(seed, runs):
+    """Semillas independientes y reproducibles para cada ejecución."""
+    return [int(s) for s in np.random.SeedSequence(seed).generate_state(runs)]
+
+
+def _quartiles(values):
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    return {'median': float(median), 'q1': float(q1), 'q3': float(q3), 'iqr': float(q3 - q1),
+            'min': float(np.min(values)), 'max': float(np.max(values))}
+
+
+class MultiStartResult:
+    """Resultados de todas las ejecuciones y su resumen estadístico."""
+
+    def __init__(self, results, seeds, target, elapsed):
+        self.results = results
+        self.seeds = seeds
+        self.elapsed = elapsed
+        fitness = np.array([r.best_fitness for r in results])
+        self.best_index = int(np.argmin(fitness))
+        self.target = target if target is not None else (
+            fitness.min() + abs(fitness.min()) * DEFAULT_TOLERANCE)
+        genes = np.array([[r.best_solution[key] for key in GENES] for r in results], dtype=float)
+        run_time = sum(r.run_stats.get('elapsed', 0.0) for r in results)
+
+        self.stats = {
+            'runs': len(results),
+            'fitness': dict(_quartiles(fitness), mean=float(fitness.mean()), std=float(fitness.std())),
+            'genes': {key: _quartiles(genes[:, i]) for i, key in enumerate(GENES)},
+            'target': float(self.target),
+            'success_rate': float(np.mean(fitness <= self.target)),
+            'elapsed': elapsed,
+            'speedup': run_time / elapsed if elapsed > 0 else 0.0,
+        }
+
+    @property
+    def best(self):
+        """RunResult de la mejor ejecución."""
+        return self.results[self.best_index]
+
+    @property
+    def best_seed(self):
+        return self.seeds[self.best_index]
+
+    def report(self):
+        """Resumen en texto de la distribución entre ejecuciones."""
+        f = self.stats['fitness']
+        lines = [
+            f"Ejecuciones: {self.stats['runs']} | Tiempo: {self.elapsed:.2f} s "
+            f"(aceleración {self.stats['speedup']:.1f}x)",
+            f"Mejor Fitness: {f['min']:.4f} (semilla {self.best_seed})",
+            f"Fitness final: mediana {f['median']:.4f}, RIC {f['iqr']:.4f} "
+            f"[{f['q1']:.4f} - {f['q3']:.4f}]",
+            f"Tasa de éxito (fitness <= {self.stats['target']:.4f}): {self.stats['success_rate'] * 100:.0f}%",
+        ]
+        for key in GENES:
+            g = self.stats['genes'][key]
+            lines.append(f"  {key}: mediana {g['median']:.2f}, RIC {g['iqr']:.2f}")
+        return "\n".join(lines)
+
+
+def multi_start(input_data, runs=8, pop_size=20, seed=None, target=None,
+                max_workers=None, **run_params):
+    """
+    Lanza runs ejecuciones independientes de OptiluzGA y agrega sus resultados.
+
+    seed: semilla base (las semillas de cada ejecución se derivan de ella).
+    target: fitness objetivo para la tasa de éxito; por defecto el mejor
+        fitness encontrado más un 1%.
+    max_workers: procesos del grupo (1 ejecuta en el proceso actual).
+    run_params: argumentos de run_evolution (generations, mutation_rate, ...).
+    """
+    input_dict = input_data.to_dict()
+    seeds = spawn_seeds(seed, runs)
+    start = time.perf_counter()
+
+    if max_workers == 1:
+        states = [run_seed(input_dict, pop_size, s, run_params) for s in seeds]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or min(runs, os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(run_seed, input_dict, pop_size, s, run_params) for s in seeds]
+            states = [future.result() for future in futures]
+
+    results = [RunResult.from_dict(state) for state in states]
+    return MultiStartResult(results, seeds, target, time.perf_counter() - start)
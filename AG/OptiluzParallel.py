@@ -0,0 +1,204 @@
+"""
+Evaluación paralela del fitness con memoria compartida.
+
+Los modos de islas y multi-arranque reparten ejecuciones completas entre
+procesos, pero una sola ejecución con una población enorme (10^5 - 10^6
+individuos) evalúa en un solo núcleo. SharedMemoryEvaluator guarda la matriz
+de genes y el vector de fitness en bloques de multiprocessing.shared_memory:
+el proceso principal copia los genes una vez por generación, cada proceso del
+grupo evalúa un tramo contiguo de filas directamente sobre la memoria
+compartida y escribe su fitness en el vector de salida. Ni los genes ni el
+fitness se serializan; cada tarea solo recibe los nombres de los bloques, los
+límites del tramo y el vector de parámetros.
+
+La copia de los genes al bloque compartido es deliberada. OptiluzGA guarda la
+población como lista de individuos y arma la matriz de genes en cada
+generación, así que no hay una matriz persistente que pueda vivir en el
+bloque; además, el bloque se reemplaza al crecer y se libera al cerrar el
+evaluador, y una vista NumPy que sobreviva a ese momento apunta a memoria no
+válida (el proceso termina con una violación de segmento). La copia es
+secuencial pero barata: unos 10 ms por millón de filas, frente a unos 140 ms
+de evaluación en un núcleo.
+
+La aceleración depende de los núcleos disponibles. Con menos núcleos que
+procesos, repartir es más lento que evaluar en el proceso principal (en una
+máquina de un núcleo, 2 procesos tardan 1.35 veces más que 1); el banco de
+pruebas del final del módulo avisa en ese caso.
+
+Solo escala la evaluación con el núcleo de cálculo. El resto de cada
+generación sigue en el proceso principal y en Python puro: OptiluzGA guarda
+la población como lista de diccionarios, la convierte a matriz en cada
+evaluación y la selección y el cruce recorren individuo a individuo. En una
+ejecución de 200 000 individuos con 4 procesos, evaluate_population ocupó
+unos 2.4 s de 23 s y evolve_population unos 18 s, de modo que acelerar la
+evaluación apenas cambia el tiempo total a esa escala.
+
+Uso con OptiluzGA:
+
+    with SharedMemoryEvaluator(workers=8) as evaluator:
+        ga = OptiluzGA(data, pop_size=1_000_000, parallel=evaluator)
+        ga.run_evolution(display=False)
+
+Para medir la escalabilidad:
+    python OptiluzParallel.py --filas 1000000
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from OptiluzKernels import GENES, evaluate_genes
+
+MIN_PARALLEL_ROWS = 50000  # Por debajo, repartir cuesta más que evaluar en el proceso principal
+GROWTH = 1.5               # Margen al ampliar los bloques compartidos
+
+# Bloques abiertos en cada proceso del grupo: rol -> (nombre, SharedMemory)
+_attached = {}
+
+
+def _attach(role, name, shape):
+    """Vista NumPy de un bloque compartido; se abre una sola vez por proceso."""
+    current = _attached.get(role)
+    if current is None or current[0] != name:
+        if current is not None:
+            current[1].close()
+        current = (name, shared_memory.SharedMemory(name=name))
+        _attached[role] = current
+    return np.ndarray(shape, dtype=float, buffer=current[1].buf)
+
+
+def _evaluate_slice(genes_name, fitness_name, capacity, start, stop, params, backend):
+    """Evalúa las filas [start, stop) de la matriz compartida (en un proceso del grupo)."""
+    genes = _attach('genes', genes_name, (capacity, len(GENES)))
+    fitness = _attach('fitness', fitness_name, (capacity,))
+    evaluate_genes(genes[start:stop], params, backend, out=fitness[start:stop])
+    return stop - start
+
+
+class SharedMemoryEvaluator:
+    """
+    Evaluador paralelo de matrices de genes. Solo acelera el cálculo del
+    fitness, no los operadores genéticos de OptiluzGA (ver arriba).
+
+    workers: procesos del grupo (por defecto, los núcleos disponibles).
+    backend: motor de cálculo de cada proceso ('numba' o 'numpy'; por defecto el disponible).
+    min_rows: tamaño mínimo de población para repartir la evaluación.
+    """
+
+    def __init__(self, workers=None, backend=None, min_rows=MIN_PARALLEL_ROWS, mp_context=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.min_rows = min_rows
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp_context)
+        self.capacity = 0
+        self._genes_shm = self._fitness_shm = None
+        self._genes = self._fitness = None
+        self.parallel_evaluations = 0
+
+    def _reserve(self, rows):
+        """Amplía los bloques compartidos si la población no cabe."""
+        if rows <= self.capacity:
+            return
+        self._release()
+        capacity = max(rows, int(self.capacity * GROWTH))
+        self._genes_shm = shared_memory.SharedMemory(create=True, size=capacity * len(GENES) * 8)
+        self._fitness_shm = shared_memory.SharedMemory(create=True, size=capacity * 8)
+        self._genes = np.ndarray((capacity, len(GENES)), dtype=float, buffer=self._genes_shm.buf)
+        self._fitness = np.ndarray((capacity,), dtype=float, buffer=self._fitness_shm.buf)
+        self.capacity = capacity
+
+    def evaluate(self, genes, params):
+        """Fitness de cada fila de genes con un único vector de parámetros."""
+        genes = np.asarray(genes, dtype=float)
+        n = len(genes)
+        if n < self.min_rows or self.workers == 1:
+            return evaluate_genes(genes, params, self.backend)
+
+        self._reserve(n)
+        self._genes[:n] = genes
+        params = np.ascontiguousarray(params, dtype=float)
+        edges = np.linspace(0, n, self.workers + 1).astype(int)
+        futures = [
+            self.executor.submit(_evaluate_slice, self._genes_shm.name, self._fitness_shm.name,
+                                 self.capacity, int(start), int(stop), params, self.backend)
+            for start, stop in zip(edges[:-1], edges[1:]) if stop > start
+        ]
+        wait(futures)
+        for future in futures:
+            future.result()  # Propaga los errores de los procesos
+        self.parallel_evaluations += n
+        return self._fitness[:n].copy()
+
+    def _release(self):
+        for shm in (self._genes_shm, self._fitness_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._genes_shm = self._fitness_shm = None
+        self._genes = self._fitness = None
+        self.capacity = 0
+
+    def close(self):
+        """Detiene el grupo de procesos y libera la memoria compartida."""
+        self.executor.shutdown(wait=True)
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def benchmark(rows=1_000_000, repeats=5, worker_counts=None, seed=0):
+    """Tiempo medio por evaluación completa con distintas cantidades de procesos."""
+    from OptiluzGA import OptiluzGA
+    from OptiluzInput import OptiluzInput
+    from OptiluzKernels import make_params
+
+    data = OptiluzInput(superficie=50, ventanas=4, coeficiente=1.2, temp_ext=30, temp_int=22,
+                        humedad=60, carga=5000, lux=300, tipo_iluminacion="LED", eficiencia=100,
+                        lamparas=10, potencia_lampara=20, alpha=0.8, beta=0.2)
+    ga = OptiluzGA(data)
+    params = make_params(data, ga)
+    lower, upper = ga.bounds_arrays()
+    genes = lower + np.random.default_rng(seed).random((rows, len(GENES))) * (upper - lower)
+    reference = evaluate_genes(genes, params)
+
+    timings = {}
+    for workers in worker_counts or sorted({1, 2, 4, os.cpu_count() or 1}):
+        with SharedMemoryEvaluator(workers=workers, min_rows=0) as evaluator:
+            fitness = evaluator.evaluate(genes, params)  # Arranque de procesos y compilación
+            if not np.allclose(fitness, reference):
+                raise RuntimeError("La evaluación paralela no coincide con la secuencial")
+            start = time.perf_counter()
+            for _ in range(repeats):
+                evaluator.evaluate(genes, params)
+            timings[workers] = (time.perf_counter() - start) / repeats
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalabilidad de la evaluación paralela de OptiLuz")
+    parser.add_argument("--filas", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--procesos", type=int, nargs="*", default=None)
+    args = parser.parse_args()
+
+    timings = benchmark(args.filas, args.repeticiones, args.procesos)
+    cores = os.cpu_count() or 1
+    if max(timings) > cores:
+        print(f"AVISO: solo hay {cores} núcleo(s); con más procesos que núcleos "
+              f"la aceleración no es representativa")
+    base = timings[min(timings)]
+    for workers, elapsed in timings.items():
+        print(f"{workers:3d} procesos: {elapsed * 1000:8.1f} ms por generación "
+              f"(aceleración {base / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
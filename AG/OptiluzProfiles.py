@@ -0,0 +1,201 @@
+"""
+Carga de perfiles climáticos y de ocupación para OptiLuz.
+
+Lee archivos de clima en formato CSV o EPW (8760 filas x muchas columnas) y
+los convierte una sola vez en una caché binaria columnar (.npy) acompañada de
+un archivo de metadatos (.json). Las siguientes cargas abren la caché como
+mapa de memoria de solo lectura, de modo que todos los procesos que usan el
+mismo perfil comparten las mismas páginas en memoria.
+
+La caché se invalida cuando cambia la fecha de modificación del archivo
+original y su contenido (hash SHA-256) ya no coincide.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from OptiluzSimulation import HourlyProfile
+
+CACHE_VERSION = 1
+CACHE_DIRNAME = ".optiluz_cache"
+
+# Columnas numéricas que se extraen de un archivo EPW (índice de campo)
+EPW_COLUMNS = {
+    'mes': 1,
+    'dia': 2,
+    'hora': 3,
+    'temp_ext': 6,
+    'punto_rocio': 7,
+    'humedad': 8,
+    'presion': 9,
+    'radiacion_global': 13,
+    'viento': 21,
+}
+EPW_HEADER_LINES = 8
+
+# Nombres alternativos aceptados para las columnas principales
+TEMP_ALIASES = ('temp_ext', 'temperatura', 'temperature', 'dry_bulb', 'drybulb')
+OCUPACION_ALIASES = ('ocupacion', 'ocupación', 'occupancy')
+
+
+def _file_hash(path, block_size=1 << 20):
+    """Calcula el hash SHA-256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_paths(path, cache_dir):
+    """Rutas de la caché (.npy) y de sus metadatos (.json) para un archivo fuente."""
+    path = os.path.abspath(path)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIRNAME)
+    key = hashlib.sha256(path.encode('utf-8')).hexdigest()[:16]
+    base = os.path.join(cache_dir, f"{os.path.basename(path)}.{key}")
+    return base + ".npy", base + ".json"
+
+
+def _parse_epw(path):
+    """Extrae las columnas numéricas conocidas de un archivo EPW."""
+    names = list(EPW_COLUMNS)
+    rows = []
+    with open(path, newline='', encoding='latin-1') as f:
+        for _ in range(EPW_HEADER_LINES):
+            next(f, None)
+        for fields in csv.reader(f):
+            if fields:
+                rows.append([float(fields[EPW_COLUMNS[name]]) for name in names])
+    return names, np.array(rows, dtype=float).reshape(-1, len(names))
+
+
+def _parse_csv(path):
+    """Lee un CSV con encabezado y conserva solo las columnas numéricas."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        rows = [row for row in reader if row]
+
+    names, columns = [], []
+    for j, name in enumerate(header):
+        try:
+            columns.append([float(row[j]) for row in rows])
+            names.append(name)
+        except (ValueError, IndexError):
+            continue  # Columna no numérica (fechas, etiquetas...)
+    if not names:
+        raise ValueError(f"El archivo {path} no contiene columnas numéricas")
+    return names, np.array(columns, dtype=float).T
+
+
+def parse_profile_file(path):
+    """Analiza un archivo de texto y retorna (nombres_columnas, matriz filas x columnas)."""
+    if path.lower().endswith('.epw'):
+        return _parse_epw(path)
+    return _parse_csv(path)
+
+
+def _write_cache(npy_path, json_path, names, data, meta):
+    """Escribe la caché de forma atómica (archivo temporal + reemplazo)."""
+    os.makedirs(os.path.dirname(npy_path), exist_ok=True)
+
+    # Columnar: cada columna queda contigua en disco
+    columnar = np.ascontiguousarray(data.T)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(npy_path), suffix='.npy')
+    with os.fdopen(fd, 'wb') as f:
+        np.save(f, columnar)
+    os.replace(tmp, npy_path)
+
+    _write_meta(json_path, dict(meta, columns=names, rows=int(data.shape[0])))
+
+
+def _write_meta(json_path, meta):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(json_path), suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, json_path)
+
+
+def _read_meta(json_path):
+    try:
+        with open(json_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_columns(path, cache_dir=None):
+    """
+    Carga todas las columnas numéricas de un archivo de perfil.
+
+    Retorna un diccionario nombre -> arreglo de solo lectura respaldado por un
+    mapa de memoria de la caché binaria. El archivo de texto solo se analiza
+    si la caché no existe o quedó obsoleta.
+    """
+    return _load_cached(path, cache_dir)[0]
+
+
+def _load_cached(path, cache_dir=None):
+    """Columnas del perfil y metadatos de su caché (incluye el SHA-256 del archivo)."""
+    stat = os.stat(path)
+    npy_path, json_path = _cache_paths(path, cache_dir)
+    meta = _read_meta(json_path)
+
+    valid = (meta is not None and meta.get('version') == CACHE_VERSION
+             and os.path.exists(npy_path))
+    if valid and (meta.get('mtime_ns') != stat.st_mtime_ns or meta.get('size') != stat.st_size):
+        # Cambió la fecha o el tamaño: comprobar el contenido antes de reanalizar
+        digest = _file_hash(path)
+        valid = meta.get('sha256') == digest
+        if valid:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            _write_meta(json_path, meta)
+
+    if not valid:
+        names, data = parse_profile_file(path)
+        meta = {
+            'version': CACHE_VERSION,
+            'source': os.path.abspath(path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': _file_hash(path),
+        }
+        _write_cache(npy_path, json_path, names, data, meta)
+        meta = _read_meta(json_path)
+
+    columnar = np.load(npy_path, mmap_mode='r')
+    return {name: columnar[j] for j, name in enumerate(meta['columns'])}, meta
+
+
+def _find_column(columns, aliases, requested):
+    if requested is not None:
+        if requested not in columns:
+            raise KeyError(f"La columna '{requested}' no existe en el perfil")
+        return columns[requested]
+    for name in aliases:
+        if name in columns:
+            return columns[name]
+    return None
+
+
+def load_profile(path, cache_dir=None, temp_column=None, ocupacion_column=None):
+    """
+    Carga un perfil horario (HourlyProfile) desde un archivo CSV o EPW usando
+    la caché binaria. Si no hay columna de ocupación se asume ocupación total.
+    """
+    columns, meta = _load_cached(path, cache_dir)
+    temp_ext = _find_column(columns, TEMP_ALIASES, temp_column)
+    if temp_ext is None:
+        raise KeyError(f"No se encontró una columna de temperatura exterior en {path}")
+    ocupacion = _find_column(columns, OCUPACION_ALIASES, ocupacion_column)
+
+    profile = HourlyProfile(temp_ext, ocupacion)
+    profile.source = (os.path.abspath(path), cache_dir, temp_column, ocupacion_column)
+    profile.sha256 = meta['sha256']
+    return profile
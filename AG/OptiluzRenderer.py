@@ -0,0 +1,220 @@
+"""
+Presentación de resultados de OptiLuz.
+
+Toma un RunResult (OptiluzResult) y genera el reporte de texto y las seis
+gráficas que antes dibujaba OptiluzGA al final de cada ejecución. Las
+funciones draw_* dibujan sobre unos ejes dados (API orientada a objetos), de
+modo que sirven igual para ventanas de pyplot, figuras integradas en Tk o
+archivos de imagen. matplotlib solo se importa al dibujar.
+"""
+
+
+def print_report(result, profile=None):
+    """Imprime el reporte final de una ejecución."""
+    sol = result.best_solution
+    metrics = result.metrics
+    temp_int = result.input['temp_int']
+
+    print("\n RESULTADOS OPTIMIZADOS:")
+    print(f"Capacidad Óptima del Aire Acondicionado: {sol['BTU']:.2f} BTU")
+    print(f"Tipo de Aire Acondicionado Recomendado: {metrics['tipo_ac']}")
+    print(f"Potencia de Iluminación Recomendada: {sol['P_luz']:.2f} W")
+    print(f"Nivel Óptimo de Aislamiento Térmico (U): {sol['U']:.2f}")
+    print(f"Cantidad Recomendada de Personas por Aula: {sol['N_personas']}\n")
+
+    print(f"Cantidad de personas por m²: {metrics['personas_por_m2']:.2f}")
+    print(f"Espacio por persona: {metrics['m2_por_persona']:.2f} m²\n")
+
+    print(f"⚡ Consumo Base: {metrics['consumo_antes']:.2f} kWh")
+    print(f"⚡ Consumo Óptimo: {metrics['consumo_despues']:.2f} kWh")
+    print(f"📉 Ahorro Energético: {metrics['ahorro']:.2f} kWh ({metrics['ahorro_pct']:.1f}%)\n")
+
+    temp_promedio = metrics['temp_promedio']
+    if metrics.get('horas_no_cubiertas') is not None and profile is not None:
+        print(f"🕒 Simulación horaria: {profile.hours} h, "
+              f"{metrics['horas_no_cubiertas']} de {profile.occupied_hours} horas ocupadas sin cubrir la carga")
+    print(f"🌡️ Temperatura Promedio del Aula: {temp_promedio:.1f} °C")
+    print(f"   (Temperatura deseada: {temp_int:.1f} °C)")
+
+    if abs(temp_promedio - temp_int) > 2:
+        print("   La temperatura promedio difiere significativamente de la deseada.")
+        if temp_promedio > temp_int:
+            print("   Se recomienda aumentar la capacidad del aire acondicionado o reducir la carga térmica.")
+        else:
+            print("   El aire acondicionado puede estar sobredimensionado para las condiciones del aula.")
+    else:
+        print("   La temperatura promedio se mantiene cerca de la temperatura deseada.")
+
+
+def draw_fitness(ax, result):
+    """Evolución del fitness."""
+    from matplotlib.ticker import MaxNLocator
+    from OptiluzDecimate import plot_decimated
+
+    history = result.fitness_history
+    plot_decimated(ax, range(len(history)), history, marker='o', linestyle='-', color='b')
+    ax.set_xlabel("Generaciones")
+    ax.set_ylabel("Fitness (Menor es Mejor)")
+    ax.set_title("Evolución de la Función de Fitness")
+    ax.grid(True)
+
+    # Añadir anotación del mejor valor
+    if history:
+        min_fitness = min(history)
+        min_gen = history.index(min_fitness)
+        ax.annotate(f'Mejor: {min_fitness:.4f}',
+                    xy=(min_gen, min_fitness),
+                    xytext=(min_gen + 2, min_fitness * 1.1),
+                    arrowprops=dict(facecolor='black', arrowstyle='->'),
+                    fontsize=10)
+    ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+
+def draw_comparison(ax, result):
+    """Barras de consumo energético antes y después de la optimización."""
+    consumo_antes = result.metrics['consumo_antes']
+    consumo_despues = result.metrics['consumo_despues']
+    valores = [consumo_antes, consumo_despues]
+    ahorro = consumo_antes - consumo_despues
+    porcentaje = (ahorro / consumo_antes) * 100 if consumo_antes > 0 else 0
+
+    bars = ax.bar(["Consumo Base", "Consumo Óptimo"], valores, color=['#FF6B6B', '#4ECDC4'])
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
+                f'{height:.1f} kWh', ha='center', va='bottom')
+
+    # Línea y anotación del ahorro
+    ax.axhline(y=consumo_despues, color='gray', linestyle='--', alpha=0.7)
+    ax.annotate(f'Ahorro: {ahorro:.1f} kWh ({porcentaje:.1f}%)',
+                xy=(0, consumo_despues + (ahorro / 2)),
+                xytext=(0.5, consumo_despues + (ahorro / 2) + 0.5),
+                arrowprops=dict(facecolor='black', arrowstyle='->'),
+                fontsize=10, ha='center')
+
+    ax.set_xlabel("Estado")
+    ax.set_ylabel("Consumo Energético (kWh)")
+    ax.set_title("Comparación de Consumo Energético")
+    ax.set_ylim(0, max(max(valores), 1) * 1.2)
+
+
+def draw_luminosidad(ax, result):
+    """Evolución de la potencia de iluminación recomendada."""
+    from OptiluzDecimate import plot_decimated
+
+    p_luz_vals = [sol['P_luz'] for sol in result.best_solution_history]
+    plot_decimated(ax, range(len(p_luz_vals)), p_luz_vals, marker='o', linestyle='-', color='orange')
+    ax.axhline(y=result.best_solution['P_luz'], color='red', linestyle='--',
+               label=f'Valor óptimo final: {result.best_solution["P_luz"]:.2f} W')
+
+    # Iluminación óptima teórica
+    data = result.input
+    P_luz_optimal = (data['lux'] * data['superficie']) / data['eficiencia']
+    ax.axhline(y=P_luz_optimal, color='green', linestyle=':',
+               label=f'Valor teórico óptimo: {P_luz_optimal:.2f} W')
+
+    ax.set_title("Evolución de la Potencia de Iluminación")
+    ax.set_xlabel("Generaciones")
+    ax.set_ylabel("Potencia de Iluminación (W)")
+    ax.legend()
+    ax.grid(True)
+
+
+def draw_temperatura(ax, result):
+    """Evolución del coeficiente U (aislamiento térmico)."""
+    from OptiluzDecimate import plot_decimated
+
+    u_vals = [sol['U'] for sol in result.best_solution_history]
+    plot_decimated(ax, range(len(u_vals)), u_vals, marker='o', linestyle='-', color='#5D5DFF')
+    ax.axhline(y=result.best_solution['U'], color='red', linestyle='--',
+               label=f'Valor óptimo final: {result.best_solution["U"]:.2f}')
+
+    ax.set_title("Evolución del Coeficiente de Transmisión Térmica (U)")
+    ax.set_xlabel("Generaciones")
+    ax.set_ylabel("Coeficiente U (menor es mejor)")
+    ax.legend()
+    ax.grid(True)
+
+
+def draw_espacio_persona(ax, result):
+    """Evolución del espacio por persona (m²/persona)."""
+    from OptiluzDecimate import plot_decimated
+
+    A = result.input['superficie']
+    espacios = []
+    generaciones = []
+    for i, sol in enumerate(result.best_solution_history):
+        n = sol['N_personas']
+        if n > 0:  # Evitar división por cero
+            espacios.append(A / n)
+            generaciones.append(i)
+    plot_decimated(ax, generaciones, espacios, marker='o', linestyle='-', color='#66BB6A')
+
+    n_final = result.best_solution['N_personas']
+    final_espacio = A / n_final if n_final > 0 else 0
+    ax.axhline(y=final_espacio, color='red', linestyle='--',
+               label=f'Valor óptimo final: {final_espacio:.2f} m²/persona')
+    ax.axhspan(1.5, 3.5, alpha=0.2, color='green', label='Zona óptima (1.5-3.5 m²/persona)')
+
+    ax.set_title("Evolución del Espacio por Persona")
+    ax.set_xlabel("Generaciones")
+    ax.set_ylabel("Espacio por Persona (m²/persona)")
+    ax.legend()
+    ax.grid(True)
+
+
+def draw_avg_temperature(ax, result):
+    """Evolución de la temperatura promedio del aula."""
+    from OptiluzDecimate import plot_decimated
+
+    temps = result.temperature_history
+    temp_int = result.input['temp_int']
+    plot_decimated(ax, range(len(temps)), temps, marker='o', linestyle='-', color='#FF7043')
+    if temps:
+        ax.axhline(y=temps[-1], color='red', linestyle='--',
+                   label=f'Temperatura final: {temps[-1]:.2f} °C')
+    ax.axhline(y=temp_int, color='blue', linestyle=':',
+               label=f'Temperatura deseada: {temp_int:.1f} °C')
+    # Zona de confort térmico (±2°C de la temperatura deseada)
+    ax.axhspan(temp_int - 2, temp_int + 2, alpha=0.2, color='green', label='Zona de confort (±2°C)')
+
+    ax.set_title("Evolución de la Temperatura Promedio del Aula")
+    ax.set_xlabel("Generaciones")
+    ax.set_ylabel("Temperatura (°C)")
+    ax.legend()
+    ax.grid(True)
+
+
+# Gráficas del reporte: (nombre, función, tamaño de la figura)
+PLOTS = (
+    ('fitness', draw_fitness, (10, 6)),
+    ('comparison', draw_comparison, (8, 6)),
+    ('luminosidad', draw_luminosidad, (10, 6)),
+    ('temperatura', draw_temperatura, (10, 6)),
+    ('espacio', draw_espacio_persona, (10, 6)),
+    ('temp_aula', draw_avg_temperature, (10, 6)),
+)
+
+
+def render_figures(result):
+    """Genera las figuras del reporte sin pyplot. Retorna {nombre: Figure}."""
+    from matplotlib.figure import Figure
+
+    figures = {}
+    for name, draw, size in PLOTS:
+        figure = Figure(figsize=size)
+        draw(figure.add_subplot(111), result)
+        figure.tight_layout()
+        figures[name] = figure
+    return figures
+
+
+def show_result(result):
+    """Muestra las gráficas del reporte en ventanas de pyplot, una tras otra."""
+    import matplotlib.pyplot as plt
+
+    for _, draw, size in PLOTS:
+        plt.figure(figsize=size)
+        draw(plt.gca(), result)
+        plt.tight_layout()
+        plt.show()
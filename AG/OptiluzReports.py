@@ -0,0 +1,137 @@
+"""
+Reportes de OptiLuz sin interfaz, en paralelo.
+
+Genera el reporte de cada aula (texto y las seis gráficas de
+OptiluzRenderer) directamente en archivos PNG, SVG o PDF con la API orientada
+a objetos de matplotlib (Figure + FigureCanvasAgg), sin pyplot ni su estado
+global. Cada proceso crea una sola vez las figuras de las gráficas
+(ReportTemplates) y las reutiliza para todas las aulas que le tocan, y los
+reportes de una flota se reparten entre un grupo de procesos.
+
+    results = [ga.run_evolution(display=False) for ga in modelos]
+    render_reports(results, "reportes", formats=("png", "pdf"))
+
+Cada aula queda en su propia carpeta:
+    reportes/<nombre>/reporte.txt
+    reportes/<nombre>/<gráfica>.png | .svg
+    reportes/<nombre>/reporte.pdf        (las seis gráficas, una por página)
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from OptiluzRenderer import PLOTS, print_report
+from OptiluzResult import RunResult
+
+FORMATS = ('png', 'svg', 'pdf')
+
+# Plantillas del proceso actual (se crean en el primer reporte de cada proceso)
+_templates = None
+
+
+class ReportTemplates:
+    """Una figura con su lienzo Agg por gráfica, reutilizada entre aulas."""
+
+    def __init__(self, dpi=100):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.dpi = dpi
+        self.figures = {}
+        for name, draw, size in PLOTS:
+            figure = Figure(figsize=size, dpi=dpi)
+            FigureCanvasAgg(figure)
+            figure.add_subplot(111)
+            self.figures[name] = (figure, draw)
+        self.rendered = 0
+
+    def draw(self, result):
+        """Dibuja las gráficas de un resultado sobre las figuras reutilizadas. Retorna {nombre: Figure}."""
+        figures = {}
+        for name, (figure, draw) in self.figures.items():
+            ax = figure.axes[0]
+            ax.clear()
+            draw(ax, result)
+            figure.tight_layout()
+            figures[name] = figure
+        self.rendered += 1
+        return figures
+
+
+def report_text(result, profile=None):
+    """Reporte de texto de print_report como cadena."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        print_report(result, profile)
+    return buffer.getvalue()
+
+
+def write_report(result, directory, formats=('png',), templates=None):
+    """Escribe el reporte de un resultado en directory. Retorna las rutas escritas."""
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown:
+        raise ValueError(f"Formato desconocido: {', '.join(unknown)} (use {', '.join(FORMATS)})")
+    templates = templates or ReportTemplates()
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(directory, 'reporte.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(report_text(result))
+    paths = [path]
+
+    figures = templates.draw(result)
+    for fmt in formats:
+        if fmt == 'pdf':
+            from matplotlib.backends.backend_pdf import PdfPages
+
+            path = os.path.join(directory, 'reporte.pdf')
+            with PdfPages(path) as pdf:
+                for figure in figures.values():
+                    pdf.savefig(figure)
+            paths.append(path)
+        else:
+            for name, figure in figures.items():
+                path = os.path.join(directory, f"{name}.{fmt}")
+                figure.savefig(path, format=fmt, dpi=templates.dpi)
+                paths.append(path)
+    return paths
+
+
+def _render_worker(result_dict, directory, formats, dpi):
+    """Escribe un reporte con las plantillas del proceso (en un proceso del grupo)."""
+    global _templates
+    if _templates is None or _templates.dpi != dpi:
+        _templates = ReportTemplates(dpi)
+    return write_report(RunResult.from_dict(result_dict), directory, formats, _templates)
+
+
+def render_reports(results, output_dir, formats=('png',), dpi=100, names=None, max_workers=None):
+    """
+    Escribe el reporte de cada resultado en output_dir/<nombre>, repartiendo
+    las aulas entre max_workers procesos (1 = en este proceso).
+
+    results: RunResult o diccionarios de RunResult.to_dict().
+    names: nombre de la carpeta de cada aula (por defecto aula_0000, aula_0001...).
+    Retorna {nombre: rutas escritas}.
+    """
+    results = [r.to_dict() if isinstance(r, RunResult) else r for r in results]
+    names = list(names) if names is not None else [f"aula_{i:04d}" for i in range(len(results))]
+    if len(names) != len(results):
+        raise ValueError("Debe haber un nombre por resultado")
+    directories = [os.path.join(output_dir, name) for name in names]
+    formats = tuple(formats)
+
+    workers = min(max_workers or os.cpu_count() or 1, max(1, len(results)))
+    if workers == 1:
+        templates = ReportTemplates(dpi)
+        written = [write_report(RunResult.from_dict(r), d, formats, templates)
+                   for r, d in zip(results, directories)]
+    else:
+        chunksize = max(1, len(results) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            written = list(executor.map(_render_worker, results, directories,
+                                        [formats] * len(results), [dpi] * len(results),
+                                        chunksize=chunksize))
+    return dict(zip(names, written))
@@ -0,0 +1,128 @@
+"""
+Resultado inmutable de una ejecución de OptiLuz.
+
+OptiluzGA.run_evolution devuelve un RunResult con la mejor solución, su
+fitness, los historiales por generación, las métricas derivadas y las
+estadísticas de la ejecución. El resultado no depende de matplotlib: la
+presentación (reporte y gráficas) se hace aparte con OptiluzRenderer, y la
+caché, el servicio HTTP y la exportación trabajan directamente sobre él.
+
+OptiluzGA.iter_generations entrega además un GenerationSnapshot por
+generación: un resumen ligero (sin la población) para seguir la evolución
+paso a paso.
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+
+def _freeze(value):
+    """Copia de solo lectura, también de los diccionarios y listas anidados."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    """Inverso de _freeze: diccionarios y listas normales (serializables en JSON)."""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class GenerationSnapshot:
+    """Estado de una ejecución al terminar de evaluar una generación."""
+    generation: int          # Generación evaluada (desde 1)
+    generations: int         # Presupuesto total de generaciones
+    best_fitness: float      # Mejor fitness de toda la ejecución
+    generation_best: float   # Mejor fitness de esta generación
+    mean_fitness: float
+    best_solution: dict
+    diversity: float         # Distancia media normalizada entre individuos
+    mutation_rate: float     # Tasa base de mutación vigente
+    evaluations: int
+    stalled: int             # Generaciones seguidas sin mejora
+    elapsed: float
+
+    def __post_init__(self):
+        object.__setattr__(self, 'best_solution', _freeze(self.best_solution))
+
+
+@dataclass(frozen=True)
+class RunResult:
+    input: dict
+    best_solution: dict
+    best_fitness: float
+    fitness_history: tuple = ()
+    best_solution_history: tuple = ()
+    temperature_history: tuple = ()
+    unmet_hours_history: tuple = ()
+    diversity_history: tuple = ()
+    metrics: dict = field(default_factory=dict)
+    run_stats: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        # Copias de solo lectura: el resultado no cambia aunque el GA siga evolucionando
+        set_ = object.__setattr__
+        set_(self, 'input', _freeze(self.input))
+        set_(self, 'best_solution', _freeze(self.best_solution))
+        set_(self, 'best_fitness', float(self.best_fitness))
+        set_(self, 'fitness_history', tuple(self.fitness_history))
+        set_(self, 'best_solution_history', tuple(_freeze(sol) for sol in self.best_solution_history))
+        set_(self, 'temperature_history', tuple(self.temperature_history))
+        set_(self, 'unmet_hours_history', tuple(self.unmet_hours_history))
+        set_(self, 'diversity_history', _freeze(self.diversity_history))
+        set_(self, 'metrics', _freeze(self.metrics))
+        set_(self, 'run_stats', _freeze(self.run_stats))
+
+    def __reduce__(self):
+        # MappingProxyType no se puede serializar con pickle (grupos de procesos)
+        return (self.__class__.from_dict, (self.to_dict(),))
+
+    @property
+    def generations(self):
+        return len(self.fitness_history)
+
+    @property
+    def ac_type(self):
+        return self.metrics.get('tipo_ac')
+
+    @property
+    def avg_temperature(self):
+        return self.metrics.get('temp_promedio')
+
+    def to_dict(self):
+        """Diccionario serializable en JSON."""
+        return {
+            'input': _thaw(self.input),
+            'best_solution': _thaw(self.best_solution),
+            'best_fitness': self.best_fitness,
+            'fitness_history': list(self.fitness_history),
+            'best_solution_history': _thaw(self.best_solution_history),
+            'temperature_history': list(self.temperature_history),
+            'unmet_hours_history': list(self.unmet_hours_history),
+            'diversity_history': _thaw(self.diversity_history),
+            'metrics': _thaw(self.metrics),
+            'run_stats': _thaw(self.run_stats),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruye un resultado guardado con to_dict."""
+        return cls(
+            input=data.get('input', {}),
+            best_solution=data['best_solution'],
+            best_fitness=data['best_fitness'],
+            fitness_history=data.get('fitness_history', ()),
+            best_solution_history=data.get('best_solution_history', ()),
+            temperature_history=data.get('temperature_history', ()),
+            unmet_hours_history=data.get('unmet_hours_history', ()),
+            diversity_history=data.get('diversity_history', ()),
+            metrics=data.get('metrics', {}),
+            run_stats=data.get('run_stats', {}),
+        )
@@ -0,0 +1,124 @@
+"""
+Objetivo robusto de OptiLuz frente a clima y ocupación inciertos.
+
+evaluate_individual califica cada candidato con una sola temp_ext y una sola
+carga; en aulas reales ambas varían y el BTU elegido resulta insuficiente en
+los días calurosos. RobustObjective evalúa cada candidato en S escenarios
+muestreados (temperatura exterior, ocupación y carga de equipos) con una sola
+operación sobre el arreglo (población x escenarios), aprovechando la difusión
+de los núcleos de OptiluzKernels.
+
+Los escenarios se sortean una vez por ejecución y se reutilizan en todas las
+generaciones (números aleatorios comunes), de modo que las diferencias de
+fitness entre generaciones se deben a los genes y no al muestreo. El
+resultado de cada candidato se resume como media, cuantil o CVaR.
+
+La ocupación se modela como un factor sobre el calor por persona
+(PERSON_FACTOR y CALOR_PERSONA): un aula al 80% de ocupación aporta el 80% del
+calor de sus N_personas.
+"""
+
+import math
+
+import numpy as np
+
+from OptiluzKernels import (BTU, N_PERSONAS, P_BTU_FACTOR, P_CALOR_PERSONA, P_CARGA,
+                            P_EQUIP_FACTOR, P_PERSON_FACTOR, P_SUPERFICIE, P_TEMP_EXT,
+                            evaluate_genes, temperature_genes)
+
+MEASURES = ('mean', 'quantile', 'cvar')
+
+
+class RobustObjective:
+    """
+    Fitness robusto sobre un conjunto fijo de escenarios.
+
+    scenarios: número de escenarios S.
+    measure: 'mean' (media), 'quantile' (cuantil level) o 'cvar' (media del
+        peor 1 - level de los escenarios).
+    temp_sd: desviación estándar de temp_ext (°C).
+    carga_cv: coeficiente de variación de la carga de equipos (lognormal, media 1).
+    ocupacion: rango (mínimo, máximo) del factor de ocupación.
+    """
+
+    def __init__(self, scenarios=64, measure='cvar', level=0.9, temp_sd=3.0,
+                 carga_cv=0.2, ocupacion=(0.6, 1.1), seed=None):
+        if measure not in MEASURES:
+            raise ValueError(f"Medida de riesgo desconocida: {measure!r} (use {', '.join(MEASURES)})")
+        if not 0 < level < 1:
+            raise ValueError("level debe estar entre 0 y 1")
+        self.scenarios = scenarios
+        self.measure = measure
+        self.level = level
+        self.temp_sd = temp_sd
+        self.carga_cv = carga_cv
+        self.ocupacion = ocupacion
+        self.seed = seed
+        self.params = None
+
+    def bind(self, params, rng=None):
+        """
+        Sortea los escenarios alrededor del vector de parámetros base. Se llama
+        una vez al inicio de cada ejecución; si se indicó seed, los escenarios
+        son siempre los mismos.
+        """
+        rng = np.random.default_rng(self.seed) if self.seed is not None or rng is None else rng
+        S = self.scenarios
+        scenario_params = np.repeat(np.asarray(params, dtype=float)[None, :], S, axis=0)
+
+        scenario_params[:, P_TEMP_EXT] += rng.normal(0.0, self.temp_sd, S)
+        sigma = math.sqrt(math.log(1 + self.carga_cv ** 2))
+        scenario_params[:, P_CARGA] *= rng.lognormal(-sigma ** 2 / 2, sigma, S)
+        factor = rng.uniform(self.ocupacion[0], self.ocupacion[1], S)
+        scenario_params[:, P_PERSON_FACTOR] *= factor
+        scenario_params[:, P_CALOR_PERSONA] *= factor
+
+        self.params = scenario_params
+        return scenario_params
+
+    def scenario_fitness(self, genes, evaluator=None):
+        """
+        Fitness de cada candidato en cada escenario: matriz (N, S). Con un
+        evaluador paralelo (OptiluzParallel.SharedMemoryEvaluator) cada
+        escenario se evalúa repartido entre sus procesos.
+        """
+        if self.params is None:
+            raise RuntimeError("Los escenarios no están sorteados (llame a bind)")
+        genes = np.asarray(genes, dtype=float)
+        if evaluator is not None:
+            return np.column_stack([evaluator.evaluate(genes, params) for params in self.params])
+        return evaluate_genes(genes[:, None, :], self.params[None, :, :])
+
+    def risk(self, values):
+        """Resume cada fila de una matriz (N, S) con la medida de riesgo."""
+        if self.measure == 'mean':
+            return values.mean(axis=1)
+        if self.measure == 'quantile':
+            return np.quantile(values, self.level, axis=1)
+        # CVaR: media de la cola con los peores escenarios
+        tail = max(1, int(math.ceil((1 - self.level) * values.shape[1])))
+        worst = np.partition(values, values.shape[1] - tail, axis=1)[:, -tail:]
+        return worst.mean(axis=1)
+
+    def evaluate(self, genes, evaluator=None):
+        """Fitness robusto (N,) de una matriz de genes."""
+        return self.risk(self.scenario_fitness(genes, evaluator))
+
+    def describe(self, genes):
+        """
+        Métricas robustas de un candidato (vector de genes): fitness medio y
+        de riesgo, probabilidad de BTU insuficiente y temperatura en el peor
+        escenario.
+        """
+        genes = np.asarray(genes, dtype=float)[None, :]
+        values = self.scenario_fitness(genes)
+        p = self.params
+        BTU_required = (p[:, P_SUPERFICIE] * p[:, P_BTU_FACTOR] + p[:, P_CARGA] * p[:, P_EQUIP_FACTOR]
+                        + genes[0, N_PERSONAS] * p[:, P_PERSON_FACTOR])
+        temps = temperature_genes(genes, p)
+        return {
+            'fitness_medio': float(values.mean()),
+            'fitness_riesgo': float(self.risk(values)[0]),
+            'prob_btu_insuficiente': float(np.mean(genes[0, BTU] < BTU_required)),
+            'temp_peor_escenario': float(temps.max()),
+        }
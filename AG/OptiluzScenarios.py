@@ -0,0 +1,266 @@
+"""
+Espacio de trabajo de escenarios para la interfaz de OptiLuz.
+
+Permite guardar copias del formulario de entrada como escenarios (por ejemplo
+"aula actual", "con aislamiento", "aula llena"), ejecutarlos a la vez en un
+grupo de procesos en segundo plano y compararlos lado a lado: una tabla con la
+mejor solución y las métricas de cada escenario y una gráfica con las curvas
+de fitness superpuestas.
+
+El hilo principal de Tk nunca espera a los procesos: los trabajos se envían
+al grupo y su estado se consulta periódicamente con after(), de modo que la
+ventana sigue respondiendo mientras se optimiza.
+"""
+
+import multiprocessing
+import os
+import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from tkinter import ttk, messagebox
+
+from OptiluzResult import RunResult
+
+POLL_MS = 150  # Intervalo de consulta de los trabajos en curso
+
+# Columnas de la tabla comparativa: (clave, encabezado, ancho)
+COLUMNS = (
+    ('estado', 'Estado', 90),
+    ('BTU', 'BTU', 80),
+    ('P_luz', 'P_luz (W)', 80),
+    ('U', 'U', 55),
+    ('N_personas', 'Personas', 65),
+    ('fitness', 'Fitness', 80),
+    ('consumo', 'Consumo (kWh)', 100),
+    ('ahorro', 'Ahorro (%)', 75),
+    ('tipo_ac', 'Tipo de AC', 140),
+    ('tiempo', 'Tiempo (s)', 75),
+)
+
+
+def _row_values(scenario):
+    """Valores de la fila de un escenario en la tabla comparativa."""
+    result = scenario['result']
+    values = {key: '' for key, _, _ in COLUMNS}
+    values['estado'] = scenario['status']
+    if result is not None:
+        sol, metrics = result.best_solution, result.metrics
+        values.update({
+            'BTU': f"{sol['BTU']:.0f}",
+            'P_luz': f"{sol['P_luz']:.0f}",
+            'U': f"{sol['U']:.2f}",
+            'N_personas': f"{sol['N_personas']:.0f}",
+            'fitness': f"{result.best_fitness:.2f}",
+            'consumo': f"{metrics['consumo_despues']:.1f}",
+            'ahorro': f"{metrics['ahorro_pct']:.1f}",
+            'tipo_ac': metrics['tipo_ac'],
+            'tiempo': f"{result.run_stats.get('elapsed', 0.0):.1f}",
+        })
+    return [values[key] for key, _, _ in COLUMNS]
+
+
+class ScenarioWorkspace(ttk.Frame):
+    """
+    Pestaña de escenarios. gui es la ventana principal (OptiluzGUI), de la
+    que se leen el formulario, los hiperparámetros y donde se muestra el
+    detalle de un escenario.
+    """
+
+    def __init__(self, master, gui, max_workers=None):
+        super().__init__(master)
+        self.gui = gui
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = None
+        self.scenarios = {}     # iid de la tabla -> escenario
+        self.counter = 0
+        self.polling = False
+        self.create_widgets()
+
+    def create_widgets(self):
+        # Controles para agregar y ejecutar escenarios
+        controls = ttk.Frame(self)
+        controls.pack(fill="x", padx=5, pady=5)
+
+        ttk.Label(controls, text="Nombre:").pack(side="left", padx=(0, 5))
+        self.name_var = tk.StringVar()
+        ttk.Entry(controls, textvariable=self.name_var, width=25).pack(side="left", padx=5)
+        ttk.Button(controls, text="Agregar desde Formulario",
+                   command=self.add_scenario).pack(side="left", padx=5)
+        ttk.Button(controls, text="Quitar", command=self.remove_selected).pack(side="left", padx=5)
+        ttk.Button(controls, text="Ejecutar Escenarios",
+                   command=self.run_scenarios).pack(side="right", padx=5)
+        ttk.Button(controls, text="Cancelar", command=self.cancel).pack(side="right", padx=5)
+
+        # Tabla comparativa: una fila por escenario
+        table_frame = ttk.LabelFrame(self, text="Comparación de Escenarios")
+        table_frame.pack(fill="x", padx=5, pady=5)
+        self.table = ttk.Treeview(table_frame, columns=[key for key, _, _ in COLUMNS], height=6)
+        self.table.heading('#0', text='Escenario')
+        self.table.column('#0', width=150)
+        for key, heading, width in COLUMNS:
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, anchor="e")
+        self.table.pack(fill="x", padx=5, pady=5)
+        self.table.bind("<Double-1>", self.show_selected)
+
+        # Curvas de fitness superpuestas; la figura se crea al mostrar la pestaña
+        self.plot_frame = ttk.LabelFrame(self, text="Evolución del Fitness por Escenario")
+        self.plot_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.figure = None
+        self.plot_frame.bind("<Map>", lambda event: self.figure is None and self.draw_curves())
+
+    def create_plot(self):
+        """Crea la figura (matplotlib se importa aquí y no al abrir la aplicación)."""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.figure = Figure(figsize=(8, 4))
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, self.plot_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    # ---- Gestión de escenarios ----
+    def add_scenario(self):
+        """Guarda una copia del formulario actual como escenario pendiente."""
+        if not self.gui.validate_inputs():
+            return
+        data, pop_size, generations, mutation_rate = self.gui.read_form()
+        self.counter += 1
+        name = self.name_var.get().strip() or f"Escenario {self.counter}"
+        run_params = dict(self.gui.run_params, generations=generations, mutation_rate=mutation_rate)
+        scenario = {
+            'name': name,
+            'input': data.to_dict(),
+            'pop_size': pop_size,
+            'run_params': run_params,
+            'status': 'Pendiente',
+            'future': None,
+            'result': None,
+        }
+        iid = self.table.insert('', tk.END, text=name)
+        self.scenarios[iid] = scenario
+        self.refresh_row(iid)
+        self.name_var.set('')
+
+    def remove_selected(self):
+        for iid in self.table.selection():
+            future = self.scenarios[iid]['future']
+            if future is not None and not future.done():
+                future.cancel()
+            del self.scenarios[iid]
+            self.table.delete(iid)
+        if self.figure is not None:  # Sin figura aún: se dibuja al mostrar la pestaña
+            self.draw_curves()
+
+    def refresh_row(self, iid):
+        self.table.item(iid, values=_row_values(self.scenarios[iid]))
+
+    # ---- Ejecución en segundo plano ----
+    def get_executor(self):
+        """
+        Grupo de procesos creado al primer uso. Se usa 'spawn' para que los
+        procesos no hereden el estado de Tk del proceso principal.
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+        return self.executor
+
+    def run_scenarios(self):
+        """Envía al grupo de procesos los escenarios pendientes o con error."""
+        pending = [iid for iid, s in self.scenarios.items() if s['status'] in ('Pendiente', 'Error', 'Cancelado')]
+        if not pending:
+            messagebox.showinfo("Escenarios", "No hay escenarios pendientes de ejecutar.")
+            return
+        from OptiluzMultiStart import run_seed
+
+        executor = self.get_executor()
+        for iid in pending:
+            scenario = self.scenarios[iid]
+            scenario['future'] = executor.submit(
+                run_seed, scenario['input'], scenario['pop_size'], None, scenario['run_params'])
+            scenario['status'] = 'En cola'
+            scenario['result'] = None
+            self.refresh_row(iid)
+        if not self.polling:
+            self.polling = True
+            self.after(POLL_MS, self.poll)
+
+    def poll(self):
+        """Revisa los trabajos sin bloquear y actualiza la tabla y la gráfica."""
+        finished = False
+        running = False
+        for iid, scenario in self.scenarios.items():
+            future = scenario['future']
+            if future is None or scenario['status'] not in ('En cola', 'Ejecutando'):
+                continue
+            if not future.done():
+                running = True
+                if future.running() and scenario['status'] != 'Ejecutando':
+                    scenario['status'] = 'Ejecutando'
+                    self.refresh_row(iid)
+                continue
+            if future.cancelled():
+                scenario['status'] = 'Cancelado'
+            else:
+                try:
+                    scenario['result'] = RunResult.from_dict(future.result())
+                    scenario['status'] = 'Terminado'
+                except Exception as e:
+                    scenario['status'] = 'Error'
+                    print(f"Error en el escenario '{scenario['name']}': {e}")
+            finished = True
+            self.refresh_row(iid)
+        if finished and self.figure is not None:
+            self.draw_curves()
+        if running:
+            self.after(POLL_MS, self.poll)
+        else:
+            self.polling = False
+
+    def cancel(self):
+        """Cancela los escenarios que aún no han empezado."""
+        for scenario in self.scenarios.values():
+            future = scenario['future']
+            if future is not None and scenario['status'] == 'En cola':
+                future.cancel()
+
+    def shutdown(self):
+        """Detiene el grupo de procesos (al cerrar la ventana)."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    # ---- Resultados ----
+    def draw_curves(self):
+        """Vuelve a dibujar las curvas de fitness de los escenarios terminados."""
+        from OptiluzDecimate import plot_decimated
+
+        if self.figure is None:
+            self.create_plot()
+        ax = self.ax
+        ax.clear()
+        ax.set_title("Evolución de la Función de Fitness")
+        ax.set_xlabel("Generaciones")
+        ax.set_ylabel("Fitness (Menor es Mejor)")
+        ax.grid(True)
+        drawn = False
+        for scenario in self.scenarios.values():
+            result = scenario['result']
+            if result is None:
+                continue
+            history = result.fitness_history
+            plot_decimated(ax, range(len(history)), history, label=scenario['name'])
+            drawn = True
+        if drawn:
+            ax.legend()
+        self.canvas.draw_idle()
+
+    def show_selected(self, event=None):
+        """Muestra el detalle del escenario seleccionado en la pestaña de resultados."""
+        selection = self.table.selection()
+        if not selection:
+            return
+        result = self.scenarios[selection[0]]['result']
+        if result is None:
+            return
+        self.gui.show_result(result)
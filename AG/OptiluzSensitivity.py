@@ -0,0 +1,307 @@
+"""
+Análisis de sensibilidad global de los resultados óptimos de OptiLuz.
+
+Determina qué datos del aula (superficie, ventanas, carga, temp_ext,
+eficiencia...) explican la variación del BTU óptimo, del fitness alcanzado y
+del resto de genes. Sigue el esquema de Saltelli: dos matrices A y B de
+muestras cuasi-aleatorias (secuencia de Sobol) y, para cada entrada i, la
+matriz A con la columna i tomada de B. Cada muestra es un aula distinta que se
+optimiza con OptiluzBatchGA, de modo que las n·(d+2) optimizaciones se
+resuelven por bloques vectorizados.
+
+Cada salida es el resultado de una optimización estocástica. Para que el azar
+del optimizador no domine los estimadores, la fila j de A, de B y de cada AB_i
+se optimiza con los mismos números aleatorios (números aleatorios comunes,
+OptiluzBatchGA con streams). El ruido que queda se estima optimizando otra
+vez la matriz A con otra semilla y se reporta como fracción de la varianza
+de cada salida; si supera NOISE_WARNING los índices de esa salida no son
+fiables y conviene aumentar las generaciones o la población.
+
+Se reportan los índices de primer orden (Saltelli 2010) y totales (Jansen)
+con intervalos de confianza por remuestreo (bootstrap).
+
+Uso:
+    python OptiluzSensitivity.py --muestras 512
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from OptiluzBatchGA import OptiluzBatchGA
+from OptiluzKernels import GENES, PARAM_NAMES, make_params
+
+# Rango de variación de cada entrada estudiada (nombres de PARAM_NAMES)
+SENSITIVITY_RANGES = {
+    'superficie': (20.0, 150.0),
+    'ventanas': (0.0, 10.0),
+    'carga': (1000.0, 10000.0),
+    'lux': (200.0, 600.0),
+    'eficiencia': (60.0, 150.0),
+    'temp_ext': (25.0, 40.0),
+    'temp_int': (20.0, 26.0),
+}
+
+OUTPUTS = ('best_fitness',) + GENES + ('temperature',)
+
+# Generaciones por optimización: con menos, el azar del optimizador pesa en los genes óptimos
+SENSITIVITY_GENERATIONS = 150
+
+# Fracción de la varianza de una salida atribuible al optimizador a partir de la cual se advierte
+NOISE_WARNING = 0.1
+
+# Números de dirección de Sobol (Joe y Kuo): (grado s, coeficientes a, valores m iniciales)
+# para las dimensiones 2 en adelante; la dimensión 1 es la secuencia de van der Corput.
+SOBOL_DIRECTIONS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+)
+SOBOL_BITS = 32
+
+
+def _direction_numbers(dim):
+    """Números de dirección (enteros de SOBOL_BITS bits) de una dimensión."""
+    v = np.zeros(SOBOL_BITS, dtype=np.uint64)
+    if dim == 0:
+        for k in range(SOBOL_BITS):
+            v[k] = 1 << (SOBOL_BITS - 1 - k)
+        return v
+    s, a, m = SOBOL_DIRECTIONS[dim - 1]
+    for k in range(SOBOL_BITS):
+        if k < s:
+            v[k] = m[k] << (SOBOL_BITS - 1 - k)
+        else:
+            value = int(v[k - s]) ^ (int(v[k - s]) >> s)
+            for l in range(1, s):
+                if (a >> (s - 1 - l)) & 1:
+                    value ^= int(v[k - l])
+            v[k] = value
+    return v
+
+
+def sobol_sequence(n, d, seed=None, skip=1):
+    """
+    n puntos de la secuencia de Sobol en [0, 1)^d, con desplazamiento digital
+    aleatorio si se indica seed (distintas semillas dan secuencias
+    independientes con la misma uniformidad). Se omite el primer punto (origen).
+    """
+    if d > len(SOBOL_DIRECTIONS) + 1:
+        raise ValueError(f"La secuencia de Sobol admite hasta {len(SOBOL_DIRECTIONS) + 1} dimensiones")
+    index = np.arange(skip, skip + n, dtype=np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    points = np.zeros((n, d), dtype=np.uint64)
+    for j in range(d):
+        v = _direction_numbers(j)
+        for k in range(SOBOL_BITS):
+            bit = (gray >> np.uint64(k)) & np.uint64(1)
+            points[:, j] ^= bit * v[k]
+    if seed is not None:
+        shift = np.random.default_rng(seed).integers(0, 1 << SOBOL_BITS, size=d, dtype=np.uint64)
+        points ^= shift
+    return points.astype(float) / float(1 << SOBOL_BITS)
+
+
+def saltelli_sample(n, ranges, seed=None):
+    """Matrices A y B (n x d) escaladas a los rangos de cada entrada."""
+    names = list(ranges)
+    d = len(names)
+    unit = sobol_sequence(n, 2 * d, seed=seed)
+    low = np.array([ranges[name][0] for name in names])
+    high = np.array([ranges[name][1] for name in names])
+    A = low + unit[:, :d] * (high - low)
+    B = low + unit[:, d:] * (high - low)
+    return A, B
+
+
+def sample_params(base_params, names, X):
+    """Matriz de parámetros del núcleo: base_params con las columnas estudiadas tomadas de X."""
+    params = np.repeat(np.asarray(base_params, dtype=float)[None, :], len(X), axis=0)
+    for j, name in enumerate(names):
+        params[:, PARAM_NAMES.index(name)] = X[:, j]
+    return params
+
+
+def sobol_indices(fA, fB, fAB):
+    """
+    Índices de primer orden (Saltelli 2010, con fB centrado para reducir la
+    varianza del estimador cuando la salida tiene una media grande) y
+    totales (Jansen). fA, fB: (n,); fAB: (d, n). Retorna (S1, ST) de forma (d,).
+    """
+    variance = np.var(np.concatenate([fA, fB]))
+    if variance <= 0:
+        return np.zeros(len(fAB)), np.zeros(len(fAB))
+    S1 = np.mean((fB - fB.mean()) * (fAB - fA), axis=1) / variance
+    ST = 0.5 * np.mean((fA - fAB) ** 2, axis=1) / variance
+    return S1, ST
+
+
+def bootstrap_indices(fA, fB, fAB, n_bootstrap=200, confidence=0.95, rng=None):
+    """Intervalos de confianza percentiles de S1 y ST. Retorna (S1_ci, ST_ci) de forma (d, 2)."""
+    rng = rng or np.random.default_rng()
+    n = len(fA)
+    idx = rng.integers(0, n, size=(n_bootstrap, n))
+    S1 = np.empty((n_bootstrap, len(fAB)))
+    ST = np.empty_like(S1)
+    for b in range(n_bootstrap):
+        S1[b], ST[b] = sobol_indices(fA[idx[b]], fB[idx[b]], fAB[:, idx[b]])
+    tail = (1 - confidence) / 2 * 100
+    q = [tail, 100 - tail]
+    return np.percentile(S1, q, axis=0).T, np.percentile(ST, q, axis=0).T
+
+
+class SensitivityResult:
+    """Índices de Sobol de cada salida respecto a cada entrada."""
+
+    def __init__(self, names, indices, samples, evaluations, elapsed, noise=None):
+        self.names = names
+        self.indices = indices      # {salida: {entrada: {'S1', 'S1_ci', 'ST', 'ST_ci'}}}
+        self.noise = noise or {}    # {salida: varianza del optimizador / varianza total}
+        self.samples = samples
+        self.evaluations = evaluations
+        self.elapsed = elapsed
+
+    def ranking(self, output='BTU'):
+        """Entradas ordenadas por índice total (de mayor a menor influencia)."""
+        return sorted(self.names, key=lambda name: -self.indices[output][name]['ST'])
+
+    def report(self, outputs=('best_fitness', 'BTU')):
+        lines = [f"Optimizaciones: {self.samples} | Evaluaciones: {self.evaluations} | "
+                 f"Tiempo: {self.elapsed:.1f} s"]
+        for output in outputs:
+            lines.append(f"\n{output}:")
+            if output in self.noise:
+                noise = self.noise[output]
+                lines.append(f"  Ruido del optimizador: {noise * 100:.1f}% de la varianza")
+                if noise > NOISE_WARNING:
+                    lines.append("  AVISO: el ruido del optimizador domina esta salida; "
+                                 "aumente las generaciones o la población")
+            lines.append(f"  {'Entrada':<12} {'S1':>7} {'IC S1':>17} {'ST':>7} {'IC ST':>17}")
+            for name in self.ranking(output):
+                i = self.indices[output][name]
+                lines.append(f"  {name:<12} {i['S1']:7.3f} [{i['S1_ci'][0]:6.3f}, {i['S1_ci'][1]:6.3f}] "
+                             f"{i['ST']:7.3f} [{i['ST_ci'][0]:6.3f}, {i['ST_ci'][1]:6.3f}]")
+        return "\n".join(lines)
+
+
+def optimize_batch(params, pop_size=20, generations=SENSITIVITY_GENERATIONS, seed=None, chunk_size=8192,
+                   group_size=None, **run_params):
+    """
+    Optimiza cada fila de params con OptiluzBatchGA por bloques. Retorna {salida: (R,)} y las evaluaciones.
+
+    group_size: si se indica, cada grupo de group_size filas consecutivas usa
+        los mismos números aleatorios; los bloques nunca parten un grupo.
+    """
+    rng = np.random.default_rng(seed)
+    if group_size:
+        chunk_size = max(group_size, chunk_size // group_size * group_size)
+    outputs = {name: np.empty(len(params)) for name in OUTPUTS}
+    evaluations = 0
+    for start in range(0, len(params), chunk_size):
+        block = params[start:start + chunk_size]
+        streams = np.arange(len(block)) // group_size if group_size else None
+        ga = OptiluzBatchGA(block, pop_size=pop_size, seed=rng.integers(1 << 32), streams=streams)
+        result = ga.run(generations=generations, **run_params)
+        stop = start + len(block)
+        outputs['best_fitness'][start:stop] = result['best_fitness']
+        outputs['temperature'][start:stop] = result['temperature']
+        for j, gene in enumerate(GENES):
+            outputs[gene][start:stop] = result['best_genes'][:, j]
+        evaluations += result['evaluations']
+    return outputs, evaluations
+
+
+def sobol_analysis(base_input, n=512, ranges=None, pop_size=20, generations=SENSITIVITY_GENERATIONS, seed=None,
+                   n_bootstrap=200, confidence=0.95, chunk_size=8192, **run_params):
+    """
+    Análisis de Sobol de las salidas óptimas respecto a las entradas de ranges.
+
+    base_input: OptiluzInput con los valores de las entradas no estudiadas.
+    n: muestras base (se optimizan n·(d+3) aulas, incluida la réplica de A
+        que mide el ruido del optimizador; conviene una potencia de 2).
+    """
+    from OptiluzGA import OptiluzGA
+
+    ranges = dict(ranges or SENSITIVITY_RANGES)
+    names = list(ranges)
+    unknown = [name for name in names if name not in PARAM_NAMES]
+    if unknown:
+        raise ValueError(f"Entradas desconocidas: {', '.join(unknown)}")
+    d = len(names)
+    start = time.perf_counter()
+    run_seed, noise_seed, bootstrap_seed = np.random.SeedSequence(seed).spawn(3)
+
+    base_params = make_params(base_input, OptiluzGA(base_input))
+    A, B = saltelli_sample(n, ranges, seed=seed)
+    blocks = [A, B]
+    for i in range(d):
+        AB = A.copy()
+        AB[:, i] = B[:, i]
+        blocks.append(AB)
+    # Filas agrupadas por muestra (A_j, B_j, AB_1j...): cada grupo comparte los números aleatorios
+    samples = np.stack(blocks, axis=1).reshape(n * (d + 2), d)
+    params = sample_params(base_params, names, samples)
+
+    outputs, evaluations = optimize_batch(params, pop_size=pop_size, generations=generations,
+                                          seed=run_seed, chunk_size=chunk_size, group_size=d + 2,
+                                          **run_params)
+    # Réplica de A con otros números aleatorios: mide la varianza del optimizador
+    replica, replica_evaluations = optimize_batch(
+        sample_params(base_params, names, A), pop_size=pop_size, generations=generations,
+        seed=noise_seed, chunk_size=chunk_size, **run_params)
+    evaluations += replica_evaluations
+
+    rng = np.random.default_rng(bootstrap_seed)
+    indices = {}
+    noise = {}
+    for output, values in outputs.items():
+        values = values.reshape(n, d + 2).T
+        fA, fB, fAB = values[0], values[1], values[2:]
+        variance = np.var(np.concatenate([fA, fB]))
+        noise[output] = float(0.5 * np.mean((fA - replica[output]) ** 2) / variance) if variance > 0 else 0.0
+        S1, ST = sobol_indices(fA, fB, fAB)
+        S1_ci, ST_ci = bootstrap_indices(fA, fB, fAB, n_bootstrap, confidence, rng)
+        indices[output] = {
+            name: {'S1': float(S1[i]), 'S1_ci': tuple(S1_ci[i]),
+                   'ST': float(ST[i]), 'ST_ci': tuple(ST_ci[i])}
+            for i, name in enumerate(names)
+        }
+    return SensitivityResult(names, indices, len(params) + n, evaluations,
+                             time.perf_counter() - start, noise)
+
+
+def main():
+    from OptiluzInput import OptiluzInput
+
+    parser = argparse.ArgumentParser(description="Análisis de sensibilidad de OptiLuz (Sobol)")
+    parser.add_argument("--muestras", type=int, default=512, help="Muestras base (potencia de 2)")
+    parser.add_argument("--poblacion", type=int, default=20)
+    parser.add_argument("--generaciones", type=int, default=SENSITIVITY_GENERATIONS)
+    parser.add_argument("--bootstrap", type=int, default=200)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    base = OptiluzInput(superficie=50, ventanas=4, coeficiente=1.2, temp_ext=30, temp_int=22,
+                        humedad=60, carga=5000, lux=300, tipo_iluminacion="LED", eficiencia=100,
+                        lamparas=10, potencia_lampara=20, alpha=0.8, beta=0.2)
+    result = sobol_analysis(base, n=args.muestras, pop_size=args.poblacion,
+                            generations=args.generaciones, seed=args.semilla,
+                            n_bootstrap=args.bootstrap)
+    print(result.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+"""
+Servicio local de optimización OptiLuz (HTTP/JSON).
+
+Permite que otras herramientas envíen trabajos de optimización sin pasar por
+la interfaz gráfica. Cada trabajo es el resultado de OptiluzInput.to_dict()
+más los parámetros del algoritmo genético; los trabajos se encolan y se
+ejecutan en un grupo acotado de procesos. Los trabajos terminados se
+conservan durante JOB_TTL segundos (y como máximo MAX_FINISHED_JOBS).
+
+El servicio no abre rutas arbitrarias del equipo: el campo 'perfil' de los
+datos de entrada solo se acepta si se inició con --perfiles-dir, y debe ser
+el nombre de un archivo dentro de ese directorio.
+
+Rutas disponibles:
+    POST   /jobs              Encola un trabajo {"input": {...}, "params": {...}}
+    GET    /jobs              Lista los trabajos y su estado
+    GET    /jobs/<id>         Estado de un trabajo
+    GET    /jobs/<id>/result  Resultado de un trabajo terminado
+    DELETE /jobs/<id>         Cancela un trabajo
+    GET    /metrics           Profundidad de la cola, rendimiento y duraciones
+    GET    /health            Comprobación de vida
+
+Uso:
+    python OptiluzService.py --port 8765 --workers 4 --perfiles-dir perfiles
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("OptiLuz.Service")
+
+# Parámetros del algoritmo aceptados en un trabajo y sus valores por defecto
+GA_PARAMS = {
+    'pop_size': 20,
+    'generations': 50,
+    'mutation_rate': 0.1,
+    'crossover_rate': 0.9,
+    'tournament_size': 3,
+    'elitism': 2,
+}
+
+# Ventana (segundos) usada para medir el rendimiento reciente
+THROUGHPUT_WINDOW = 60.0
+
+# Conservación de los trabajos terminados (consultables hasta que expiran)
+JOB_TTL = 3600.0
+MAX_FINISHED_JOBS = 1000
+
+# Cachés de resultados abiertas en cada proceso del grupo (por directorio)
+_worker_caches = {}
+
+
+class QueueFullError(Exception):
+    """La cola de trabajos alcanzó su capacidad máxima."""
+
+
+def normalize_params(params):
+    """Valida los parámetros del algoritmo y completa los valores por defecto."""
+    params = dict(params or {})
+    unknown = set(params) - set(GA_PARAMS)
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(sorted(unknown))}")
+    normalized = {}
+    for key, default in GA_PARAMS.items():
+        value = type(default)(params.get(key, default))
+        if value <= 0 and key != 'elitism':
+            raise ValueError(f"El parámetro '{key}' debe ser positivo")
+        normalized[key] = value
+    if not 0 <= normalized['elitism'] < normalized['pop_size']:
+        raise ValueError("El parámetro 'elitism' debe estar entre 0 y pop_size - 1")
+    return normalized
+
+
+def resolve_profile(name, profile_dir):
+    """
+    Ruta del perfil horario pedido por un cliente. Solo se aceptan nombres de
+    archivos existentes dentro de profile_dir; sin profile_dir se rechaza.
+    """
+    if profile_dir is None:
+        raise ValueError("Este servicio no acepta perfiles horarios ('perfil')")
+    if not isinstance(name, str):
+        raise ValueError("'perfil' debe ser el nombre de un archivo")
+    base = os.path.realpath(profile_dir)
+    path = os.path.realpath(os.path.join(base, name))
+    if os.path.dirname(path) != base or not os.path.isfile(path):
+        raise ValueError(f"Perfil no disponible: {name}")
+    return path
+
+
+def run_job(input_dict, params, cache_dir=None):
+    """
+    Ejecuta una optimización sin interfaz gráfica (en un proceso del grupo).
+    Si se indica cache_dir, los resultados se reutilizan entre trabajos
+    idénticos. Retorna un diccionario serializable en JSON.
+    """
+    from OptiluzGA import OptiluzGA
+    from OptiluzInput import OptiluzInput
+
+    data = OptiluzInput.from_dict(input_dict)
+    ga = OptiluzGA(data, pop_size=params['pop_size'])
+    run_params = {key: value for key, value in params.items() if key != 'pop_size'}
+    cached = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        if cache_dir is not None:
+            from OptiluzCache import ResultCache, run_cached
+            if cache_dir not in _worker_caches:
+                _worker_caches[cache_dir] = ResultCache(cache_dir)
+            cached = run_cached(ga, _worker_caches[cache_dir], display=False, **run_params)
+        else:
+            ga.run_evolution(display=False, **run_params)
+    result = ga.result
+    return {
+        'cached': cached,
+        'best_solution': dict(result.best_solution),
+        'best_fitness': result.best_fitness,
+        'ac_type': result.ac_type,
+        'avg_temperature': result.avg_temperature,
+        'metrics': dict(result.metrics),
+        'fitness_history': list(result.fitness_history),
+        'temperature_history': list(result.temperature_history),
+        'run_stats': dict(result.run_stats),
+    }
+
+
+class JobManager:
+    """Cola de trabajos respaldada por un grupo acotado de procesos."""
+
+    def __init__(self, max_workers=None, max_queue=100, cache_dir=None, profile_dir=None,
+                 job_ttl=JOB_TTL, max_finished=MAX_FINISHED_JOBS):
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.cache_dir = cache_dir
+        self.profile_dir = profile_dir
+        self.max_workers = self.executor._max_workers
+        self.max_queue = max_queue
+        self.job_ttl = job_ttl
+        self.max_finished = max_finished
+        self.jobs = {}
+        self.lock = threading.RLock()
+        self.started_at = time.time()
+        self.completed_times = deque()
+        self.durations = deque(maxlen=1000)
+        self.counters = {'submitted': 0, 'done': 0, 'failed': 0, 'cancelled': 0}
+
+    # ------------------------------------------------------------------
+    # Estado de los trabajos
+    # ------------------------------------------------------------------
+    def _status(self, job):
+        if job['cancelled']:
+            return 'cancelled'
+        future = job['future']
+        if future.done():
+            return 'failed' if future.exception() is not None else 'done'
+        if future.running():
+            return 'running'
+        return 'queued'
+
+    def _pending(self):
+        return sum(1 for job in self.jobs.values() if self._status(job) == 'queued')
+
+    def _prune(self, now=None):
+        """Olvida los trabajos terminados hace más de job_ttl y los más antiguos sobre max_finished."""
+        now = now or time.time()
+        with self.lock:
+            finished = sorted((job['finished'], job_id) for job_id, job in self.jobs.items()
+                              if job['finished'] is not None and job['future'].done())
+            excess = len(finished) - self.max_finished
+            for i, (finished_at, job_id) in enumerate(finished):
+                if i < excess or now - finished_at > self.job_ttl:
+                    del self.jobs[job_id]
+
+    def _on_done(self, job_id, future):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job['finished'] = time.time()
+            if job['cancelled'] or future.cancelled():
+                return
+            if future.exception() is not None:
+                self.counters['failed'] += 1
+                logger.error(f"Trabajo {job_id} fallido: {future.exception()}")
+            else:
+                self.counters['done'] += 1
+                self.completed_times.append(job['finished'])
+                self.durations.append(job['finished'] - job['submitted'])
+
+    # ------------------------------------------------------------------
+    # Operaciones
+    # ------------------------------------------------------------------
+    def submit(self, payload):
+        """Valida y encola un trabajo. Retorna el identificador asignado."""
+        if not isinstance(payload, dict) or not isinstance(payload.get('input'), dict):
+            raise ValueError("El trabajo debe incluir un objeto 'input'")
+        params = normalize_params(payload.get('params'))
+
+        # Validar los datos de entrada antes de encolar (el perfil, solo dentro de profile_dir)
+        from OptiluzInput import OptiluzInput
+        input_dict = dict(payload['input'])
+        if input_dict.get('perfil'):
+            input_dict['perfil'] = resolve_profile(input_dict['perfil'], self.profile_dir)
+        input_dict = OptiluzInput.from_dict(input_dict).to_dict()
+
+        self._prune()
+        with self.lock:
+            if self._pending() >= self.max_queue:
+                raise QueueFullError("La cola de trabajos está llena")
+            job_id = uuid.uuid4().hex
+            future = self.executor.submit(run_job, input_dict, params, self.cache_dir)
+            self.jobs[job_id] = {
+                'id': job_id,
+                'params': params,
+                'submitted': time.time(),
+                'finished': None,
+                'cancelled': False,
+                'future': future,
+            }
+            self.counters['submitted'] += 1
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        return job_id
+
+    def describe(self, job_id):
+        """Información pública de un trabajo, o None si no existe."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            info = {
+                'id': job_id,
+                'status': self._status(job),
+                'params': job['params'],
+                'submitted': job['submitted'],
+                'finished': job['finished'],
+            }
+            if info['status'] == 'failed':
+                info['error'] = str(job['future'].exception())
+            return info
+
+    def list_jobs(self):
+        self._prune()
+        with self.lock:
+            jobs = [self.describe(job_id) for job_id in list(self.jobs)]
+        return [info for info in jobs if info is not None]
+
+    def result(self, job_id):
+        """Retorna (estado, resultado); el resultado es None si no terminó correctamente."""
+        # El trabajo y su future se leen juntos: _prune puede olvidarlo después
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None, None
+            status = self._status(job)
+            future = job['future']
+        if status != 'done':
+            return status, None
+        return 'done', future.result()
+
+    def cancel(self, job_id):
+        """
+        Cancela un trabajo. Los trabajos en cola se retiran del grupo; los que
+        ya se están ejecutando terminan en segundo plano pero su resultado se
+        descarta. Retorna el estado final o None si el trabajo no existe.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            status = self._status(job)
+            if status in ('done', 'failed', 'cancelled'):
+                return status
+            job['future'].cancel()
+            job['cancelled'] = True
+            job['finished'] = time.time()
+            self.counters['cancelled'] += 1
+            return 'cancelled'
+
+    def metrics(self):
+        """Profundidad de la cola, trabajos activos y rendimiento."""
+        now = time.time()
+        self._prune(now)
+        with self.lock:
+            while self.completed_times and now - self.completed_times[0] > THROUGHPUT_WINDOW:
+                self.completed_times.popleft()
+            statuses = [self._status(job) for job in self.jobs.values()]
+            durations = list(self.durations)
+            uptime = now - self.started_at
+            return {
+                'workers': self.max_workers,
+                'queue_depth': statuses.count('queued'),
+                'running': statuses.count('running'),
+                'tracked_jobs': len(statuses),
+                'max_queue': self.max_queue,
+                **self.counters,
+                'throughput_per_min': len(self.completed_times) * 60.0 / min(THROUGHPUT_WINDOW, max(uptime, 1e-9)),
+                'avg_duration': sum(durations) / len(durations) if durations else 0.0,
+                'uptime': uptime,
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class OptiluzRequestHandler(BaseHTTPRequestHandler):
+    """Manejador HTTP de la API JSON del servicio."""
+
+    server_version = "OptiLuz/1.0"
+
+    @property
+    def manager(self):
+        return self.server.manager
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _parts(self):
+        return [part for part in self.path.split('?', 1)[0].split('/') if part]
+
+    def do_GET(self):
+        parts = self._parts()
+        if parts == ['health']:
+            return self._send(200, {'status': 'ok'})
+        if parts == ['metrics']:
+            return self._send(200, self.manager.metrics())
+        if parts == ['jobs']:
+            return self._send(200, {'jobs': self.manager.list_jobs()})
+        if len(parts) == 2 and parts[0] == 'jobs':
+            info = self.manager.describe(parts[1])
+            if info is None:
+                return self._send(404, {'error': 'Trabajo no encontrado'})
+            return self._send(200, info)
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+            status, result = self.manager.result(parts[1])
+            if status is None:
+                return self._send(404, {'error': 'Trabajo no encontrado'})
+            if result is None:
+                return self._send(409, {'id': parts[1], 'status': status})
+            return self._send(200, {'id': parts[1], 'status': status, 'result': result})
+        self._send(404, {'error': 'Ruta no encontrada'})
+
+    def do_POST(self):
+        if self._parts() != ['jobs']:
+            return self._send(404, {'error': 'Ruta no encontrada'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            job_id = self.manager.submit(payload)
+        except QueueFullError as e:
+            return self._send(503, {'error': str(e)})
+        except (ValueError, TypeError) as e:
+            return self._send(400, {'error': str(e)})
+        except (OSError, KeyError) as e:
+            # Perfil ilegible o sin las columnas esperadas
+            return self._send(400, {'error': f"Perfil no válido: {e}"})
+        self._send(202, {'id': job_id, 'status': 'queued'})
+
+    def do_DELETE(self):
+        parts = self._parts()
+        if len(parts) != 2 or parts[0] != 'jobs':
+            return self._send(404, {'error': 'Ruta no encontrada'})
+        status = self.manager.cancel(parts[1])
+        if status is None:
+            return self._send(404, {'error': 'Trabajo no encontrado'})
+        self._send(200, {'id': parts[1], 'status': status})
+
+
+def create_server(host='127.0.0.1', port=8765, max_workers=None, max_queue=100, cache_dir=None,
+                  profile_dir=None):
+    """Crea el servidor HTTP con su administrador de trabajos (port=0 elige uno libre)."""
+    server = ThreadingHTTPServer((host, port), OptiluzRequestHandler)
+    server.daemon_threads = True
+    server.manager = JobManager(max_workers=max_workers, max_queue=max_queue, cache_dir=cache_dir,
+                                profile_dir=profile_dir)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de optimización OptiLuz")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="Procesos del grupo")
+    parser.add_argument('--max-queue', type=int, default=100, help="Trabajos en cola como máximo")
+    parser.add_argument('--cache-dir', default=None, help="Directorio de la caché de resultados")
+    parser.add_argument('--perfiles-dir', default=None,
+                        help="Directorio de los perfiles horarios que pueden pedir los clientes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    server = create_server(args.host, args.port, args.workers, args.max_queue, args.cache_dir,
+                           args.perfiles_dir)
+    logger.info(f"Servicio OptiLuz escuchando en http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.manager.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
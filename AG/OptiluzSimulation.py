@@ -0,0 +1,160 @@
+"""
+Simulación térmica horaria para OptiLuz.
+
+Extiende el balance de calor estático de OptiluzGA.calculate_avg_temperature
+a una serie temporal de temperatura exterior y ocupación (24 horas de un día
+tipo u 8760 horas de un año). Toda la población se evalúa como una única
+operación (individuos x horas) en NumPy.
+"""
+
+import hashlib
+
+import numpy as np
+
+from OptiluzKernels import (BTU, P_LUZ, U, N_PERSONAS, P_VENTANAS, P_CARGA,
+                            P_TEMP_INT, P_WINDOW_AREA, P_CALOR_PERSONA,
+                            P_EFICIENCIA_AC)
+
+# Número máximo de celdas (individuos x horas) calculadas de una vez
+CHUNK_CELLS = 1 << 20
+
+
+class HourlyProfile:
+    """
+    Perfil horario de temperatura exterior (°C) y fracción de ocupación (0-1).
+    Los arreglos se guardan de solo lectura para poder compartirlos entre
+    todas las evaluaciones de una ejecución.
+
+    Los perfiles cargados con OptiluzProfiles.load_profile recuerdan su origen
+    (atributo source) y el SHA-256 del archivo (atributo sha256); al enviarlos
+    a otro proceso se vuelven a abrir desde la caché en lugar de copiar los
+    datos.
+    """
+    def __init__(self, temp_ext, ocupacion=None):
+        temp_ext = np.asarray(temp_ext, dtype=float)
+        if temp_ext.ndim != 1 or temp_ext.size == 0:
+            raise ValueError("El perfil de temperatura debe ser un vector no vacío")
+
+        if ocupacion is None:
+            ocupacion = np.ones_like(temp_ext)
+        else:
+            ocupacion = np.clip(np.asarray(ocupacion, dtype=float), 0.0, 1.0)
+        if ocupacion.shape != temp_ext.shape:
+            raise ValueError("Los perfiles de temperatura y ocupación deben tener la misma longitud")
+
+        self.temp_ext = temp_ext
+        self.ocupacion = ocupacion
+        self.source = None
+        self.sha256 = None
+        self.temp_ext.flags.writeable = False
+        self.ocupacion.flags.writeable = False
+
+        # Valores precalculados que se reutilizan en cada generación
+        self.occupied = self.ocupacion > 0
+        self.occupied.flags.writeable = False
+        self.occupied_hours = int(self.occupied.sum())
+
+        # Límites de ±15°C respecto al exterior (mismo criterio que el modelo estático)
+        self.temp_min = self.temp_ext - 15
+        self.temp_max = self.temp_ext + 15
+
+    @property
+    def hours(self):
+        """Número de pasos horarios del perfil."""
+        return self.temp_ext.size
+
+    def fingerprint(self):
+        """
+        Huella del contenido del perfil (para claves de caché): el SHA-256 del
+        archivo de origen junto con las columnas elegidas o, si el perfil se
+        creó en memoria, el de sus datos.
+        """
+        digest = hashlib.sha256()
+        if self.sha256 is not None:
+            digest.update(repr((self.sha256,) + tuple(self.source[2:])).encode('utf-8'))
+        else:
+            digest.update(np.ascontiguousarray(self.temp_ext).tobytes())
+            digest.update(np.ascontiguousarray(self.ocupacion).tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def constant(cls, temp_ext, hours=24, ocupacion=1.0):
+        """Crea un perfil con temperatura y ocupación constantes."""
+        return cls(np.full(hours, float(temp_ext)), np.full(hours, float(ocupacion)))
+
+    def __reduce__(self):
+        if self.source is not None:
+            from OptiluzProfiles import load_profile
+            return (load_profile, self.source)
+        return (HourlyProfile, (np.asarray(self.temp_ext), np.asarray(self.ocupacion)))
+
+    def __repr__(self):
+        return (f"HourlyProfile(hours={self.hours}, temp_ext={self.temp_ext.min():.1f}-"
+                f"{self.temp_ext.max():.1f} °C, horas ocupadas={self.occupied_hours})")
+
+
+def _hourly_terms(genes, params):
+    """
+    El balance horario es afín en la temperatura exterior y la ocupación:
+    T[n, h] = base[n] + pendiente[n] * temp_ext[h] + carga_ocup[n] * ocupacion[h]
+    Devuelve los tres coeficientes por individuo.
+    """
+    genes = np.asarray(genes, dtype=float)
+    temp_int = params[P_TEMP_INT]
+    UA = genes[:, U] * params[P_VENTANAS] * params[P_WINDOW_AREA]
+    Q_ac = genes[:, BTU] * 0.293 * params[P_EFICIENCIA_AC]
+
+    pendiente = UA / 100
+    base = temp_int - (UA * temp_int + Q_ac) / 100
+    carga_ocup = (genes[:, N_PERSONAS] * params[P_CALOR_PERSONA]
+                  + params[P_CARGA] + genes[:, P_LUZ]) / 100
+    return base, pendiente, carga_ocup
+
+
+def _simulate_chunk(base, pendiente, carga_ocup, profile):
+    """Temperaturas horarias (sin limitar) de un bloque de individuos."""
+    return (base[:, None]
+            + pendiente[:, None] * profile.temp_ext[None, :]
+            + carga_ocup[:, None] * profile.ocupacion[None, :])
+
+
+def simulate_hourly(genes, params, profile):
+    """
+    Simula cada individuo durante todas las horas del perfil.
+
+    Retorna (temperaturas, horas_no_cubiertas): la matriz (individuos x horas)
+    de temperatura del aula y, por individuo, las horas ocupadas en las que la
+    carga térmica supera la capacidad del aire acondicionado.
+    """
+    params = np.asarray(params, dtype=float)
+    temp_int = params[P_TEMP_INT]
+    base, pendiente, carga_ocup = _hourly_terms(genes, params)
+
+    temps = _simulate_chunk(base, pendiente, carga_ocup, profile)
+    unmet = ((temps > temp_int) & profile.occupied[None, :]).sum(axis=1)
+
+    np.clip(temps, profile.temp_min, profile.temp_max, out=temps)
+    return temps, unmet
+
+
+def summarize_hourly(genes, params, profile):
+    """
+    Igual que simulate_hourly pero sin conservar la matriz completa: procesa la
+    población por bloques y retorna (temperatura_media, horas_no_cubiertas).
+    """
+    params = np.asarray(params, dtype=float)
+    temp_int = params[P_TEMP_INT]
+    base, pendiente, carga_ocup = _hourly_terms(genes, params)
+
+    n = base.shape[0]
+    mean_temp = np.empty(n)
+    unmet = np.empty(n, dtype=np.int64)
+    step = max(1, CHUNK_CELLS // profile.hours)
+    for start in range(0, n, step):
+        stop = min(n, start + step)
+        temps = _simulate_chunk(base[start:stop], pendiente[start:stop],
+                                carga_ocup[start:stop], profile)
+        unmet[start:stop] = ((temps > temp_int) & profile.occupied[None, :]).sum(axis=1)
+        np.clip(temps, profile.temp_min, profile.temp_max, out=temps)
+        mean_temp[start:stop] = temps.mean(axis=1)
+    return mean_temp, unmet
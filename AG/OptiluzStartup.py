@@ -0,0 +1,172 @@
+"""
+Tiempo de arranque de la aplicación de escritorio de OptiLuz.
+
+main.py registra en el perfil `startup` cada etapa del arranque (logging,
+importación de la interfaz, creación de la ventana, ventana visible) y la
+interfaz registra las importaciones que precarga en segundo plano. Con
+`python main.py --perfil-arranque` se imprime el desglose.
+
+El módulo también es una prueba de rendimiento del camino crítico de
+arranque: en procesos nuevos mide cuánto tarda en importarse lo necesario
+para mostrar la ventana, lista los módulos más costosos (-X importtime) y
+falla si se supera el límite o si algún módulo pesado (NumPy, matplotlib, el
+motor de cálculo) se importa antes de mostrar la ventana.
+
+Uso:
+    python OptiluzStartup.py --limite-ms 300 --historial arranque.jsonl
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Módulos que no deben cargarse antes de mostrar la ventana
+HEAVY_MODULES = ('numpy', 'matplotlib', 'OptiluzGA', 'OptiluzKernels')
+
+# Camino crítico: lo que main.py importa antes de crear la ventana
+CRITICAL_PATH = ('main', 'OptiluzGUI')
+
+REGRESSION_FACTOR = 1.2  # Aviso si la mediana empeora más de un 20% respecto a la última medición
+
+
+class StartupProfile:
+    """Etapas del arranque con su inicio y duración desde la creación del perfil."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []        # (etapa, inicio, duración, hilo)
+        self.lock = threading.Lock()
+
+    def _record(self, label, start, duration):
+        with self.lock:
+            self.events.append((label, start - self.origin, duration, threading.current_thread().name))
+
+    @contextlib.contextmanager
+    def measure(self, label):
+        """Mide la duración de un bloque."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(label, start, time.perf_counter() - start)
+
+    def mark(self, label):
+        """Registra un instante (por ejemplo, ventana visible)."""
+        self._record(label, time.perf_counter(), 0.0)
+
+    def report(self):
+        lines = [f"{'Etapa':<45} {'Inicio (ms)':>12} {'Duración (ms)':>14}  Hilo"]
+        with self.lock:
+            events = sorted(self.events, key=lambda e: e[1])
+        for label, start, duration, thread in events:
+            lines.append(f"{label:<45} {start * 1000:12.1f} {duration * 1000:14.1f}  {thread}")
+        return "\n".join(lines)
+
+
+# Perfil del proceso actual (main.py lo importa antes que cualquier otro módulo)
+startup = StartupProfile()
+
+
+# ---------------------------------------------------------------------------
+# Prueba de rendimiento del camino crítico
+# ---------------------------------------------------------------------------
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000,
+                  'eager': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def parse_importtime(stderr, top=10):
+    """Módulos con mayor tiempo acumulado según la salida de -X importtime: [(módulo, ms)]."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Encabezado
+        modules.append((parts[2].strip(), int(parts[1]) / 1000))
+    modules.sort(key=lambda m: -m[1])
+    return modules[:top]
+
+
+def measure_startup(repeats=5, modules=CRITICAL_PATH, directory=None):
+    """
+    Importa el camino crítico en repeats procesos nuevos. Retorna la mediana
+    (ms), las mediciones, los módulos pesados cargados y los módulos más costosos.
+    """
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    code = _PROBE.format(modules=tuple(modules), heavy=HEAVY_MODULES)
+    timings, eager, slowest = [], set(), []
+    for i in range(repeats):
+        args = [sys.executable] + (["-X", "importtime"] if i == 0 else []) + ["-c", code]
+        proc = subprocess.run(args, cwd=directory, capture_output=True, text=True, check=True)
+        probe = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings.append(probe['ms'])
+        eager.update(probe['eager'])
+        if i == 0:
+            slowest = parse_importtime(proc.stderr)
+    timings.sort()
+    return {
+        'median_ms': timings[len(timings) // 2],
+        'timings_ms': timings,
+        'eager': sorted(eager),
+        'slowest': slowest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de rendimiento del arranque de OptiLuz")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--limite-ms", type=float, default=None,
+                        help="Falla si la mediana supera este tiempo")
+    parser.add_argument("--historial", default=None,
+                        help="Archivo JSON Lines donde se acumulan las mediciones")
+    args = parser.parse_args()
+
+    result = measure_startup(args.repeticiones)
+    print(f"Camino crítico ({', '.join(CRITICAL_PATH)}): mediana {result['median_ms']:.1f} ms "
+          f"en {args.repeticiones} procesos")
+    print("Módulos más costosos:")
+    for name, ms in result['slowest']:
+        print(f"  {name:<50} {ms:8.1f} ms")
+
+    failed = False
+    if result['eager']:
+        print(f"ERROR: módulos pesados importados antes de la ventana: {', '.join(result['eager'])}")
+        failed = True
+    if args.limite_ms is not None and result['median_ms'] > args.limite_ms:
+        print(f"ERROR: el arranque supera el límite de {args.limite_ms:.0f} ms")
+        failed = True
+
+    if args.historial:
+        previous = None
+        if os.path.exists(args.historial):
+            with open(args.historial, encoding='utf-8') as f:
+                lines = [line for line in f if line.strip()]
+            if lines:
+                previous = json.loads(lines[-1])
+        if previous and result['median_ms'] > previous['median_ms'] * REGRESSION_FACTOR:
+            print(f"AVISO: el arranque empeoró de {previous['median_ms']:.1f} ms "
+                  f"a {result['median_ms']:.1f} ms")
+        with open(args.historial, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+                                'median_ms': result['median_ms'], 'eager': result['eager']}) + "\n")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
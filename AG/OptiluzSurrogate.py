@@ -0,0 +1,166 @@
+"""
+Evaluación asistida por modelo sustituto para OptiLuz.
+
+Cuando la función de fitness es costosa (por ejemplo la simulación horaria de
+un año completo), un modelo sustituto ajustado con los genomas ya evaluados
+permite preseleccionar a los hijos: solo la fracción más prometedora recibe
+una evaluación real y el resto conserva el valor predicho.
+
+El sustituto es una función de base radial cúbica con término lineal, ajustada
+en NumPy sobre los genes normalizados a sus límites. Se reajusta cada cierto
+número de generaciones y su precisión se mide comparando sus predicciones con
+las evaluaciones reales de cada generación.
+"""
+
+import numpy as np
+
+
+class RBFSurrogate:
+    """Interpolador RBF cúbico (phi(r) = r³) con polinomio lineal."""
+
+    def __init__(self, regularization=1e-8):
+        self.regularization = regularization
+        self.centers = None
+        self.weights = None
+        self.poly = None
+
+    @staticmethod
+    def _kernel(a, b):
+        d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+        return d2 ** 1.5
+
+    @staticmethod
+    def _poly_terms(x):
+        return np.hstack([np.ones((x.shape[0], 1)), x])
+
+    def fit(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n, d = x.shape
+        phi = self._kernel(x, x) + self.regularization * np.eye(n)
+        p = self._poly_terms(x)
+        system = np.zeros((n + d + 1, n + d + 1))
+        system[:n, :n] = phi
+        system[:n, n:] = p
+        system[n:, :n] = p.T
+        rhs = np.concatenate([y, np.zeros(d + 1)])
+        solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+        self.centers = x
+        self.weights = solution[:n]
+        self.poly = solution[n:]
+        return self
+
+    @property
+    def fitted(self):
+        return self.centers is not None
+
+    def predict(self, x):
+        x = np.asarray(x, dtype=float)
+        return self._kernel(x, self.centers) @ self.weights + self._poly_terms(x) @ self.poly
+
+
+def _spearman(a, b):
+    """Correlación de rangos de Spearman (sin empates)."""
+    if len(a) < 2:
+        return float('nan')
+    ra = np.argsort(np.argsort(a))
+    rb = np.argsort(np.argsort(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+class SurrogateScreener:
+    """
+    Preselección de la población con un sustituto RBF.
+
+    fraction: fracción de la población que recibe evaluación real.
+    refit_every: generaciones entre reajustes del modelo.
+    min_points: evaluaciones reales necesarias antes de usar el modelo.
+    max_points: tamaño máximo del conjunto de ajuste (los mejores y más recientes).
+    """
+
+    def __init__(self, fraction=0.3, refit_every=5, min_points=30, max_points=300):
+        self.fraction = fraction
+        self.refit_every = refit_every
+        self.min_points = min_points
+        self.max_points = max_points
+        self.model = RBFSurrogate()
+        self.reset()
+
+    def reset(self):
+        """Limpia el archivo de evaluaciones y las estadísticas (al iniciar una ejecución)."""
+        self.archive_x = []
+        self.archive_y = []
+        self.generation = 0
+        self.model.centers = None
+        self.true_evaluations = 0
+        self.saved_evaluations = 0
+        self.refits = 0
+        self.mae_history = []
+        self.rank_corr_history = []
+
+    def _refit(self):
+        x = np.vstack(self.archive_x)
+        y = np.concatenate(self.archive_y)
+        if len(y) > self.max_points:
+            # Conservar la mitad con mejor fitness y la mitad más reciente
+            half = self.max_points // 2
+            recent = np.arange(len(y) - half, len(y))
+            best = np.argsort(y[:-half])[:self.max_points - half]
+            keep = np.concatenate([best, recent])
+            x, y = x[keep], y[keep]
+            self.archive_x, self.archive_y = [x], [y]
+        # Descartar genomas duplicados (la matriz RBF sería singular)
+        x, unique = np.unique(x, axis=0, return_index=True)
+        self.model.fit(x, y[unique])
+        self.refits += 1
+
+    def evaluate(self, genes, lower, upper, true_fitness):
+        """
+        Evalúa la matriz de genes. true_fitness(indices) debe devolver el
+        fitness real de esas filas. Retorna (fitness, máscara_evaluados_reales).
+        """
+        n = len(genes)
+        x = (genes - lower) / np.where(upper > lower, upper - lower, 1.0)
+        ready = self.model.fitted and sum(len(y) for y in self.archive_y) >= self.min_points
+
+        if ready:
+            predicted = self.model.predict(x)
+            n_true = min(n, max(1, int(np.ceil(self.fraction * n))))
+            chosen = np.argsort(predicted)[:n_true]
+        else:
+            predicted = None
+            chosen = np.arange(n)
+
+        true_values = np.asarray(true_fitness(chosen), dtype=float)
+        self.true_evaluations += len(chosen)
+        self.saved_evaluations += n - len(chosen)
+        self.archive_x.append(x[chosen])
+        self.archive_y.append(true_values)
+
+        fitness = predicted.copy() if predicted is not None else np.empty(n)
+        fitness[chosen] = true_values
+        mask = np.zeros(n, dtype=bool)
+        mask[chosen] = True
+
+        # Precisión del modelo sobre los individuos evaluados de verdad
+        if predicted is not None:
+            self.mae_history.append(float(np.mean(np.abs(predicted[chosen] - true_values))))
+            self.rank_corr_history.append(_spearman(predicted[chosen], true_values))
+
+        self.generation += 1
+        if not self.model.fitted or self.generation % self.refit_every == 0:
+            if sum(len(y) for y in self.archive_y) >= self.min_points:
+                self._refit()
+        return fitness, mask
+
+    def stats(self):
+        """Estadísticas de uso y precisión del sustituto."""
+        return {
+            'true_evaluations': self.true_evaluations,
+            'saved_evaluations': self.saved_evaluations,
+            'refits': self.refits,
+            'mae': self.mae_history[-1] if self.mae_history else None,
+            'rank_correlation': self.rank_corr_history[-1] if self.rank_corr_history else None,
+        }
@@ -0,0 +1,289 @@
+"""
+Ajuste automático de los hiperparámetros del algoritmo genético.
+
+La interfaz expone pop_size, generations y mutation_rate, pero
+crossover_rate, tournament_size y elitism quedan con sus valores por defecto
+en run_evolution. Este módulo compite configuraciones sobre un conjunto de
+aulas representativas mediante reducción sucesiva (successive halving): todas
+las configuraciones se evalúan con pocas generaciones, solo la mejor fracción
+1/eta pasa a la siguiente ronda con eta veces más generaciones, y así hasta
+quedar una.
+
+El criterio es el tiempo hasta alcanzar un fitness objetivo en cada
+escenario (el mejor fitness de referencia más una tolerancia). Las
+evaluaciones se reparten en un grupo de procesos. El resultado se guarda como
+un "ajuste" JSON que main.py (--ajuste) y la interfaz pueden cargar.
+
+Uso:
+    python OptiluzTuner.py --configs 27 --salida ~/.optiluz/ajuste.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+TUNING_VERSION = 1
+DEFAULT_TUNING_PATH = os.path.join(os.path.expanduser("~"), ".optiluz", "ajuste.json")
+
+# Espacio de búsqueda: nombre -> (tipo, mínimo, máximo)
+SEARCH_SPACE = {
+    'pop_size': ('int', 10, 80),
+    'mutation_rate': ('float', 0.02, 0.4),
+    'crossover_rate': ('float', 0.6, 1.0),
+    'tournament_size': ('int', 2, 6),
+    'elitism': ('int', 0, 4),
+}
+
+# Parámetros que guarda un ajuste (los de run_evolution más pop_size)
+TUNED_PARAMS = ('pop_size', 'generations', 'mutation_rate', 'crossover_rate',
+                'tournament_size', 'elitism')
+
+# Aulas representativas (argumentos de OptiluzInput): pequeña, estándar, grande y calurosa
+REPRESENTATIVE_SCENARIOS = (
+    dict(superficie=30, ventanas=2, coeficiente=1.0, temp_ext=28, temp_int=22, humedad=55,
+         carga=2000, lux=300, tipo_iluminacion="LED", eficiencia=100, lamparas=6,
+         potencia_lampara=20, alpha=0.8, beta=0.2),
+    dict(superficie=50, ventanas=4, coeficiente=1.2, temp_ext=30, temp_int=22, humedad=60,
+         carga=5000, lux=300, tipo_iluminacion="LED", eficiencia=100, lamparas=10,
+         potencia_lampara=20, alpha=0.8, beta=0.2),
+    dict(superficie=120, ventanas=8, coeficiente=1.5, temp_ext=32, temp_int=23, humedad=65,
+         carga=9000, lux=500, tipo_iluminacion="Fluorescente", eficiencia=80, lamparas=24,
+         potencia_lampara=36, alpha=0.6, beta=0.4),
+    dict(superficie=60, ventanas=6, coeficiente=2.0, temp_ext=38, temp_int=24, humedad=40,
+         carga=6000, lux=400, tipo_iluminacion="LED", eficiencia=110, lamparas=12,
+         potencia_lampara=18, alpha=0.5, beta=0.5),
+)
+
+UNREACHED_PENALTY = 2.0  # Factor sobre el tiempo usado cuando no se alcanza el objetivo
+
+
+def sample_config(rng):
+    """Configuración aleatoria dentro de SEARCH_SPACE."""
+    config = {}
+    for name, (kind, low, high) in SEARCH_SPACE.items():
+        if kind == 'int':
+            config[name] = int(rng.integers(low, high + 1))
+        else:
+            config[name] = float(rng.uniform(low, high))
+    return config
+
+
+def run_trial(config, input_dict, seed, generations, target=None):
+    """
+    Ejecuta una configuración sobre un escenario (en un proceso del grupo).
+    Retorna el mejor fitness, las generaciones y el tiempo hasta el objetivo.
+    """
+    from OptiluzGA import OptiluzGA
+    from OptiluzInput import OptiluzInput
+
+    ga = OptiluzGA(OptiluzInput.from_dict(input_dict), pop_size=config['pop_size'], seed=seed)
+    run_params = {key: config[key] for key in ('mutation_rate', 'crossover_rate',
+                                               'tournament_size', 'elitism')}
+    run_params['elitism'] = min(run_params['elitism'], config['pop_size'] - 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = ga.run_evolution(generations=generations, display=False, **run_params)
+
+    history = result.fitness_history
+    elapsed = result.run_stats['elapsed']
+    trial = {'best_fitness': result.best_fitness, 'elapsed': elapsed,
+             'reached': False, 'generation': None, 'time_to_target': None}
+    if target is not None:
+        for gen, fitness in enumerate(history):
+            if fitness <= target:
+                trial.update(reached=True, generation=gen,
+                             time_to_target=elapsed * (gen + 1) / len(history))
+                break
+    return trial
+
+
+def trial_score(trial, target):
+    """Tiempo hasta el objetivo; si no se alcanza, el tiempo usado penalizado por la distancia."""
+    if trial['reached']:
+        return trial['time_to_target']
+    gap = (trial['best_fitness'] - target) / abs(target) if target else 1.0
+    return trial['elapsed'] * UNREACHED_PENALTY * (1.0 + max(gap, 0.0))
+
+
+class SuccessiveHalvingTuner:
+    """
+    Carrera de configuraciones por reducción sucesiva.
+
+    scenarios: diccionarios de OptiluzInput (por defecto REPRESENTATIVE_SCENARIOS).
+    n_configs: configuraciones iniciales.
+    min_generations / max_generations: presupuesto de la primera y la última ronda.
+    eta: factor de reducción (sobrevive 1/eta en cada ronda).
+    tolerance: tolerancia relativa del objetivo sobre el fitness de referencia.
+    """
+
+    def __init__(self, scenarios=None, n_configs=27, min_generations=20, max_generations=180,
+                 eta=3, seeds_per_scenario=1, tolerance=0.01, max_workers=None, seed=None):
+        self.scenarios = [dict(s) for s in (scenarios or REPRESENTATIVE_SCENARIOS)]
+        self.n_configs = n_configs
+        self.min_generations = min_generations
+        self.max_generations = max_generations
+        self.eta = eta
+        self.seeds_per_scenario = seeds_per_scenario
+        self.tolerance = tolerance
+        self.max_workers = max_workers
+        # NumPy solo hace falta para ajustar: la interfaz carga ajustes sin importarlo
+        import numpy as np
+        self.rng = np.random.default_rng(seed)
+        self.targets = None
+        self.rounds = []
+
+    def _map(self, executor, jobs):
+        if executor is None:
+            return [run_trial(*job) for job in jobs]
+        futures = [executor.submit(run_trial, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+    def compute_targets(self, executor=None):
+        """
+        Fitness objetivo de cada escenario: el mejor de varias ejecuciones
+        largas con los parámetros por defecto, más la tolerancia.
+        """
+        reference = {'pop_size': 40, 'mutation_rate': 0.1, 'crossover_rate': 0.9,
+                     'tournament_size': 3, 'elitism': 2}
+        jobs = [(reference, scenario, seed, self.max_generations * 2)
+                for scenario in self.scenarios for seed in range(3)]
+        trials = self._map(executor, jobs)
+        self.targets = []
+        for i in range(len(self.scenarios)):
+            best = min(t['best_fitness'] for t in trials[i * 3:(i + 1) * 3])
+            self.targets.append(best + abs(best) * self.tolerance)
+        return self.targets
+
+    def _evaluate(self, executor, configs, generations):
+        jobs = []
+        for config in configs:
+            for s, scenario in enumerate(self.scenarios):
+                for k in range(self.seeds_per_scenario):
+                    jobs.append((config, scenario, 1000 * s + k, generations, self.targets[s]))
+        trials = self._map(executor, jobs)
+
+        per_config = len(self.scenarios) * self.seeds_per_scenario
+        evaluations = []
+        for c, config in enumerate(configs):
+            block = trials[c * per_config:(c + 1) * per_config]
+            targets = [self.targets[j // self.seeds_per_scenario] for j in range(per_config)]
+            scores = [trial_score(t, target) for t, target in zip(block, targets)]
+            reached = [t['generation'] for t in block if t['reached']]
+            evaluations.append({
+                'config': config,
+                'score': sum(scores) / len(scores),
+                'success_rate': len(reached) / per_config,
+                'max_generation': max(reached) if reached else None,
+            })
+        return evaluations
+
+    def run(self):
+        """Ejecuta la carrera completa. Retorna el ajuste (diccionario) de la mejor configuración."""
+        configs = [sample_config(self.rng) for _ in range(self.n_configs)]
+        generations = self.min_generations
+        self.rounds = []
+
+        pool = None if self.max_workers == 1 else ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            if self.targets is None:
+                self.compute_targets(pool)
+            while True:
+                evaluations = self._evaluate(pool, configs, generations)
+                evaluations.sort(key=lambda e: e['score'])
+                self.rounds.append({'generations': generations, 'evaluations': evaluations})
+                print(f"Ronda {len(self.rounds)}: {len(configs)} configuraciones, "
+                      f"{generations} generaciones, mejor tiempo {evaluations[0]['score']:.4f} s")
+
+                keep = max(1, len(configs) // self.eta)
+                if len(configs) == 1 or generations >= self.max_generations:
+                    break
+                configs = [e['config'] for e in evaluations[:keep]]
+                generations = min(self.max_generations, generations * self.eta)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        return self._make_tuning(evaluations[0], generations)
+
+    def _make_tuning(self, winner, generations):
+        params = dict(winner['config'])
+        # Generaciones suficientes para alcanzar el objetivo en todos los escenarios, con margen
+        if winner['max_generation'] is not None and winner['success_rate'] == 1.0:
+            generations = min(self.max_generations, int(math.ceil((winner['max_generation'] + 1) * 1.25)))
+        params['generations'] = max(self.min_generations, generations)
+        params['elitism'] = min(params['elitism'], params['pop_size'] - 1)
+        return {
+            'version': TUNING_VERSION,
+            'params': {key: params[key] for key in TUNED_PARAMS},
+            'score': winner['score'],
+            'success_rate': winner['success_rate'],
+            'tolerance': self.tolerance,
+            'scenarios': len(self.scenarios),
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+
+
+def save_tuning(tuning, path=None):
+    """Guarda un ajuste en JSON de forma atómica."""
+    path = os.path.expanduser(path or DEFAULT_TUNING_PATH)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(tuning, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return path
+
+
+def load_tuning(path=None):
+    """
+    Carga un ajuste guardado con save_tuning y valida sus parámetros.
+    Retorna el diccionario de parámetros (TUNED_PARAMS).
+    """
+    path = os.path.expanduser(path or DEFAULT_TUNING_PATH)
+    with open(path, encoding='utf-8') as f:
+        tuning = json.load(f)
+    if tuning.get('version') != TUNING_VERSION:
+        raise ValueError(f"Versión de ajuste no soportada: {tuning.get('version')!r}")
+    params = tuning.get('params', {})
+    missing = [key for key in TUNED_PARAMS if key not in params]
+    if missing:
+        raise ValueError(f"Faltan parámetros en el ajuste: {', '.join(missing)}")
+    return {key: (float if key.endswith('_rate') else int)(params[key]) for key in TUNED_PARAMS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste automático de hiperparámetros de OptiLuz")
+    parser.add_argument("--configs", type=int, default=27)
+    parser.add_argument("--min-generaciones", type=int, default=20)
+    parser.add_argument("--max-generaciones", type=int, default=180)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--semillas", type=int, default=1, help="Semillas por escenario")
+    parser.add_argument("--tolerancia", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--salida", default=DEFAULT_TUNING_PATH)
+    args = parser.parse_args()
+
+    tuner = SuccessiveHalvingTuner(
+        n_configs=args.configs, min_generations=args.min_generaciones,
+        max_generations=args.max_generaciones, eta=args.eta,
+        seeds_per_scenario=args.semillas, tolerance=args.tolerancia,
+        max_workers=args.workers, seed=args.semilla)
+    tuning = tuner.run()
+    path = save_tuning(tuning, args.salida)
+    print(f"Ajuste guardado en {path}: {tuning['params']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Arranque en caliente de OptiLuz a partir de soluciones anteriores.
+
+Guarda, para cada ejecución terminada, el vector de características
+normalizado de sus datos de entrada (OptiluzInput) y la mejor solución
+encontrada expresada en coordenadas relativas a sus límites (0-1). Un árbol
+k-d implementado en NumPy permite encontrar las k aulas más parecidas a una
+nueva y sembrar con sus soluciones, reescaladas a los nuevos límites, una
+fracción de la población inicial.
+"""
+
+import hashlib
+import heapq
+
+import numpy as np
+
+from OptiluzKernels import GENES, N_PERSONAS
+
+# Campos numéricos de OptiluzInput.to_dict() usados como características
+FEATURES = ('superficie', 'ventanas', 'coeficiente', 'temp_ext', 'temp_int', 'humedad',
+            'carga', 'lux', 'eficiencia', 'lamparas', 'potencia_lampara', 'alpha')
+
+
+def input_features(input_data):
+    """Vector de características (sin normalizar) de un objeto de entrada."""
+    data = input_data.to_dict()
+    return np.array([float(data[name]) for name in FEATURES])
+
+
+class KDTree:
+    """Árbol k-d estático para búsqueda de los k vecinos más cercanos."""
+
+    def __init__(self, points, leaf_size=16):
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        self.index = np.arange(len(self.points))
+        # Nodos: (dimensión, valor de corte, hijo izq., hijo der., inicio, fin)
+        self.nodes = []
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def _build(self, start, end):
+        node_id = len(self.nodes)
+        self.nodes.append(None)
+        if end - start <= self.leaf_size:
+            self.nodes[node_id] = (-1, 0.0, -1, -1, start, end)
+            return node_id
+
+        segment = self.index[start:end]
+        subset = self.points[segment]
+        dim = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+        mid = (end - start) // 2
+        order = np.argpartition(subset[:, dim], mid)
+        self.index[start:end] = segment[order]
+        split = self.points[self.index[start + mid], dim]
+
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, end)
+        self.nodes[node_id] = (dim, split, left, right, start, end)
+        return node_id
+
+    def query(self, x, k=1):
+        """Retorna (distancias, índices) de los k puntos más cercanos a x."""
+        x = np.asarray(x, dtype=float)
+        k = min(k, len(self.points))
+        heap = []  # (-distancia², índice): el peor vecino queda en la cima
+
+        def search(node_id):
+            dim, split, left, right, start, end = self.nodes[node_id]
+            if dim < 0:
+                idx = self.index[start:end]
+                dists = ((self.points[idx] - x) ** 2).sum(axis=1)
+                for dist, i in zip(dists.tolist(), idx.tolist()):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-dist, i))
+                    elif dist < -heap[0][0]:
+                        heapq.heapreplace(heap, (-dist, i))
+                return
+            diff = x[dim] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                search(far)
+
+        if k > 0:
+            search(0)
+        result = sorted((-d, i) for d, i in heap)
+        distances = np.sqrt([d for d, _ in result])
+        return distances, np.array([i for _, i in result], dtype=int)
+
+
+class SolutionIndex:
+    """
+    Índice de soluciones pasadas para sembrar nuevas poblaciones.
+
+    Las características se normalizan (media 0, desviación 1) con las
+    estadísticas del propio índice; el árbol se reconstruye de forma perezosa
+    cuando se agregan soluciones.
+    """
+
+    def __init__(self):
+        self.features = np.empty((0, len(FEATURES)))
+        self.solutions = np.empty((0, len(GENES)))  # Genes relativos a sus límites (0-1)
+        self._tree = None
+        self._mean = None
+        self._scale = None
+
+    def __len__(self):
+        return len(self.features)
+
+    def add(self, input_data, solution, bounds):
+        """Agrega la mejor solución de una ejecución con los límites que se usaron."""
+        lower = np.array([bounds[key][0] for key in GENES], dtype=float)
+        upper = np.array([bounds[key][1] for key in GENES], dtype=float)
+        genes = np.array([solution[key] for key in GENES], dtype=float)
+        relative = (genes - lower) / np.where(upper > lower, upper - lower, 1.0)
+        self.features = np.vstack([self.features, input_features(input_data)])
+        self.solutions = np.vstack([self.solutions, np.clip(relative, 0.0, 1.0)])
+        self._tree = None
+
+    def fingerprint(self):
+        """Hash del contenido del índice (cambia al agregar soluciones)."""
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(self.features).tobytes())
+        digest.update(np.ascontiguousarray(self.solutions).tobytes())
+        return digest.hexdigest()
+
+    def _ensure_tree(self):
+        if self._tree is None:
+            self._mean = self.features.mean(axis=0)
+            scale = self.features.std(axis=0)
+            self._scale = np.where(scale > 0, scale, 1.0)
+            self._tree = KDTree((self.features - self._mean) / self._scale)
+        return self._tree
+
+    def query(self, input_data, k=5):
+        """Soluciones relativas (0-1) de las k aulas más parecidas, de la más cercana a la más lejana."""
+        if not len(self):
+            return np.empty((0, len(GENES)))
+        tree = self._ensure_tree()
+        x = (input_features(input_data) - self._mean) / self._scale
+        _, idx = tree.query(x, k)
+        return self.solutions[idx]
+
+    def seed_population(self, ga, n, k=5):
+        """
+        Genera hasta n individuos para ga a partir de las soluciones de las k
+        aulas más cercanas, reescaladas a los límites de ga. Las copias
+        adicionales se perturban con la mutación de ga para no duplicarlas.
+        """
+        neighbours = self.query(ga.input_data, k)
+        if n <= 0 or not len(neighbours):
+            return []
+        lower, upper = ga.bounds_arrays()
+        genes = lower + neighbours * (upper - lower)
+        genes[:, N_PERSONAS] = np.round(genes[:, N_PERSONAS])
+
+        seeds = []
+        for i in range(n):
+            individual = dict(zip(GENES, genes[i % len(genes)].tolist()))
+            individual['N_personas'] = int(individual['N_personas'])
+            if i >= len(genes):
+                individual = ga.mutate(individual, mutation_rate=0.5)
+            seeds.append(individual)
+        return seeds
+
+    def save(self, path):
+        """Guarda el índice en un archivo .npz."""
+        np.savez(path, features=self.features, solutions=self.solutions,
+                 feature_names=np.array(FEATURES), gene_names=np.array(GENES))
+
+    @classmethod
+    def load(cls, path):
+        """Carga un índice guardado con save."""
+        index = cls()
+        with np.load(path) as data:
+            if tuple(data['feature_names']) != FEATURES or tuple(data['gene_names']) != GENES:
+                raise ValueError("El índice fue creado con otras características o genes")
+            index.features = data['features']
+            index.solutions = data['solutions']
+        return index
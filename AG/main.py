@@ -8,12 +8,14 @@ térmico y cantidad de personas recomendada.
 Desarrollado como parte del proyecto OptiLuz.
 """
 
+from OptiluzStartup import startup  # Primero: origen del perfil de arranque
+
+import argparse
 import os
 import sys
 import traceback
 import logging
 from datetime import datetime
-from OptiluzGUI import OptiluzGUI
 
 # Configurar logging
 def setup_logging():
@@ -28,7 +30,7 @@ def setup_logging():
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
-            logging.FileHandler(log_file),
+            logging.FileHandler(log_file, delay=True),  # El archivo se crea al primer mensaje
             logging.StreamHandler(sys.stdout)
         ]
     )
@@ -46,15 +48,46 @@ def show_splash_screen():
     Iniciando aplicación...
     """)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="OptiLuz - Optimización Energética para Aulas")
+    parser.add_argument("--ajuste", default=None,
+                        help="Archivo de ajuste de hiperparámetros generado por OptiluzTuner.py")
+    parser.add_argument("--perfil-arranque", action="store_true",
+                        help="Muestra el desglose del tiempo de arranque")
+    return parser.parse_args()
+
 def main():
     """Función principal que inicia la aplicación."""
+    args = parse_args()
     show_splash_screen()
-    logger = setup_logging()
+    with startup.measure("configurar logging"):
+        logger = setup_logging()
     
     try:
         logger.info("Iniciando OptiLuz")
-        app = OptiluzGUI()
+        # La interfaz importa matplotlib y el motor de cálculo al usarlos
+        with startup.measure("importar interfaz"):
+            from OptiluzGUI import OptiluzGUI
+            from OptiluzTuner import load_tuning
+        tuning = None
+        if args.ajuste:
+            tuning = load_tuning(args.ajuste)
+            logger.info(f"Ajuste de hiperparámetros cargado: {tuning}")
+        with startup.measure("crear ventana"):
+            app = OptiluzGUI(tuning=tuning)
         logger.info("Interfaz gráfica iniciada")
+        
+        def preload_done():
+            logger.info("Perfil de arranque:\n" + startup.report())
+            if args.perfil_arranque:
+                print(startup.report())
+        
+        # Con la ventana ya visible, precargar en segundo plano lo que falta
+        def window_ready():
+            startup.mark("ventana visible")
+            app.start_preload(on_done=preload_done)
+        
+        app.after_idle(window_ready)
         app.mainloop()
         logger.info("Aplicación cerrada correctamente")
     
@@ -0,0 +1,69 @@
+"""
+Pruebas de la evaluación incremental del optimizador de edificios
+(OptiluzBuilding): los acumulados por diferencia deben coincidir con una
+evaluación completa.
+
+    python -m pytest -q test_building.py
+"""
+
+import numpy as np
+import pytest
+
+import OptiluzBuilding
+from OptiluzBuilding import OptiluzBuilding as Building, OptiluzBuildingGA
+from OptiluzInput import OptiluzInput
+
+
+def make_building(rooms=12, seed=0):
+    """Edificio con restricciones lo bastante estrictas para que la penalización actúe."""
+    rng = np.random.default_rng(seed)
+    inputs = [OptiluzInput(superficie=rng.uniform(20, 120), ventanas=int(rng.integers(1, 8)),
+                           coeficiente=1.2, temp_ext=rng.uniform(26, 38), temp_int=22,
+                           humedad=60, carga=rng.uniform(1000, 8000), lux=300,
+                           tipo_iluminacion="LED", eficiencia=100, lamparas=10,
+                           potencia_lampara=20, alpha=0.8, beta=0.2)
+              for _ in range(rooms)]
+    return Building(inputs, capacidad_planta=rooms * 15000, presupuesto_electrico=rooms * 1500)
+
+
+def full_state(ga):
+    """Totales, suma por aula y fitness de una evaluación completa de la población actual."""
+    fresh = OptiluzBuildingGA(ga.building, pop_size=ga.pop_size)
+    fresh.genes = ga.genes.copy()
+    fresh.evaluate_all()
+    return fresh
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_incremental_matches_full_evaluation(seed):
+    ga = OptiluzBuildingGA(make_building(seed=seed), pop_size=30, seed=seed)
+    ga.initialize_population()
+    for _ in range(OptiluzBuilding.RESYNC_EVERY - 1):
+        ga.evolve(mutation_rate=0.2)
+    assert ga.generations_since_resync == OptiluzBuilding.RESYNC_EVERY - 1
+
+    fresh = full_state(ga)
+    np.testing.assert_allclose(ga.room_fitness, fresh.room_fitness, rtol=1e-12)
+    np.testing.assert_allclose(ga.totals, fresh.totals, rtol=1e-9)
+    np.testing.assert_allclose(ga.room_sum, fresh.room_sum, rtol=1e-9)
+    np.testing.assert_allclose(ga.fitness, fresh.fitness, rtol=1e-9)
+    assert np.any(ga.building.shared_penalty(ga.totals) > 0)
+
+
+def test_resync_every(monkeypatch):
+    monkeypatch.setattr(OptiluzBuilding, 'RESYNC_EVERY', 3)
+    ga = OptiluzBuildingGA(make_building(), pop_size=10, seed=1)
+    ga.initialize_population()
+    for expected in (1, 2, 0, 1):
+        ga.evolve()
+        assert ga.generations_since_resync == expected
+    np.testing.assert_allclose(ga.fitness, full_state(ga).fitness, rtol=1e-9)
+
+
+def test_only_mutated_rooms_are_evaluated():
+    ga = OptiluzBuildingGA(make_building(), pop_size=10, seed=2)
+    ga.initialize_population()
+    evaluations = ga.room_evaluations
+    ga.evolve(mutation_rate=0.0)
+    assert ga.room_evaluations == evaluations
+    np.testing.assert_allclose(ga.fitness, full_state(ga).fitness, rtol=1e-9)
@@ -0,0 +1,52 @@
+"""
+Pruebas de equivalencia del lote columnar (OptiluzInputBatch) con
+OptiluzInput y OptiluzGA aula por aula.
+
+    python -m pytest -q test_input_batch.py
+"""
+
+import numpy as np
+import pytest
+
+from OptiluzGA import OptiluzGA
+from OptiluzInputBatch import OptiluzInputBatch
+from test_kernels import random_room
+
+ROOMS = 200
+
+
+@pytest.fixture(scope='module')
+def rooms():
+    rng = np.random.default_rng(0)
+    return [random_room(rng) for _ in range(ROOMS)]
+
+
+def test_kernel_params_match_ga(rooms):
+    params = OptiluzInputBatch.from_inputs(rooms).kernel_params()
+    expected = np.array([OptiluzGA(room).kernel_params() for room in rooms])
+    np.testing.assert_allclose(params, expected, rtol=1e-12)
+
+
+def test_kernel_params_of_empty_batch():
+    params = OptiluzInputBatch.from_records([]).kernel_params()
+    assert params.shape[0] == 0
+
+
+def test_recommendations_match_input(rooms):
+    batch = OptiluzInputBatch.from_inputs(rooms)
+    for i, room in enumerate(rooms):
+        assert batch.get_recommendations(i) == room.get_recommendations()
+
+
+def test_round_trip_with_profile(tmp_path, rooms):
+    path = tmp_path / "perfil.csv"
+    path.write_text("temp_ext,ocupacion\n" + "30,1\n" * 24)
+    records = [dict(room.to_dict(), perfil=str(path) if i % 2 else None)
+               for i, room in enumerate(rooms[:10])]
+    batch = OptiluzInputBatch.from_records(records)
+    assert [batch.row(i) for i in range(len(batch))] == records
+
+    again = OptiluzInputBatch.from_records(room.to_dict() for room in batch)
+    assert list(again.perfil) == [record['perfil'] for record in records]
+    assert batch[1].perfil is not None and batch[0].perfil is None
+    assert list(OptiluzInputBatch.from_table(batch.to_table()).perfil) == list(batch.perfil)
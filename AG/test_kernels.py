@@ -0,0 +1,98 @@
+"""
+Pruebas de equivalencia de los núcleos vectorizados (OptiluzKernels) con los
+métodos escalares de referencia de OptiluzGA.
+
+    python -m pytest -q test_kernels.py
+"""
+
+import numpy as np
+import pytest
+
+from OptiluzGA import OptiluzGA
+from OptiluzInput import OptiluzInput
+from OptiluzKernels import (GENES, N_PERSONAS, array_to_population, evaluate_genes,
+                            mutate_genes, temperature_genes)
+
+ROWS = 500
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def backend(request):
+    if request.param == 'numba':
+        pytest.importorskip('numba')
+    return request.param
+
+
+def random_room(rng):
+    """Aula aleatoria, con valores fuera de rango que OptiluzInput debe acotar."""
+    return OptiluzInput(
+        superficie=rng.uniform(10, 150), ventanas=int(rng.integers(0, 12)),
+        coeficiente=rng.uniform(0.2, 3.0), temp_ext=rng.uniform(-5, 42),
+        temp_int=rng.uniform(18, 26), humedad=rng.uniform(20, 90),
+        carga=rng.uniform(0, 12000), lux=rng.uniform(100, 800),
+        tipo_iluminacion=str(rng.choice(["LED", "Fluorescente", "Incandescente"])),
+        eficiencia=rng.choice([0.0, rng.uniform(10, 150)]), lamparas=int(rng.integers(1, 40)),
+        potencia_lampara=rng.uniform(5, 100), alpha=rng.uniform(0, 1), beta=rng.uniform(0, 1))
+
+
+def random_population(ga, rng, rows=ROWS):
+    """Matriz de genes aleatoria dentro de los límites, con N_personas entero."""
+    lower, upper = ga.bounds_arrays()
+    genes = lower + rng.random((rows, len(GENES))) * (upper - lower)
+    genes[:, N_PERSONAS] = np.round(genes[:, N_PERSONAS])
+    return genes
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_evaluate_matches_scalar(backend, seed):
+    rng = np.random.default_rng(seed)
+    ga = OptiluzGA(random_room(rng))
+    genes = random_population(ga, rng)
+    expected = [ga.evaluate_individual(ind) for ind in array_to_population(genes)]
+    np.testing.assert_allclose(evaluate_genes(genes, ga.kernel_params(), backend), expected,
+                               rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_temperature_matches_scalar(backend, seed):
+    rng = np.random.default_rng(seed)
+    ga = OptiluzGA(random_room(rng))
+    genes = random_population(ga, rng)
+    expected = [ga.calculate_avg_temperature(ind) for ind in array_to_population(genes)]
+    np.testing.assert_allclose(temperature_genes(genes, ga.kernel_params(), backend), expected,
+                               rtol=1e-12, atol=1e-9)
+
+
+def test_evaluate_writes_into_out(backend):
+    rng = np.random.default_rng(0)
+    ga = OptiluzGA(random_room(rng))
+    genes = random_population(ga, rng)
+    out = np.empty(len(genes))
+    result = evaluate_genes(genes, ga.kernel_params(), backend, out=out)
+    np.testing.assert_allclose(out, evaluate_genes(genes, ga.kernel_params(), backend))
+    assert np.shares_memory(result, out)
+
+
+@pytest.mark.parametrize('mutation_rate', [0.1, 0.5, 1.0])
+def test_mutate_within_bounds(backend, mutation_rate):
+    rng = np.random.default_rng(1)
+    ga = OptiluzGA(random_room(rng))
+    lower, upper = ga.bounds_arrays()
+    genes = random_population(ga, rng)
+    mutated = mutate_genes(genes, lower, upper, mutation_rate, np.random.default_rng(2), backend)
+
+    assert mutated.shape == genes.shape
+    assert np.all(mutated >= lower) and np.all(mutated <= upper)
+    assert np.array_equal(mutated[:, N_PERSONAS], np.round(mutated[:, N_PERSONAS]))
+    assert np.any(mutated != genes)
+
+
+def test_mutate_backends_agree():
+    pytest.importorskip('numba')
+    rng = np.random.default_rng(3)
+    ga = OptiluzGA(random_room(rng))
+    lower, upper = ga.bounds_arrays()
+    genes = random_population(ga, rng)
+    results = [mutate_genes(genes, lower, upper, 0.3, np.random.default_rng(4), backend)
+               for backend in ('numpy', 'numba')]
+    np.testing.assert_allclose(results[0], results[1])
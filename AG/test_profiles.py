@@ -0,0 +1,74 @@
+"""
+Pruebas de la caché binaria de perfiles horarios (OptiluzProfiles).
+
+    python -m pytest -q test_profiles.py
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import OptiluzProfiles
+from OptiluzProfiles import load_columns, load_profile
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Cuenta los análisis del archivo de texto (cada uno reconstruye la caché)."""
+    calls = []
+    parse = OptiluzProfiles.parse_profile_file
+
+    def counting(path):
+        calls.append(path)
+        return parse(path)
+
+    monkeypatch.setattr(OptiluzProfiles, 'parse_profile_file', counting)
+    return calls
+
+
+def write_profile(path, temps, mtime_ns=None):
+    path.write_text("temp_ext,ocupacion\n" + "".join(f"{t},1\n" for t in temps))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_is_memory_mapped(tmp_path, parses):
+    source = tmp_path / "perfil.csv"
+    write_profile(source, range(24))
+    columns = load_columns(str(source))
+    for column in (columns, load_columns(str(source))):
+        assert isinstance(column['temp_ext'], np.memmap)
+        assert not column['temp_ext'].flags.writeable
+    assert len(parses) == 1
+    np.testing.assert_array_equal(columns['temp_ext'], np.arange(24))
+
+
+def test_rebuilt_when_size_changes(tmp_path, parses):
+    source = tmp_path / "perfil.csv"
+    write_profile(source, [20] * 24, mtime_ns=10**18)
+    load_profile(str(source))
+    write_profile(source, [30] * 24 + [31], mtime_ns=10**18)  # Misma fecha, otro tamaño
+    profile = load_profile(str(source))
+    assert len(parses) == 2
+    assert profile.hours == 25 and profile.temp_ext[-1] == 31
+
+
+def test_rebuilt_when_mtime_changes_with_new_content(tmp_path, parses):
+    source = tmp_path / "perfil.csv"
+    write_profile(source, [20] * 24, mtime_ns=10**18)
+    first = load_profile(str(source))
+    write_profile(source, [25] * 24, mtime_ns=2 * 10**18)  # Mismo tamaño, otro contenido
+    second = load_profile(str(source))
+    assert len(parses) == 2
+    assert second.temp_ext[0] == 25 and second.sha256 != first.sha256
+
+
+def test_touch_without_changes_keeps_cache(tmp_path, parses):
+    source = tmp_path / "perfil.csv"
+    write_profile(source, [20] * 24, mtime_ns=10**18)
+    load_profile(str(source))
+    os.utime(source, ns=(2 * 10**18, 2 * 10**18))
+    load_profile(str(source))
+    load_profile(str(source))
+    assert len(parses) == 1
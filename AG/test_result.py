@@ -0,0 +1,49 @@
+"""
+Pruebas de la inmutabilidad de RunResult.
+
+    python -m pytest -q test_result.py
+"""
+
+import json
+import pickle
+
+import pytest
+
+from OptiluzGA import OptiluzGA
+from OptiluzInput import OptiluzInput
+from OptiluzResult import RunResult
+from OptiluzRobust import RobustObjective
+
+
+@pytest.fixture(scope='module')
+def result():
+    data = OptiluzInput(superficie=50, ventanas=4, coeficiente=1.2, temp_ext=30, temp_int=22,
+                        humedad=60, carga=5000, lux=300, tipo_iluminacion="LED", eficiencia=100,
+                        lamparas=10, potencia_lampara=20, alpha=0.8, beta=0.2)
+    ga = OptiluzGA(data, pop_size=10, seed=0, robust=RobustObjective(scenarios=8, seed=0))
+    return ga.run_evolution(3, display=False)
+
+
+def test_nested_run_stats_are_read_only(result):
+    with pytest.raises(TypeError):
+        result.run_stats['robust']['scenarios'] = 1
+    with pytest.raises(TypeError):
+        result.run_stats['nuevo'] = 1
+    with pytest.raises(TypeError):
+        result.best_solution_history[0]['BTU'] = 0.0
+
+
+def test_nested_lists_are_frozen():
+    frozen = RunResult(input={}, best_solution={'BTU': 1.0}, best_fitness=0.0,
+                       run_stats={'surrogate': {'errors': [1.0, 2.0]}})
+    assert frozen.run_stats['surrogate']['errors'] == (1.0, 2.0)
+    with pytest.raises(AttributeError):
+        frozen.run_stats['surrogate']['errors'].append(3.0)
+
+
+def test_round_trip_thaws_nested_values(result):
+    data = result.to_dict()
+    assert type(data['run_stats']['robust']) is dict
+    json.dumps(data)
+    assert RunResult.from_dict(data) == result
+    assert pickle.loads(pickle.dumps(result)) == result
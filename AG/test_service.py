@@ -0,0 +1,138 @@
+"""
+Pruebas del servicio HTTP de OptiLuz contra un servidor local (puerto 0).
+
+    python -m pytest -q test_service.py
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from OptiluzService import JobManager, create_server, normalize_params
+
+INPUT = {
+    'superficie': 50, 'ventanas': 4, 'coeficiente': 1.2, 'temp_ext': 30, 'temp_int': 22,
+    'humedad': 60, 'carga': 5000, 'lux': 300, 'tipo_iluminacion': "LED", 'eficiencia': 100,
+    'lamparas': 10, 'potencia_lampara': 20, 'alpha': 0.8, 'beta': 0.2,
+}
+PARAMS = {'pop_size': 10, 'generations': 3}
+
+
+@pytest.fixture
+def service(tmp_path):
+    (tmp_path / "perfil.csv").write_text("temp_ext,ocupacion\n" + "30,1\n" * 24)
+    (tmp_path / "sin_temperatura.csv").write_text("otra\n" + "1\n" * 24)
+    server = create_server(port=0, max_workers=1, profile_dir=str(tmp_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.manager.shutdown()
+    server.server_close()
+
+
+def request(url, method='GET', body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method,
+                                 headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_for(service, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status, info = request(f"{service}/jobs/{job_id}")
+        assert status == 200
+        if info['status'] not in ('queued', 'running'):
+            return info
+        time.sleep(0.05)
+    raise AssertionError(f"El trabajo {job_id} no terminó")
+
+
+def test_submit_poll_result_metrics(service):
+    status, body = request(f"{service}/jobs", 'POST', {'input': INPUT, 'params': PARAMS})
+    assert status == 202
+    job_id = body['id']
+
+    assert wait_for(service, job_id)['status'] == 'done'
+    status, body = request(f"{service}/jobs/{job_id}/result")
+    assert status == 200
+    assert set(body['result']['best_solution']) == {'BTU', 'P_luz', 'U', 'N_personas'}
+    assert len(body['result']['fitness_history']) == PARAMS['generations']
+    assert not body['result']['cached']
+
+    # Cancelar un trabajo terminado no cambia su estado
+    assert request(f"{service}/jobs/{job_id}", 'DELETE') == (200, {'id': job_id, 'status': 'done'})
+
+    status, metrics = request(f"{service}/metrics")
+    assert status == 200
+    assert metrics['submitted'] == 1 and metrics['done'] == 1
+    assert metrics['queue_depth'] == 0 and metrics['running'] == 0
+
+
+def test_cancel_queued_job(service):
+    slow = {'input': INPUT, 'params': {'pop_size': 200, 'generations': 200}}
+    ids = [request(f"{service}/jobs", 'POST', slow)[1]['id'] for _ in range(3)]
+    status, body = request(f"{service}/jobs/{ids[-1]}", 'DELETE')
+    assert status == 200 and body['status'] == 'cancelled'
+    assert request(f"{service}/jobs/{ids[-1]}/result")[0] == 409
+    assert request(f"{service}/metrics")[1]['cancelled'] == 1
+    assert request(f"{service}/jobs/desconocido", 'DELETE')[0] == 404
+
+
+@pytest.mark.parametrize('perfil', ['/etc/hostname', '../perfil.csv', 'no_existe.csv',
+                                    'sin_temperatura.csv'])
+def test_rejects_invalid_profiles(service, perfil):
+    status, body = request(f"{service}/jobs", 'POST',
+                           {'input': dict(INPUT, perfil=perfil), 'params': PARAMS})
+    assert status == 400 and 'error' in body
+
+
+def test_accepts_profile_inside_profile_dir(service):
+    status, body = request(f"{service}/jobs", 'POST',
+                           {'input': dict(INPUT, perfil='perfil.csv'), 'params': PARAMS})
+    assert status == 202
+    assert wait_for(service, body['id'])['status'] == 'done'
+
+
+@pytest.mark.parametrize('params', [{'elitism': -3}, {'elitism': 10, 'pop_size': 10},
+                                    {'generations': 0}, {'desconocido': 1}])
+def test_rejects_invalid_params(service, params):
+    with pytest.raises(ValueError):
+        normalize_params(params)
+    assert request(f"{service}/jobs", 'POST', {'input': INPUT, 'params': params})[0] == 400
+
+
+def test_finished_jobs_expire():
+    manager = JobManager(max_workers=1, job_ttl=0.0)
+    try:
+        job_id = manager.submit({'input': INPUT, 'params': PARAMS})
+        manager.jobs[job_id]['future'].result(timeout=60)
+        time.sleep(0.05)
+        assert manager.list_jobs() == []
+        assert manager.metrics()['tracked_jobs'] == 0
+    finally:
+        manager.shutdown()
+
+
+def test_result_of_pruned_job():
+    manager = JobManager(max_workers=1, job_ttl=0.0)
+    try:
+        job_id = manager.submit({'input': INPUT, 'params': PARAMS})
+        future = manager.jobs[job_id]['future']
+        future.result(timeout=60)
+        status, result = manager.result(job_id)
+        assert status == 'done' and result == future.result()
+        time.sleep(0.05)
+        manager._prune()
+        assert manager.result(job_id) == (None, None)
+    finally:
+        manager.shutdown()
@@ -0,0 +1,67 @@
+"""
+Pruebas del modo estacionario (μ+λ) de OptiluzGA.
+
+    python -m pytest -q test_steady_state.py
+"""
+
+import pytest
+
+import OptiluzGA as optiluz_ga
+from OptiluzGA import OptiluzGA
+from OptiluzInput import OptiluzInput
+
+GENERATIONS = 8
+OFFSPRING = 12
+
+
+def make_ga(**kwargs):
+    data = OptiluzInput(superficie=50, ventanas=4, coeficiente=1.2, temp_ext=30, temp_int=22,
+                        humedad=60, carga=5000, lux=300, tipo_iluminacion="LED", eficiencia=100,
+                        lamparas=10, potencia_lampara=20, alpha=0.8, beta=0.2)
+    return OptiluzGA(data, pop_size=16, seed=0, **kwargs)
+
+
+def run(ga, **kwargs):
+    """Ejecuta en modo estacionario contando las filas que reciben una evaluación real."""
+    evaluated = []
+    true_fitness = ga._true_fitness
+
+    def counting(genes, params):
+        evaluated.append(len(genes))
+        return true_fitness(genes, params)
+
+    ga._true_fitness = counting
+    result = ga.run_evolution(GENERATIONS, display=False, steady_state=True,
+                              offspring=OFFSPRING, **kwargs)
+    return result, evaluated
+
+
+@pytest.mark.parametrize('mutation_rate, crossover_rate', [(0.1, 0.9), (0.5, 0.5), (0.0, 0.0)])
+def test_skipped_evaluations_are_inherited_children(mutation_rate, crossover_rate):
+    ga = make_ga()
+    result, evaluated = run(ga, mutation_rate=mutation_rate, crossover_rate=crossover_rate)
+    assert evaluated[0] == ga.pop_size  # Población inicial
+    children = OFFSPRING * (GENERATIONS - 1)
+    assert result.run_stats['skipped_evaluations'] == children - sum(evaluated[1:])
+    if mutation_rate == crossover_rate == 0.0:
+        assert result.run_stats['skipped_evaluations'] == children
+
+
+def test_niching_applies_to_tournament(monkeypatch):
+    calls = []
+    niche_fitness = optiluz_ga.niche_fitness
+
+    def spy(*args, **kwargs):
+        calls.append(len(args[1]))
+        return niche_fitness(*args, **kwargs)
+
+    monkeypatch.setattr(optiluz_ga, 'niche_fitness', spy)
+    ga = make_ga(niching='sharing')
+    run(ga)
+    assert calls == [ga.pop_size] * (GENERATIONS - 1)
+
+
+@pytest.mark.parametrize('option', [{'restart_threshold': 0.05}, {'surrogate': object()}])
+def test_rejects_unsupported_options(option):
+    with pytest.raises(ValueError):
+        run(make_ga(**option))